@@ -0,0 +1,269 @@
+"""In-process stand-in for the Google Drive v3 service used in benchmarks and local runs."""
+
+import hashlib
+import re
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List
+
+import httplib2
+from googleapiclient.http import MediaUploadProgress
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+
+def _now() -> str:
+    """Returns the current time in the format of Drive's modifiedTime."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+
+
+def _name_matches_prefix(name: str, prefix: str) -> bool:
+    """
+    Matches a file name like Drive's `name contains`: case-insensitive prefix matching on
+    the whole name or on one of its words, so 'Hello' matches 'HelloWorld' and
+    'Hello World' but 'World' only matches the latter.
+    """
+    name, prefix = name.lower(), prefix.lower()
+    return name.startswith(prefix) or any(
+        word.startswith(prefix) for word in re.split(r"[^0-9a-z]+", name)
+    )
+
+
+class FakeDriveNetwork:
+    """
+    Simulates network cost: a fixed latency per request plus transfer time at a given bandwidth.
+
+    Args:
+        latency (float): Seconds added to every request. Defaults to 0.
+        bandwidth_mbps (float): Transfer speed in megabits per second, None for unlimited. Defaults to None.
+    """
+
+    def __init__(self, latency: float = 0.0, bandwidth_mbps: float = None):
+        self.latency = latency
+        self.bandwidth_mbps = bandwidth_mbps
+
+    def wait(self, num_bytes: int = 0) -> None:
+        delay = self.latency
+        if self.bandwidth_mbps:
+            delay += num_bytes * 8 / (self.bandwidth_mbps * 1_000_000)
+        if delay:
+            time.sleep(delay)
+
+
+class FakeRequest:
+    """A request whose `execute` returns a precomputed response after the simulated network delay."""
+
+    def __init__(self, network: FakeDriveNetwork, response, num_bytes: int = 0):
+        self._network = network
+        self._response = response
+        self._num_bytes = num_bytes
+
+    def execute(self, **kwargs):
+        self._network.wait(self._num_bytes)
+        return self._response() if callable(self._response) else self._response
+
+
+class FakeMediaHttp:
+    """httplib2.Http stand-in serving ranged GETs, so MediaIoBaseDownload works against the fake."""
+
+    def __init__(self, network: FakeDriveNetwork, content: bytes):
+        self._network = network
+        self._content = content
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        start, end = 0, len(self._content) - 1
+        match = re.match(r"bytes=(\d+)-(\d*)", (headers or {}).get("range", ""))
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or end), end)
+        chunk = self._content[start : end + 1]
+        self._network.wait(len(chunk))
+        response = httplib2.Response(
+            {
+                "status": 206 if match else 200,
+                "content-range": f"bytes {start}-{start + len(chunk) - 1}/{len(self._content)}",
+            }
+        )
+        return response, chunk
+
+
+class FakeMediaRequest(FakeRequest):
+    """A media request usable both with `execute` and with MediaIoBaseDownload."""
+
+    def __init__(self, network: FakeDriveNetwork, content: bytes, file_id: str):
+        super().__init__(network, content, len(content))
+        self.http = FakeMediaHttp(network, content)
+        self.uri = f"fake://drive/files/{file_id}?alt=media"
+        self.headers = {}
+
+
+class FakeUploadRequest:
+    """
+    A resumable media upload, sent chunk by chunk with `next_chunk` or at once with `execute`.
+
+    The first `drive.upload_errors` chunks sent to the drive raise ConnectionError before
+    reaching it, so that resuming can be tested.
+    """
+
+    def __init__(
+        self, drive: "FakeDriveService", media_body, commit: Callable[[bytes], Dict]
+    ):
+        self._drive = drive
+        self._media = media_body
+        self._commit = commit
+        self._received = bytearray()
+        self.resumable_progress = 0
+        self.http = None
+
+    def next_chunk(self, http=None, num_retries: int = 0):
+        size = self._media.size()
+        chunk = self._media.getbytes(self.resumable_progress, self._media.chunksize())
+        self._drive.network.wait(len(chunk))
+        with self._drive._lock:
+            if self._drive.upload_errors > 0:
+                self._drive.upload_errors -= 1
+                raise ConnectionError("Simulated dropped connection")
+        self._received += chunk
+        self.resumable_progress += len(chunk)
+        if self.resumable_progress < size:
+            return MediaUploadProgress(self.resumable_progress, size), None
+        return None, self._commit(bytes(self._received))
+
+    def execute(self, **kwargs):
+        response = None
+        while response is None:
+            _, response = self.next_chunk()
+        return response
+
+
+class FakeFilesResource:
+    """The `service.files()` resource of the fake Drive service."""
+
+    def __init__(self, drive: "FakeDriveService"):
+        self._drive = drive
+
+    def list(self, q: str = "", pageSize: int = 100, pageToken: str = None, **kwargs):
+        parents = re.findall(r"'([^']+)' in parents", q)
+        files = [
+            file
+            for file in self._drive.files_by_id.values()
+            if not parents or file["parent"] in parents
+        ]
+        if f"mimeType != '{FOLDER_MIME_TYPE}'" in q:
+            files = [file for file in files if file["mimeType"] != FOLDER_MIME_TYPE]
+        for prefix in re.findall(r"name contains '((?:[^'\\]|\\.)*)'", q):
+            prefix = re.sub(r"\\(.)", r"\1", prefix)
+            files = [file for file in files if _name_matches_prefix(file["name"], prefix)]
+        for name in re.findall(r"name = '((?:[^'\\]|\\.)*)'", q):
+            name = re.sub(r"\\(.)", r"\1", name)
+            files = [file for file in files if file["name"] == name]
+        if kwargs.get("orderBy") == "modifiedTime desc":
+            files = sorted(files, key=lambda file: file["modifiedTime"], reverse=True)
+
+        start = int(pageToken or 0)
+        page = [self._drive.metadata(file) for file in files[start : start + pageSize]]
+        response = {"files": page}
+        if start + pageSize < len(files):
+            response["nextPageToken"] = str(start + pageSize)
+        return FakeRequest(self._drive.network, response)
+
+    def get(self, fileId: str, **kwargs):
+        return FakeRequest(
+            self._drive.network, self._drive.metadata(self._drive.files_by_id[fileId])
+        )
+
+    def get_media(self, fileId: str, **kwargs):
+        content = self._drive.files_by_id[fileId]["content"]
+        return FakeMediaRequest(self._drive.network, content, fileId)
+
+    def create(self, body: Dict = None, media_body=None, **kwargs):
+        body = body or {}
+
+        def commit(content: bytes) -> Dict[str, str]:
+            file_id = self._drive.add_file(
+                body["name"],
+                content,
+                (body.get("parents") or ["root"])[0],
+                media_body.mimetype(),
+            )
+            return self._drive.metadata(self._drive.files_by_id[file_id])
+
+        return FakeUploadRequest(self._drive, media_body, commit)
+
+    def update(self, fileId: str, body: Dict = None, media_body=None, **kwargs):
+        def commit(content: bytes) -> Dict[str, str]:
+            with self._drive._lock:
+                file = self._drive.files_by_id[fileId]
+                file.update(body or {})
+                file["content"] = content
+                file["mimeType"] = media_body.mimetype()
+                file["modifiedTime"] = _now()
+            return self._drive.metadata(file)
+
+        return FakeUploadRequest(self._drive, media_body, commit)
+
+
+class FakeDriveService:
+    """
+    In-process fake of the Google Drive v3 service for the calls made by the Drive connector.
+
+    Files live in memory and every request pays the simulated latency and bandwidth of
+    `network`. Supports paginated listing, metadata lookups, (chunked) downloads and
+    resumable uploads, whose first `upload_errors` chunks fail with a dropped connection.
+
+    Args:
+        latency (float): Seconds added to every request. Defaults to 0.
+        bandwidth_mbps (float): Transfer speed in megabits per second, None for unlimited. Defaults to None.
+    """
+
+    def __init__(self, latency: float = 0.0, bandwidth_mbps: float = None):
+        self.network = FakeDriveNetwork(latency, bandwidth_mbps)
+        self.files_by_id: Dict[str, Dict] = {}
+        self.upload_errors = 0
+        self._lock = threading.Lock()
+
+    def files(self) -> FakeFilesResource:
+        return FakeFilesResource(self)
+
+    def add_file(
+        self,
+        name: str,
+        content: bytes,
+        parent: str = "root",
+        mime_type: str = "text/csv",
+    ) -> str:
+        """Adds a file to the fake drive and returns its ID."""
+        file_id = uuid.uuid4().hex
+        with self._lock:
+            self.files_by_id[file_id] = {
+                "id": file_id,
+                "name": name,
+                "parent": parent,
+                "mimeType": mime_type,
+                "content": content,
+                "modifiedTime": _now(),
+            }
+        return file_id
+
+    def add_folder(self, name: str, parent: str = "root") -> str:
+        """Adds a folder to the fake drive and returns its ID."""
+        return self.add_file(name, b"", parent, FOLDER_MIME_TYPE)
+
+    def metadata(self, file: Dict) -> Dict[str, str]:
+        """Returns the Drive metadata fields of a stored file."""
+        return {
+            "id": file["id"],
+            "name": file["name"],
+            "mimeType": file["mimeType"],
+            "modifiedTime": file["modifiedTime"],
+            "md5Checksum": hashlib.md5(file["content"]).hexdigest(),
+        }
+
+    def list_folder(self, folder_id: str) -> List[Dict[str, str]]:
+        """Returns the metadata of the files directly inside a folder, without network cost."""
+        return [
+            self.metadata(file)
+            for file in self.files_by_id.values()
+            if file["parent"] == folder_id
+        ]
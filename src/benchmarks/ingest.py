@@ -0,0 +1,210 @@
+"""
+Benchmark of the Google Drive ingest pipeline against an in-process fake Drive service.
+
+Times each stage (list, download, parse, load, profile and the end-to-end `ingest`) at
+several data scales and records wall time and peak RSS. Results are written as JSON
+so runs can be compared over time. Run from the repository root, e.g.:
+
+    python -m src.benchmarks.ingest --scales 100000 1000000 --latency 0.05 --bandwidth-mbps 200
+    python -m src.benchmarks.ingest --compare benchmarks/results/<baseline>.json
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List
+
+import duckdb
+import pandas as pd
+from loguru import logger
+
+from src.benchmarks.fake_drive import FakeDriveService
+from src.connectors.duck import create_table
+from src.connectors.google_drive import (download_file_as_bytes, ingest,
+                                         list_files_in_folder)
+from src.data.generate_data import generate_cost_accounts_data
+from src.utils.cli import benchmark_parse_arguments
+from src.utils.dataframe.read import (log_dataframe_info,
+                                      read_file_object_to_dataframe)
+from src.utils.metrics import peak_rss_mb, reset_peak_rss
+
+
+@contextmanager
+def measure(results: List[Dict], scale: int, stage: str, **extra) -> Iterator[Dict]:
+    """Times a benchmark stage and appends its wall time and peak RSS to `results`."""
+    record = {"scale": scale, "stage": stage, **extra}
+    reset_peak_rss()
+    start = time.perf_counter()
+    yield record
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    record["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    results.append(record)
+    logger.info(f"[{scale} rows] {stage}: {record['seconds']:.3f}s")
+
+
+def populate_drive(
+    service: FakeDriveService, rows: int, files: int, seed: int
+) -> str:
+    """Uploads `rows` generated cost account records, split over `files` CSVs, to a new folder."""
+    folder_id = service.add_folder(f"cost_accounts_{rows}")
+    df = generate_cost_accounts_data(rows, seed)
+    rows_per_file = -(-rows // files)
+    for part, start in enumerate(range(0, rows, rows_per_file)):
+        chunk = df.iloc[start : start + rows_per_file]
+        service.add_file(
+            f"cost_accounts_{part:04d}.csv",
+            chunk.to_csv(index=False).encode(),
+            folder_id,
+        )
+    return folder_id
+
+
+def run_scale(
+    rows: int,
+    files: int,
+    latency: float,
+    bandwidth_mbps: float,
+    concurrency: int,
+    seed: int,
+) -> List[Dict]:
+    """Runs every stage of the pipeline at one data scale."""
+    results = []
+    service = FakeDriveService(latency, bandwidth_mbps)
+    folder_id = populate_drive(service, rows, files, seed)
+    con = duckdb.connect()
+
+    with measure(results, rows, "list") as record:
+        listing = list_files_in_folder(service, folder_id)
+        record["files"] = len(listing)
+
+    with measure(results, rows, "download") as record:
+        buffers = [download_file_as_bytes(service, file["id"]) for file in listing]
+        record["bytes"] = sum(buffer.getbuffer().nbytes for buffer in buffers)
+
+    with measure(results, rows, "parse") as record:
+        df = pd.concat(
+            [read_file_object_to_dataframe(buffer, "csv") for buffer in buffers],
+            ignore_index=True,
+        )
+        record["rows"] = len(df)
+    del buffers
+
+    with measure(results, rows, "load") as record:
+        create_table(con, df, "cost_accounts")
+        record["rows"] = len(df)
+
+    # Profiling only runs when a handler accepts DEBUG messages
+    handler_id = logger.add(lambda _: None, level="DEBUG")
+    try:
+        with measure(results, rows, "profile"):
+            log_dataframe_info(df)
+    finally:
+        logger.remove(handler_id)
+    del df
+
+    settings = {
+        "ingest": {
+            "google_drive": {
+                "folders": [
+                    {
+                        "id": folder_id,
+                        "file_format": "csv",
+                        "table_name": "cost_accounts_ingest",
+                        "concurrency": concurrency,
+                    }
+                ],
+                "files": [],
+            }
+        }
+    }
+    with measure(results, rows, "ingest", concurrency=concurrency):
+        ingest(settings, service, con)
+
+    con.close()
+    return results
+
+
+def git_commit() -> str:
+    """Returns the current git commit hash, or 'unknown' outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(results: List[Dict], params: Dict, output_dir: str) -> str:
+    """Writes the results with run metadata to a timestamped JSON file and returns its path."""
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    commit = git_commit()
+    run = {
+        "timestamp": timestamp,
+        "commit": commit,
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "params": params,
+        "results": results,
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{timestamp}_{commit}.json")
+    with open(path, "w") as file:
+        json.dump(run, file, indent=2)
+    logger.success(f"Benchmark results written to {path}")
+    return path
+
+
+def compare_results(baseline_path: str, current: List[Dict]) -> pd.DataFrame:
+    """Returns per-stage timings of the current run next to a baseline run."""
+    with open(baseline_path) as file:
+        baseline = pd.DataFrame(json.load(file)["results"])
+    comparison = pd.DataFrame(current).merge(
+        baseline[["scale", "stage", "seconds", "peak_rss_mb"]],
+        on=["scale", "stage"],
+        how="left",
+        suffixes=("", "_baseline"),
+    )
+    comparison["speedup"] = (
+        comparison["seconds_baseline"] / comparison["seconds"]
+    ).round(2)
+    return comparison[
+        ["scale", "stage", "seconds", "seconds_baseline", "speedup"]
+        + ["peak_rss_mb", "peak_rss_mb_baseline"]
+    ]
+
+
+def main():
+    args = benchmark_parse_arguments()
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    params = vars(args).copy()
+    results = []
+    for rows in args.scales:
+        results += run_scale(
+            rows,
+            args.files,
+            args.latency,
+            args.bandwidth_mbps,
+            args.concurrency,
+            args.seed,
+        )
+
+    save_results(results, params, args.output_dir)
+    print(pd.DataFrame(results).to_string(index=False))
+    if args.compare:
+        print(compare_results(args.compare, results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,103 @@
 """DuckDB connector module."""
 
+import atexit
+import glob
+import itertools
 import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import urllib.parse
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
 from loguru import logger
 
+from src.utils.cache import TABLE_VERSIONS_TABLE, cached_query, invalidate_table
+from src.utils.dataframe.read import (iter_excel_batches,
+                                      record_batches_to_dataframes)
+from src.utils.dataframe.schema import duckdb_cast_projection
 from src.utils.file.read import read_yaml_to_dict
+from src.utils.metrics import instrument
+
+# Table storing per-stage ingest metrics
+METRICS_TABLE = "_ingest_metrics"
+# Table tracking which source files have been loaded into which tables
+MANIFEST_TABLE = "_ingest_manifest"
+# Lineage column identifying the source file of every row in incrementally loaded tables
+SOURCE_FILE_COLUMN = "_source_file_id"
+
+# Serialises table writes when several tables are ingested from parallel cursors.
+# Re-entrant so a writer can hold it across a transaction that calls other writers.
+write_lock = threading.RLock()
+# Suffix of the staging tables that tables are loaded into before being swapped in
+STAGING_SUFFIX = "__staging"
+# Parsed dbt profiles keyed by path, with the mtime they were read at
+_profiles_cache: Dict[str, tuple[int, dict]] = {}
+# Process-wide connections keyed by environment and profiles path
+_connections: Dict[tuple[str, str], duckdb.DuckDBPyConnection] = {}
+_connections_lock = threading.Lock()
+_thread_cursors = threading.local()
+# Tables staged inside the current `staged_swap` block, swapped in when it exits
+_pending_swaps: ContextVar[List[str] | None] = ContextVar("pending_swaps", default=None)
+
+# pandas dtypes and their DuckDB column type equivalents
+PANDAS_TO_DUCKDB_TYPES = {
+    "str": "VARCHAR",
+    "string": "VARCHAR",
+    "object": "VARCHAR",
+    "category": "VARCHAR",
+    "int": "BIGINT",
+    "int32": "INTEGER",
+    "int64": "BIGINT",
+    "Int64": "BIGINT",
+    "float": "DOUBLE",
+    "float32": "FLOAT",
+    "float64": "DOUBLE",
+    "bool": "BOOLEAN",
+    "boolean": "BOOLEAN",
+    "datetime64[ns]": "TIMESTAMP",
+}
+
+# pandas.read_csv keyword arguments with a direct DuckDB read_csv equivalent
+PANDAS_TO_DUCKDB_CSV_OPTIONS = {
+    "sep": "delim",
+    "delimiter": "delim",
+    "quotechar": "quote",
+    "escapechar": "escape",
+    "encoding": "encoding",
+    "names": "names",
+    "decimal": "decimal_separator",
+    "date_format": "dateformat",
+    "comment": "comment",
+}
+
+
+def read_profiles(dbt_profiles_path: str = "profiles.yml") -> dict:
+    """
+    Reads the dbt profiles file, reusing the parsed profiles while the file is unchanged.
+
+    Args:
+        dbt_profiles_path (str): The path to the DBT profiles file.
+
+    Returns:
+        dict: The parsed profiles.
+    """
+    path = os.path.abspath(dbt_profiles_path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _profiles_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    profiles = read_yaml_to_dict(path)
+    _profiles_cache[path] = (mtime, profiles)
+    return profiles
 
 
 def get_db_file(db: str, dbt_profiles_path: str = "profiles.yml") -> str:
@@ -22,7 +113,7 @@ def get_db_file(db: str, dbt_profiles_path: str = "profiles.yml") -> str:
     """
     try:
         logger.info(f"Fetching {db} file value from {dbt_profiles_path}")
-        db_file = read_yaml_to_dict(dbt_profiles_path)["main"]["outputs"][db]["path"]
+        db_file = read_profiles(dbt_profiles_path)["main"]["outputs"][db]["path"]
         logger.info(f"Using {db} environment with database file: {db_file}")
         return db_file
     except KeyError:
@@ -30,66 +121,1334 @@ def get_db_file(db: str, dbt_profiles_path: str = "profiles.yml") -> str:
         raise ValueError(f"Unsupported database environment: {db}")
 
 
-def connect_duckdb(db_file: str = ":memory:") -> duckdb.DuckDBPyConnection:
+def get_db_config(db: str, dbt_profiles_path: str = "profiles.yml") -> Dict[str, Any]:
+    """
+    Get the DuckDB configuration (e.g., threads, memory_limit, temp_directory) of an environment.
+
+    The configuration is read from the `settings` of the environment's dbt-duckdb
+    profile output.
+
+    Args:
+        db (str): The database environment ('dev' or 'prod').
+        dbt_profiles_path (str): The path to the DBT profiles file.
+
+    Returns:
+        Dict[str, Any]: The DuckDB configuration options, empty if none are set.
+    """
+    try:
+        output = read_profiles(dbt_profiles_path)["main"]["outputs"][db]
+    except KeyError:
+        logger.error(f"Unknown database environment: {db}")
+        raise ValueError(f"Unsupported database environment: {db}")
+    return dict(output.get("settings") or {})
+
+
+def connect_duckdb(
+    db_file: str = ":memory:", config: Dict[str, Any] = None
+) -> duckdb.DuckDBPyConnection:
     """
     Returns a connection object to the DuckDB database.
 
     Args:
         db_file (str): The file path to the DuckDB database. Defaults to in-memory (":memory:").
+        config (Dict[str, Any]): DuckDB configuration options (e.g., threads, memory_limit,
+            temp_directory). Defaults to None.
 
     Returns:
         duckdb.DuckDBPyConnection: The connection object.
     """
     logger.info(f"Connecting to DuckDB database in {db_file}")
-    return duckdb.connect(db_file)
+    return duckdb.connect(db_file, config=config or {})
+
+
+def get_connection(
+    db: str = "dev", dbt_profiles_path: str = "profiles.yml"
+) -> duckdb.DuckDBPyConnection:
+    """
+    Returns the process-wide connection to the DuckDB database of an environment.
+
+    The connection is opened on first use with the configuration of the environment's
+    profile, shared by all later callers and closed when the process exits. Threads
+    should query through `get_cursor` rather than the shared connection itself.
+
+    Args:
+        db (str): The database environment ('dev' or 'prod').
+        dbt_profiles_path (str): The path to the DBT profiles file.
+
+    Returns:
+        duckdb.DuckDBPyConnection: The shared connection object.
+    """
+    key = (db, os.path.abspath(dbt_profiles_path))
+    with _connections_lock:
+        con = _connections.get(key)
+        if con is None:
+            db_file = get_db_file(db, dbt_profiles_path)
+            con = connect_duckdb(db_file, get_db_config(db, dbt_profiles_path))
+            _connections[key] = con
+        return con
+
+
+def get_cursor(
+    db: str = "dev", dbt_profiles_path: str = "profiles.yml"
+) -> duckdb.DuckDBPyConnection:
+    """
+    Returns a cursor on the shared connection of an environment, one per thread.
+
+    DuckDB connections must not be used by several threads at once, while cursors of
+    the same connection can run in parallel and share its database instance, buffer
+    cache and catalog.
+
+    Args:
+        db (str): The database environment ('dev' or 'prod').
+        dbt_profiles_path (str): The path to the DBT profiles file.
+
+    Returns:
+        duckdb.DuckDBPyConnection: The cursor of the calling thread.
+    """
+    con = get_connection(db, dbt_profiles_path)
+    cursors = _thread_cursors.__dict__.setdefault("cursors", {})
+    cached = cursors.get(key := (db, os.path.abspath(dbt_profiles_path)))
+    # A cursor of a connection closed by `close_connections` is replaced
+    if cached is None or cached[0] is not con:
+        cached = cursors[key] = (con, con.cursor())
+    return cached[1]
+
+
+def close_connections() -> None:
+    """
+    Closes the shared connections of all environments, along with their cursors.
+
+    Registered to run at exit, so pending writes are checkpointed.
+
+    Returns:
+        None
+    """
+    with _connections_lock:
+        for (db, _), con in _connections.items():
+            logger.info(f"Closing DuckDB connection of {db} environment")
+            con.close()
+        _connections.clear()
+
 
+atexit.register(close_connections)
 
+
+@instrument("load", table_arg="table_name", data_arg="data")
 def create_table(
     con: duckdb.DuckDBPyConnection,
-    data: pd.DataFrame | dict,
+    data: pd.DataFrame | pa.Table | pa.RecordBatchReader | dict | Iterable,
     table_name: str,
+    staging: bool | None = None,
+    flatten: bool = False,
+    schema: Dict[str, str] = None,
 ) -> None:
     """
-    Creates a table from a Pandas DataFrame or a dictionary in DuckDB.
+    Creates a table from a Pandas DataFrame, Arrow data or a dictionary in DuckDB.
+
+    Arrow tables and record batch readers are scanned by DuckDB without conversion. An
+    iterable of DataFrames or Arrow tables (e.g. from `iter_file_object_batches`) is
+    loaded one batch at a time, so the full data never has to fit in memory.
+
+    A dictionary, or an iterable of dictionaries (e.g. Drive file metadata or API
+    payloads), is staged as newline-delimited JSON and bulk loaded by DuckDB's JSON
+    reader, by default into a single `data JSON` column.
+
+    With staging, the data is loaded into a staging table that then replaces the live
+    table in one short transaction, so readers never see a partial table. Inside a
+    `staged_swap` block the swap is deferred until the block exits.
 
     Args:
         con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
-        data (pd.DataFrame or dict): The data to be stored in the table.
+        data (pd.DataFrame, pa.Table, pa.RecordBatchReader, dict or Iterable): The data to be
+            stored in the table.
         table_name (str): The name of the table to be created.
+        staging (bool | None): Load through a staging table. Defaults to None, which stages
+            only inside a `staged_swap` block.
+        flatten (bool): Load JSON documents into typed columns, one per top-level key, instead
+            of a single JSON column. Nested objects become STRUCT columns. Defaults to False.
+        schema (Dict[str, str]): Schema contract whose DATE, DECIMAL and other column types the
+            DataFrame or Arrow data is cast to, see `src.utils.dataframe.schema`. Defaults to None.
 
     Returns:
         None
     """
+    staging = _use_staging(staging)
+    target = staging_table_name(table_name) if staging else table_name
+    projection = duckdb_cast_projection(schema)
 
-    if isinstance(data, pd.DataFrame):
-        logger.info(f"Creating table '{table_name}' from DataFrame.")
-        con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM data")
+    if isinstance(data, (pd.DataFrame, pa.Table, pa.RecordBatchReader)):
+        logger.info(f"Creating table '{target}' from {type(data).__name__}.")
+        with write_lock:
+            con.execute(
+                f"CREATE OR REPLACE TABLE {target} AS SELECT {projection} FROM data"
+            )
     elif isinstance(data, dict):
-        logger.info(f"Creating table '{table_name}' from dictionary.")
-        con.execute(f"CREATE OR REPLACE TABLE {table_name} (data JSON)")
-        con.execute(f"INSERT INTO {table_name} VALUES ('{json.dumps(data)}')")
+        logger.info(f"Creating table '{target}' from dictionary.")
+        _load_json_documents(con, [data], target, flatten)
+    elif isinstance(data, Iterable) and not isinstance(data, (str, bytes)):
+        # Peek at the first element to tell JSON documents from batches
+        iterator = iter(data)
+        first = next(iterator, None)
+        data = itertools.chain([first], iterator) if first is not None else []
+        if isinstance(first, dict):
+            logger.info(f"Creating table '{target}' from JSON documents.")
+            _load_json_documents(con, data, target, flatten)
+            if staging:
+                _publish_staging_table(con, table_name)
+            else:
+                bump_table_version(con, table_name)
+            logger.success(f"Table '{table_name}' created successfully.")
+            return
+        logger.info(f"Creating table '{target}' from batches.")
+        batches = 0
+        for batch in data:
+            if batches:
+                append_table(con, batch, target)
+            else:
+                with write_lock:
+                    con.execute(
+                        f"CREATE OR REPLACE TABLE {target} "
+                        f"AS SELECT {projection} FROM batch"
+                    )
+            batches += 1
+        if not batches:
+            logger.warning(f"No batches received, table '{table_name}' not created.")
+            return
     else:
-        logger.error("Unsupported data type. Only pd.DataFrame and dict are supported.")
+        logger.error(
+            "Unsupported data type. Only pd.DataFrame, Arrow data, dict and "
+            "iterables of batches are supported."
+        )
         raise TypeError(
-            "Unsupported data type. Only pd.DataFrame and dict are supported."
+            "Unsupported data type. Only pd.DataFrame, Arrow data, dict and "
+            "iterables of batches are supported."
         )
+    if staging:
+        _publish_staging_table(con, table_name)
+    else:
+        bump_table_version(con, table_name)
     logger.success(f"Table '{table_name}' created successfully.")
 
 
+def _load_json_documents(
+    con: duckdb.DuckDBPyConnection,
+    documents: Iterable[dict],
+    table_name: str,
+    flatten: bool = False,
+    chunk_size: int = 10_000,
+) -> None:
+    """
+    Bulk loads JSON documents into a table through a staged NDJSON file.
+
+    Documents are serialised in chunks to a temporary newline-delimited JSON file that
+    DuckDB reads in a single statement, with the path passed as a bound parameter.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        documents (Iterable[dict]): The JSON documents to load.
+        table_name (str): The name of the table to create.
+        flatten (bool): Load into one typed column per top-level key. Defaults to False.
+        chunk_size (int): Number of documents serialised at a time. Defaults to 10,000.
+
+    Returns:
+        None
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".ndjson", encoding="utf-8", delete=False
+    ) as file:
+        path = file.name
+        documents = iter(documents)
+        while chunk := list(itertools.islice(documents, chunk_size)):
+            file.write("\n".join(json.dumps(doc, default=str) for doc in chunk))
+            file.write("\n")
+    try:
+        if flatten:
+            query = "SELECT * FROM read_json(?, format = 'newline_delimited')"
+        else:
+            query = "SELECT json::JSON AS data FROM read_ndjson_objects(?)"
+        with write_lock:
+            con.execute(f"CREATE OR REPLACE TABLE {table_name} AS {query}", [path])
+    finally:
+        os.remove(path)
+
+
+def staging_table_name(table_name: str) -> str:
+    """
+    Returns the name of the staging table a table is loaded into before it is swapped in.
+
+    Args:
+        table_name (str): The name of the live table.
+
+    Returns:
+        str: The name of the staging table, in the same schema as the live table.
+    """
+    return f"{table_name}{STAGING_SUFFIX}"
+
+
+def swap_staging_tables(
+    con: duckdb.DuckDBPyConnection, table_names: Iterable[str]
+) -> None:
+    """
+    Replaces live tables by their staging tables in a single transaction.
+
+    Readers either see all the old tables or all the new ones, and every table is only
+    locked for the duration of a drop and a rename.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_names (Iterable[str]): The names of the live tables to replace.
+
+    Returns:
+        None
+    """
+    table_names = list(table_names)
+    if not table_names:
+        return
+    with write_lock:
+        con.execute("BEGIN TRANSACTION")
+        try:
+            for table_name in table_names:
+                con.execute(f"DROP TABLE IF EXISTS {table_name}")
+                # RENAME TO takes an unqualified name, the table stays in its schema
+                con.execute(
+                    f"ALTER TABLE {staging_table_name(table_name)} "
+                    f"RENAME TO {table_name.rsplit('.', 1)[-1]}"
+                )
+                bump_table_version(con, table_name)
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            logger.error(
+                f"Swapping in tables {', '.join(table_names)} failed, rolled back."
+            )
+            raise
+    logger.success(f"Swapped in tables {', '.join(table_names)}.")
+
+
+@contextmanager
+def staged_swap(con: duckdb.DuckDBPyConnection) -> Iterator[List[str]]:
+    """
+    Loads all tables created in the block through staging tables and swaps them in together.
+
+    The swap happens in one transaction when the block exits, so readers see a
+    consistent snapshot of all the tables. If the block raises, nothing is swapped and
+    the staging tables are dropped.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object used for the final swap.
+
+    Yields:
+        List[str]: The names of the tables staged so far.
+    """
+    pending: List[str] = []
+    token = _pending_swaps.set(pending)
+    try:
+        yield pending
+    except Exception:
+        with write_lock:
+            for table_name in pending:
+                con.execute(f"DROP TABLE IF EXISTS {staging_table_name(table_name)}")
+        raise
+    finally:
+        _pending_swaps.reset(token)
+    swap_staging_tables(con, pending)
+
+
+def resolve_table_name(table_name: str) -> str:
+    """
+    Returns the table holding the latest data of a table, i.e. its staging table while
+    it waits to be swapped in at the end of a `staged_swap` block.
+
+    Args:
+        table_name (str): The name of the live table.
+
+    Returns:
+        str: The name of the table to read from.
+    """
+    if table_name in (_pending_swaps.get() or []):
+        return staging_table_name(table_name)
+    return table_name
+
+
+def in_staged_swap() -> bool:
+    """
+    Checks whether tables are currently loaded inside a `staged_swap` block.
+
+    Returns:
+        bool: True inside a `staged_swap` block, False otherwise.
+    """
+    return _pending_swaps.get() is not None
+
+
+def _use_staging(staging: bool | None) -> bool:
+    """Resolves the staging flag of a load, staging by default inside `staged_swap`."""
+    return staging if staging is not None else in_staged_swap()
+
+
+def _publish_staging_table(con: duckdb.DuckDBPyConnection, table_name: str) -> None:
+    """Swaps a loaded staging table in, or defers the swap to the enclosing `staged_swap`."""
+    pending = _pending_swaps.get()
+    if pending is None:
+        swap_staging_tables(con, [table_name])
+    else:
+        with write_lock:
+            pending.append(table_name)
+
+
+@instrument("select", table_arg="table_name")
 def select_table_to_dataframe(
-    con: duckdb.DuckDBPyConnection, table_name: str
-) -> pd.DataFrame:
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    dtype_backend: str = "numpy",
+    cache: bool = False,
+    columns: List[str] = None,
+    filters: str | Dict[str, Any] = None,
+    order_by: str | List[str | tuple] = None,
+    limit: int = None,
+    batch_size: int = None,
+) -> pd.DataFrame | Iterator[pd.DataFrame]:
     """
     Selects a table or view from the DuckDB database and returns it as a Pandas DataFrame.
 
+    Columns, filters, ordering and limit are compiled into the query, so DuckDB prunes
+    columns and row groups instead of the full table being filtered in pandas.
+
     Args:
         table_name (str): The name of the table or view to be selected.
         db_file (str): The file path to the DuckDB database. Defaults to in-memory (":memory:").
+        dtype_backend (str): 'numpy' for NumPy-backed columns, or 'pyarrow' for ArrowDtype
+            columns built from the Arrow result without copying. Defaults to 'numpy'.
+        cache (bool): Serve the result from the query cache while the table is unchanged.
+            Ignored when returning batches. Defaults to False.
+        columns (List[str]): The columns to select. Defaults to None (all columns).
+        filters (str | Dict[str, Any]): A SQL filter expression, or a dictionary of column
+            conditions, see `build_select_query`. Defaults to None.
+        order_by (str | List[str | tuple]): Columns to order by, see `build_select_query`.
+            Defaults to None.
+        limit (int): Maximum number of rows to return. Defaults to None.
+        batch_size (int): Return an iterator of DataFrames of this many rows instead of a
+            single DataFrame. Defaults to None.
 
     Returns:
-        pd.DataFrame: The selected table or view as a Pandas DataFrame.
+        pd.DataFrame | Iterator[pd.DataFrame]: The selected rows as a Pandas DataFrame, or an
+            iterator of DataFrames if `batch_size` is set.
     """
-    query = f"SELECT * FROM {table_name}"
-    df = con.execute(query).fetch_df()
+    query, params = build_select_query(table_name, columns, filters, order_by, limit)
+
+    if batch_size:
+        reader = con.execute(query, params).to_arrow_reader(batch_size)
+        logger.success(f"Streaming table/view '{table_name}' in batches.")
+        return record_batches_to_dataframes(reader, dtype_backend)
+
+    def run() -> pd.DataFrame:
+        if dtype_backend == "pyarrow":
+            table = con.execute(query, params).to_arrow_table()
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        return con.execute(query, params).fetch_df()
+
+    if cache:
+        df = cached_query(con, query, run, params=params, dtype_backend=dtype_backend)
+    else:
+        df = run()
     logger.success(f"Table/view '{table_name}' selected successfully.")
     return df
+
+
+def build_select_query(
+    table_name: str,
+    columns: List[str] = None,
+    filters: str | Dict[str, Any] = None,
+    order_by: str | List[str | tuple] = None,
+    limit: int = None,
+) -> tuple[str, List[Any]]:
+    """
+    Builds a SELECT query with quoted identifiers and bound filter values.
+
+    A filter dictionary maps column names to conditions, combined with AND:
+    a scalar matches with `=` (None with `IS NULL`), a list matches with `IN`, and a
+    `(low, high)` tuple matches an inclusive range, either end of which may be None,
+    e.g. `{"Project ID": "PJ01", "Cost Date": ("2024-01-01", "2024-03-31")}`.
+
+    Args:
+        table_name (str): The name of the table or view.
+        columns (List[str]): The columns to select. Defaults to None (all columns).
+        filters (str | Dict[str, Any]): A SQL filter expression used as is, or a dictionary
+            of column conditions. Defaults to None.
+        order_by (str | List[str | tuple]): A column name, or a list of column names and
+            `(column, 'ASC' | 'DESC')` tuples. Defaults to None.
+        limit (int): Maximum number of rows to return. Defaults to None.
+
+    Returns:
+        tuple[str, List[Any]]: The SQL query and its bind parameters.
+
+    Raises:
+        ValueError: If a filter condition or ordering direction is not supported.
+    """
+    projection = ", ".join(quote_identifier(c) for c in columns) if columns else "*"
+    query = f"SELECT {projection} FROM {table_name}"
+    params: List[Any] = []
+
+    if isinstance(filters, str):
+        query += f" WHERE {filters}"
+    elif filters:
+        conditions = []
+        for column, condition in filters.items():
+            column = quote_identifier(column)
+            if condition is None:
+                conditions.append(f"{column} IS NULL")
+            elif isinstance(condition, list):
+                conditions.append(f"{column} IN ?")
+                params.append(condition)
+            elif isinstance(condition, tuple):
+                if len(condition) != 2:
+                    raise ValueError(
+                        f"Range filter on {column} must be a (low, high) tuple."
+                    )
+                low, high = condition
+                if low is not None:
+                    conditions.append(f"{column} >= ?")
+                    params.append(low)
+                if high is not None:
+                    conditions.append(f"{column} <= ?")
+                    params.append(high)
+            else:
+                conditions.append(f"{column} = ?")
+                params.append(condition)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+    if order_by:
+        keys = []
+        for key in [order_by] if isinstance(order_by, (str, tuple)) else order_by:
+            column, direction = key if isinstance(key, tuple) else (key, "ASC")
+            if direction.upper() not in ("ASC", "DESC"):
+                raise ValueError(f"Unsupported ordering direction: {direction}")
+            keys.append(f"{quote_identifier(column)} {direction.upper()}")
+        query += " ORDER BY " + ", ".join(keys)
+
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    return query, params
+
+
+def select_table_to_arrow(con: duckdb.DuckDBPyConnection, table_name: str) -> pa.Table:
+    """
+    Selects a table or view from the DuckDB database and returns it as an Arrow table.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table or view to be selected.
+
+    Returns:
+        pa.Table: The selected table or view as an Arrow table.
+    """
+    table = con.execute(f"SELECT * FROM {table_name}").to_arrow_table()
+    logger.success(f"Table/view '{table_name}' selected successfully.")
+    return table
+
+
+def select_table_to_record_batches(
+    con: duckdb.DuckDBPyConnection, table_name: str, batch_size: int = 1_000_000
+) -> pa.RecordBatchReader:
+    """
+    Streams a table or view from the DuckDB database as Arrow record batches.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table or view to be selected.
+        batch_size (int): Number of rows per record batch. Defaults to 1,000,000.
+
+    Returns:
+        pa.RecordBatchReader: A reader yielding the rows in record batches.
+    """
+    logger.info(f"Streaming table/view '{table_name}' in batches of {batch_size} rows.")
+    return con.execute(f"SELECT * FROM {table_name}").to_arrow_reader(batch_size)
+
+
+def log_table_info(con: duckdb.DuckDBPyConnection, table_name: str) -> None:
+    """
+    Logs a profile of a DuckDB table computed inside DuckDB with SUMMARIZE.
+
+    The profile is only computed when a handler accepts DEBUG messages, and the data
+    never leaves DuckDB. Inside a `staged_swap` block, a table waiting to be swapped in
+    is profiled from its staging table.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table or view to profile.
+
+    Returns:
+        None
+    """
+
+    source = resolve_table_name(table_name)
+
+    def describe() -> str:
+        summary = con.execute(f"SUMMARIZE {source}").fetch_df()
+        columns = ["column_name", "column_type", "min", "max", "approx_unique"]
+        columns += ["avg", "null_percentage"]
+        return f"""
+
+Table '{table_name}' Summary:
+{summary[columns].to_string(index=False)}
+"""
+
+    logger.opt(lazy=True).debug("{}", describe)
+
+
+def table_exists(con: duckdb.DuckDBPyConnection, table_name: str) -> bool:
+    """
+    Checks whether a table exists in the DuckDB database.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table.
+
+    Returns:
+        bool: True if the table exists, False otherwise.
+    """
+    result = con.execute(
+        "SELECT count(*) FROM duckdb_tables() WHERE table_name = ?", [table_name]
+    ).fetchone()
+    return result[0] > 0
+
+
+def bump_table_version(con: duckdb.DuckDBPyConnection, table_name: str) -> None:
+    """
+    Records that a table was written by bumping its version in the `_table_versions` table.
+
+    Cached query results reading the table are invalidated, and results cached before
+    the bump are no longer looked up as their keys contain the old version.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table that was written.
+
+    Returns:
+        None
+    """
+    name = table_name.rsplit(".", 1)[-1]
+    if name.endswith(STAGING_SUFFIX):
+        return
+    with write_lock:
+        con.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {TABLE_VERSIONS_TABLE} (
+                table_name VARCHAR PRIMARY KEY,
+                version BIGINT,
+                updated_at TIMESTAMP
+            )
+            """
+        )
+        con.execute(
+            f"""
+            INSERT INTO {TABLE_VERSIONS_TABLE} VALUES (?, 1, current_timestamp)
+            ON CONFLICT (table_name) DO UPDATE
+            SET version = {TABLE_VERSIONS_TABLE}.version + 1,
+                updated_at = excluded.updated_at
+            """,
+            [name],
+        )
+    invalidate_table(name)
+
+
+def append_table(
+    con: duckdb.DuckDBPyConnection,
+    data: pd.DataFrame | pa.Table | pa.RecordBatch,
+    table_name: str,
+) -> None:
+    """
+    Appends a Pandas DataFrame or Arrow data to an existing DuckDB table, matching columns by name.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        data (pd.DataFrame, pa.Table or pa.RecordBatch): The data to be appended.
+        table_name (str): The name of the table to append to.
+
+    Returns:
+        None
+    """
+    logger.info(f"Appending {data.shape[0]} rows to table '{table_name}'.")
+    with write_lock:
+        con.execute(f"INSERT INTO {table_name} BY NAME SELECT * FROM data")
+        bump_table_version(con, table_name)
+
+
+def create_manifest_table(con: duckdb.DuckDBPyConnection) -> None:
+    """
+    Creates the ingest manifest table if it does not exist yet.
+
+    The manifest records, per table, every source file that has been loaded together
+    with its Drive `modifiedTime` and `md5Checksum`, so unchanged files can be skipped
+    on the next run. The rows of a file are found by its ID in the source file column,
+    not by position, as deletes shift the positions of the remaining rows.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+
+    Returns:
+        None
+    """
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+            table_name VARCHAR,
+            file_id VARCHAR,
+            file_name VARCHAR,
+            modified_time VARCHAR,
+            md5_checksum VARCHAR,
+            row_count BIGINT,
+            ingested_at TIMESTAMP DEFAULT current_timestamp,
+            PRIMARY KEY (table_name, file_id)
+        )
+        """
+    )
+
+
+def read_manifest(
+    con: duckdb.DuckDBPyConnection, table_name: str
+) -> Dict[str, Dict[str, str]]:
+    """
+    Reads the manifest entries of a table.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table.
+
+    Returns:
+        Dict[str, Dict[str, str]]: Manifest entries keyed by file ID.
+    """
+    create_manifest_table(con)
+    rows = con.execute(
+        f"""
+        SELECT file_id, file_name, modified_time, md5_checksum, row_count
+        FROM {MANIFEST_TABLE}
+        WHERE table_name = ?
+        """,
+        [table_name],
+    ).fetchall()
+    columns = ["file_id", "file_name", "modified_time", "md5_checksum", "row_count"]
+    return {row[0]: dict(zip(columns, row)) for row in rows}
+
+
+def update_manifest(
+    con: duckdb.DuckDBPyConnection, table_name: str, entries: List[Dict]
+) -> None:
+    """
+    Inserts or replaces manifest entries of a table.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table.
+        entries (List[Dict]): Entries with file_id, file_name, modified_time, md5_checksum
+            and row_count keys.
+
+    Returns:
+        None
+    """
+    create_manifest_table(con)
+    con.executemany(
+        f"""
+        INSERT OR REPLACE INTO {MANIFEST_TABLE}
+            (table_name, file_id, file_name, modified_time, md5_checksum, row_count)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            [
+                table_name,
+                entry["file_id"],
+                entry.get("file_name"),
+                entry.get("modified_time"),
+                entry.get("md5_checksum"),
+                entry.get("row_count"),
+            ]
+            for entry in entries
+        ],
+    )
+
+
+def delete_manifest_entries(
+    con: duckdb.DuckDBPyConnection, table_name: str, file_ids: List[str] = None
+) -> None:
+    """
+    Deletes manifest entries of a table.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table.
+        file_ids (List[str]): The file IDs to delete. Defaults to all entries of the table.
+
+    Returns:
+        None
+    """
+    create_manifest_table(con)
+    if file_ids is None:
+        con.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE table_name = ?", [table_name])
+    elif file_ids:
+        con.execute(
+            f"DELETE FROM {MANIFEST_TABLE} WHERE table_name = ? AND file_id IN ?",
+            [table_name, list(file_ids)],
+        )
+
+
+def delete_rows_by_source_file(
+    con: duckdb.DuckDBPyConnection, table_name: str, file_ids: List[str]
+) -> None:
+    """
+    Deletes the rows loaded from the given source files.
+
+    Rows are matched on the lineage column rather than on the manifest row range, as
+    row positions shift once earlier files have been deleted.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table.
+        file_ids (List[str]): The source file IDs whose rows should be deleted.
+
+    Returns:
+        None
+    """
+    if not file_ids:
+        return
+    logger.info(f"Deleting rows of {len(file_ids)} files from table '{table_name}'.")
+    con.execute(
+        f"DELETE FROM {table_name} WHERE {SOURCE_FILE_COLUMN} IN ?", [list(file_ids)]
+    )
+    bump_table_version(con, table_name)
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Quotes a column name for use in DuckDB SQL.
+
+    Args:
+        name (str): The column name (e.g., 'Project ID').
+
+    Returns:
+        str: The double-quoted identifier.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def sql_literal(value: Any) -> str:
+    """
+    Renders a Python value as a DuckDB SQL literal.
+
+    Args:
+        value (Any): A string, number, boolean, list or dictionary.
+
+    Returns:
+        str: The SQL literal.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(sql_literal(item) for item in value) + "]"
+    if isinstance(value, dict):
+        items = (f"{sql_literal(str(k))}: {sql_literal(v)}" for k, v in value.items())
+        return "{" + ", ".join(items) + "}"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _to_duckdb_type(dtype: Any) -> str:
+    """Maps a pandas dtype (name or type) to a DuckDB column type."""
+    name = dtype.__name__ if isinstance(dtype, type) else str(dtype)
+    try:
+        return PANDAS_TO_DUCKDB_TYPES[name]
+    except KeyError:
+        raise ValueError(f"Unsupported dtype for DuckDB load: {dtype}")
+
+
+def pandas_to_duckdb_csv_options(**kwargs) -> tuple[Dict[str, Any], List[str], int]:
+    """
+    Translates pandas.read_csv keyword arguments into DuckDB read_csv options.
+
+    Args:
+        **kwargs: pandas.read_csv keyword arguments (e.g., sep, header, skiprows, dtype, usecols).
+
+    Returns:
+        tuple[Dict[str, Any], List[str], int]: The read_csv options, the columns to select
+            (None for all) and the row limit (None for no limit).
+
+    Raises:
+        ValueError: If an argument has no DuckDB equivalent.
+    """
+    options = {}
+    kwargs = dict(kwargs)
+
+    for pandas_name, duckdb_name in PANDAS_TO_DUCKDB_CSV_OPTIONS.items():
+        if pandas_name in kwargs:
+            options[duckdb_name] = kwargs.pop(pandas_name)
+
+    header = kwargs.pop("header", 0)
+    skip = kwargs.pop("skiprows", 0) or 0
+    if not isinstance(skip, int):
+        raise ValueError("Only an integer skiprows is supported for DuckDB loads")
+    if header is None:
+        options["header"] = False
+    else:
+        options["header"] = True
+        skip += header
+    if skip:
+        options["skip"] = skip
+
+    dtype = kwargs.pop("dtype", None)
+    if dtype is str:
+        options["all_varchar"] = True
+    elif isinstance(dtype, dict):
+        options["types"] = {str(k): _to_duckdb_type(v) for k, v in dtype.items()}
+    elif dtype is not None:
+        raise ValueError("Only dtype=str or a dtype dictionary is supported")
+
+    # DuckDB detects date and timestamp columns itself, which covers parse_dates=True
+    parse_dates = kwargs.pop("parse_dates", None)
+    if isinstance(parse_dates, (list, tuple)) and all(
+        isinstance(column, str) for column in parse_dates
+    ):
+        types = options.setdefault("types", {})
+        types.update({column: "TIMESTAMP" for column in parse_dates})
+    elif parse_dates not in (None, True, False):
+        raise ValueError("Only parse_dates=True or a list of column names is supported")
+
+    na_values = kwargs.pop("na_values", None)
+    if na_values is not None:
+        options["nullstr"] = (
+            [na_values] if isinstance(na_values, str) else list(na_values)
+        )
+
+    columns = kwargs.pop("usecols", None)
+    limit = kwargs.pop("nrows", None)
+
+    if kwargs:
+        raise ValueError(f"Unsupported arguments for DuckDB load: {list(kwargs)}")
+    return options, columns, limit
+
+
+def build_file_scan_query(
+    file_paths: str | List[str], file_format: str, lineage: bool = False, **kwargs
+) -> str:
+    """
+    Builds a DuckDB SELECT statement scanning CSV or Parquet files with the native readers.
+
+    Several files are scanned in one multi-file scan, with columns matched by name so
+    schema drift between files does not break the load. With `lineage`, the name of
+    each row's source file (without extension) is added as a `_source_file_id` column.
+
+    Args:
+        file_paths (str | List[str]): Path or paths of the files to scan.
+        file_format (str): The format of the files ('csv' or 'parquet').
+        lineage (bool): Add the source file name as a lineage column. Defaults to False.
+        **kwargs: pandas reader keyword arguments, translated to DuckDB reader options.
+
+    Returns:
+        str: The SELECT statement.
+
+    Raises:
+        ValueError: If the file format or an argument is not supported.
+    """
+    file_format = file_format.lower().lstrip(".")
+    if file_format == "csv":
+        options, columns, limit = pandas_to_duckdb_csv_options(**kwargs)
+        reader = "read_csv"
+    elif file_format == "parquet":
+        columns = kwargs.pop("columns", None)
+        limit = None
+        if kwargs:
+            raise ValueError(f"Unsupported arguments for DuckDB load: {list(kwargs)}")
+        options = {}
+        reader = "read_parquet"
+    else:
+        raise ValueError(f"Unsupported file type for DuckDB scan: {file_format}")
+
+    if isinstance(file_paths, (list, tuple)):
+        options["union_by_name"] = True
+    if lineage:
+        options["filename"] = True
+
+    arguments = [sql_literal(file_paths)]
+    arguments += [f"{name} = {sql_literal(value)}" for name, value in options.items()]
+    if columns:
+        projection = ", ".join(map(quote_identifier, columns))
+    else:
+        projection = "* EXCLUDE (filename)" if lineage else "*"
+    if lineage:
+        projection += f", parse_filename(filename, true) AS {SOURCE_FILE_COLUMN}"
+    query = f"SELECT {projection} FROM {reader}({', '.join(arguments)})"
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    return query
+
+
+def _widen_column_types(
+    con: duckdb.DuckDBPyConnection, table_name: str, data: pd.DataFrame
+) -> None:
+    """
+    Changes the column types of a table to the types DuckDB unifies them with the columns
+    of `data` to, e.g. BIGINT and DOUBLE to DOUBLE, so that `data` can be inserted.
+    """
+    described = con.execute(f"DESCRIBE {table_name}").fetchall()
+    current = {row[0]: row[1] for row in described}
+    unified = con.execute(
+        f"DESCRIBE (SELECT * FROM {table_name} LIMIT 0) "
+        "UNION ALL BY NAME (SELECT * FROM data LIMIT 0)"
+    ).fetchall()
+    for column, column_type, *_ in unified:
+        if column in current and current[column] != column_type:
+            logger.info(
+                f"Widening column '{column}' of table '{table_name}' "
+                f"from {current[column]} to {column_type}."
+            )
+            con.execute(
+                f"ALTER TABLE {table_name} ALTER COLUMN {quote_identifier(column)} "
+                f"TYPE {column_type}"
+            )
+
+
+@instrument("load", table_arg="table_name")
+def load_file_to_table(
+    con: duckdb.DuckDBPyConnection,
+    file_path: str | List[str],
+    table_name: str,
+    file_format: str,
+    append: bool = False,
+    lineage: bool = False,
+    staging: bool | None = None,
+    schema: Dict[str, str] = None,
+    **kwargs,
+) -> None:
+    """
+    Loads local files straight into a DuckDB table, without going through pandas.
+
+    CSV and Parquet files are scanned by DuckDB's parallel native readers, several files
+    at once in a single multi-file scan. Excel workbooks are streamed in batches with
+    `iter_excel_batches` (calamine by default). Without a schema, the column types of a
+    new table are widened as batches arrive so that they hold every batch, e.g. from
+    BIGINT to DOUBLE.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        file_path (str | List[str]): The path or paths of the files to load.
+        table_name (str): The name of the table to create or append to.
+        file_format (str): The format of the files ('csv', 'parquet', 'excel').
+        append (bool): Append to the existing table instead of replacing it. Defaults to False.
+        lineage (bool): Add the source file name as a `_source_file_id` column. Defaults to False.
+        staging (bool | None): Replace the table through a staging table, see `create_table`.
+            Ignored when appending. Defaults to None.
+        schema (Dict[str, str]): Schema contract whose column types the new table is cast to.
+            Appended rows are cast implicitly to the table's types. Defaults to None.
+        **kwargs: pandas reader keyword arguments, translated to DuckDB reader options.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If the file format or an argument is not supported.
+    """
+    logger.info(f"Loading {file_format} file {file_path} into table '{table_name}'.")
+    staging = not append and _use_staging(staging)
+    target = staging_table_name(table_name) if staging else table_name
+    if file_format.lower() in ("excel", "xlsx", ".xlsx"):
+        paths = [file_path] if isinstance(file_path, str) else file_path
+        loaded = created = False
+        for path in paths:
+            for batch in iter_excel_batches(path, **kwargs):
+                loaded = True
+                if lineage:
+                    batch[SOURCE_FILE_COLUMN] = os.path.splitext(
+                        os.path.basename(path)
+                    )[0]
+                if append:
+                    append_table(con, batch, target)
+                elif created:
+                    with write_lock:
+                        # Without a schema, the types of the first batch may not hold
+                        # the later ones, e.g. a column that only held integers or nulls
+                        if not schema:
+                            _widen_column_types(con, target, batch)
+                        con.execute(f"INSERT INTO {target} BY NAME SELECT * FROM batch")
+                else:
+                    with write_lock:
+                        con.execute(
+                            f"CREATE OR REPLACE TABLE {target} "
+                            f"AS SELECT {duckdb_cast_projection(schema)} FROM batch"
+                        )
+                    created = True
+        if not loaded:
+            logger.warning(
+                f"No rows read from {file_path}, table '{table_name}' not loaded."
+            )
+            return
+    else:
+        query = build_file_scan_query(file_path, file_format, lineage, **kwargs)
+        with write_lock:
+            if append:
+                con.execute(f"INSERT INTO {target} BY NAME {query}")
+            elif schema:
+                con.execute(
+                    f"CREATE OR REPLACE TABLE {target} AS "
+                    f"SELECT {duckdb_cast_projection(schema)} FROM ({query})"
+                )
+            else:
+                con.execute(f"CREATE OR REPLACE TABLE {target} AS {query}")
+    if staging:
+        _publish_staging_table(con, table_name)
+    else:
+        bump_table_version(con, table_name)
+    logger.success(f"Loaded {file_path} into table '{table_name}'.")
+
+
+def _partition_columns(
+    partition_by: List[str],
+) -> tuple[List[str], List[str], List[str]]:
+    """
+    Splits partition keys into derived column expressions and partition column names.
+
+    A key is a column name, or `year(column)`, `month(column)` or `day(column)`, which
+    derives a `<column>_<part>` column, e.g. `year(Cost Date)` gives `Cost Date_year`.
+    The column may hold dates, timestamps or text such as '2024-01-31', which is cast.
+
+    Args:
+        partition_by (List[str]): The partition keys.
+
+    Returns:
+        tuple[List[str], List[str], List[str]]: The derived column expressions to select,
+            the quoted names of all partition columns and the quoted date columns the
+            derived columns are computed from.
+    """
+    derived, names, date_columns = [], [], []
+    for key in partition_by:
+        match = re.fullmatch(r"(year|month|day)\((.+)\)", key.strip(), re.IGNORECASE)
+        if match:
+            part, column = match.group(1).lower(), match.group(2).strip().strip('"')
+            name = quote_identifier(f"{column}_{part}")
+            column = quote_identifier(column)
+            derived.append(f"{part}(TRY_CAST({column} AS TIMESTAMP)) AS {name}")
+            names.append(name)
+            date_columns.append(column)
+        else:
+            names.append(quote_identifier(key))
+    return derived, names, date_columns
+
+
+def export_table_to_lake(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    lake_dir: str,
+    partition_by: List[str] = None,
+    view_name: str = None,
+) -> str:
+    """
+    Writes a table to a local Parquet lake and registers a DuckDB view over it.
+
+    The table is written as zstd Parquet to `<lake_dir>/<table_name>`, hive-partitioned by
+    the given keys, so queries on the view prune partitions and any number of readers
+    can scan the files without taking the DuckDB file lock. The previous export is only
+    replaced once the new one is complete. Queries on the view are never served from
+    the query cache, as it reads files.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table to export.
+        lake_dir (str): The root directory of the lake.
+        partition_by (List[str]): Partition keys, see `_partition_columns`. Defaults to None.
+        view_name (str): The name of the view over the Parquet files. Defaults to
+            `<table_name>_lake`.
+
+    Returns:
+        str: The directory the table was written to.
+
+    Raises:
+        ValueError: If a column partitioned by year, month or day holds values that are
+            not dates.
+    """
+    source = resolve_table_name(table_name)
+    derived, names, date_columns = _partition_columns(partition_by or [])
+    for column in date_columns:
+        invalid = con.execute(
+            f"""
+            SELECT count(*) FROM {source}
+            WHERE {column} IS NOT NULL AND TRY_CAST({column} AS TIMESTAMP) IS NULL
+            """
+        ).fetchone()[0]
+        if invalid:
+            logger.error(f"Column {column} of '{table_name}' has {invalid} non-dates.")
+            raise ValueError(
+                f"Cannot partition '{table_name}' by column {column}: "
+                f"{invalid} values are not dates."
+            )
+
+    os.makedirs(lake_dir, exist_ok=True)
+    table_dir = os.path.join(lake_dir, table_name)
+    temp_dir = f"{table_dir}.tmp-{uuid.uuid4().hex[:8]}"
+    select = ", ".join(["*", *derived])
+    options = "FORMAT parquet, COMPRESSION zstd"
+    if names:
+        options += f", PARTITION_BY ({', '.join(names)})"
+        target = sql_literal(temp_dir)
+    else:
+        os.makedirs(temp_dir)
+        target = sql_literal(os.path.join(temp_dir, "data.parquet"))
+
+    logger.info(f"Exporting table '{table_name}' to Parquet lake {table_dir}.")
+    try:
+        con.execute(f"COPY (SELECT {select} FROM {source}) TO {target} ({options})")
+        # A partitioned export of an empty table writes no files
+        os.makedirs(temp_dir, exist_ok=True)
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    old_dir = f"{table_dir}.old-{uuid.uuid4().hex[:8]}"
+    if os.path.exists(table_dir):
+        os.rename(table_dir, old_dir)
+    os.rename(temp_dir, table_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    view_name = view_name or f"{table_name}_lake"
+    files = os.path.join(os.path.abspath(table_dir), "**", "*.parquet")
+    if glob.glob(files, recursive=True):
+        view = _lake_view_query(con, files, bool(names))
+    else:
+        # Without files, the view returns no rows with the columns of the table
+        columns = con.execute(f"DESCRIBE SELECT {select} FROM {source}").fetchall()
+        view = "SELECT " + ", ".join(
+            f"CAST(NULL AS {column_type}) AS {quote_identifier(column)}"
+            for column, column_type, *_ in columns
+        )
+        view += " WHERE false"
+    with write_lock:
+        con.execute(f"CREATE OR REPLACE VIEW {view_name} AS {view}")
+    invalidate_table(view_name)
+    logger.success(f"Exported table '{table_name}' to {table_dir}, view '{view_name}'.")
+    return table_dir
+
+
+def _lake_view_query(
+    con: duckdb.DuckDBPyConnection, files: str, hive_partitioning: bool
+) -> str:
+    """
+    Builds the query of a view over Parquet files.
+
+    Partition directories URL-encode column names (e.g. 'Project%20ID'), so those
+    partition columns are renamed back.
+    """
+    scan = (
+        f"read_parquet({sql_literal(files)}, "
+        f"hive_partitioning = {str(hive_partitioning).lower()})"
+    )
+    description = con.execute(f"SELECT * FROM {scan} LIMIT 0").description
+    renames = {
+        column: urllib.parse.unquote(column)
+        for column, *_ in description
+        if urllib.parse.unquote(column) != column
+    }
+    select = "*"
+    if renames:
+        excluded = ", ".join(map(quote_identifier, renames))
+        aliases = ", ".join(
+            f"{quote_identifier(encoded)} AS {quote_identifier(name)}"
+            for encoded, name in renames.items()
+        )
+        select = f"* EXCLUDE ({excluded}), {aliases}"
+    return f"SELECT {select} FROM {scan}"
+
+
+def export_table_to_file(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    file_path: str,
+    file_format: str = "parquet",
+    compression: str = None,
+) -> str:
+    """
+    Writes a table or view to a file with DuckDB's COPY statement.
+
+    DuckDB streams the rows to the file, spilling to disk if needed, so extracts larger
+    than memory never pass through Python.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table or view to export.
+        file_path (str): The path of the file.
+        file_format (str): 'parquet', 'csv' or 'json'. Defaults to 'parquet'.
+        compression (str): The compression codec (e.g., 'zstd', 'gzip'). Defaults to zstd for
+            Parquet files and to the file extension (e.g., '.csv.gz') otherwise.
+
+    Returns:
+        str: The path of the file.
+
+    Raises:
+        ValueError: If the file format is not supported.
+    """
+    file_format = file_format.lower().lstrip(".")
+    if file_format not in ("parquet", "csv", "json"):
+        logger.error(f"Unsupported export format: {file_format}")
+        raise ValueError(f"Unsupported export format: {file_format}")
+    if compression is None and file_format == "parquet":
+        compression = "zstd"
+
+    options = f"FORMAT {file_format}"
+    if file_format == "csv":
+        options += ", HEADER true"
+    if compression:
+        options += f", COMPRESSION {compression}"
+    logger.info(f"Exporting table/view '{table_name}' to {file_path}.")
+    con.execute(
+        f"COPY (SELECT * FROM {table_name}) TO {sql_literal(file_path)} ({options})"
+    )
+    logger.success(f"Exported table/view '{table_name}' to {file_path}.")
+    return file_path
+
+
+def write_ingest_metrics(
+    con: duckdb.DuckDBPyConnection, records: List[Dict], run_id: str
+) -> None:
+    """
+    Appends per-stage ingest metrics to the `_ingest_metrics` table.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        records (List[Dict]): The metrics recorded by `src.utils.metrics`.
+        run_id (str): Identifier of the ingest run the metrics belong to.
+
+    Returns:
+        None
+    """
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {METRICS_TABLE} (
+            run_id VARCHAR,
+            table_name VARCHAR,
+            stage VARCHAR,
+            status VARCHAR,
+            started_at TIMESTAMPTZ,
+            seconds DOUBLE,
+            rows BIGINT,
+            bytes BIGINT,
+            peak_rss_mb DOUBLE
+        )
+        """
+    )
+    if not records:
+        return
+    con.executemany(
+        f"INSERT INTO {METRICS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            [
+                run_id,
+                record["table_name"],
+                record["stage"],
+                record.get("status"),
+                record["started_at"],
+                record["seconds"],
+                record.get("rows"),
+                record.get("bytes"),
+                record.get("peak_rss_mb"),
+            ]
+            for record in records
+        ],
+    )
+    logger.info(f"Wrote {len(records)} ingest metrics to table '{METRICS_TABLE}'.")
@@ -1,25 +1,89 @@
 import fnmatch
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from contextvars import copy_context
 from io import BytesIO
-from typing import Dict, List
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Tuple
 
 import duckdb
+import httplib2
 import pandas as pd
+import pyarrow as pa
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import HttpError, build
-from googleapiclient.http import MediaIoBaseUpload
+from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
 from loguru import logger
 
-from src.connectors.duck import create_table
-from src.utils.dataframe.read import (log_dataframe_info,
+from src.connectors.duck import (SOURCE_FILE_COLUMN, append_table, create_table,
+                                 delete_manifest_entries,
+                                 delete_rows_by_source_file,
+                                 export_table_to_lake, in_staged_swap,
+                                 load_file_to_table, log_table_info,
+                                 read_manifest,
+                                 select_table_to_record_batches, staged_swap,
+                                 table_exists, update_manifest,
+                                 write_ingest_metrics, write_lock)
+from src.utils.dataframe.read import (iter_file_object_batches,
+                                      log_dataframe_info,
+                                      read_file_object_to_arrow,
                                       read_file_object_to_dataframe)
+from src.utils.dataframe.schema import infer_schema, load_schema, memory_savings
+from src.utils.dataframe.write import write_dataframe_to_file_buffer
+from src.utils.file.write import write_dict_to_yaml
+from src.utils.metrics import (collect_metrics, current_table,
+                               export_to_opentelemetry, get_metrics, instrument,
+                               reset_peak_rss, summarize_metrics,
+                               table_context, track, write_prometheus_textfile)
 
+# File metadata requested from Drive; modifiedTime and md5Checksum drive incremental ingest
+FILE_FIELDS = "id, name, modifiedTime, md5Checksum"
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
 
-def connect_to_google_drive(service_account_file: str) -> build:
+# Default chunk size of resumable downloads (bytes)
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024
+
+# HTTP status codes worth retrying: quota throttling and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# OAuth scopes of read-only access and of access to the files the service account creates
+# or is shared on, which uploads need
+DRIVE_READONLY_SCOPE = "https://www.googleapis.com/auth/drive.readonly"
+DRIVE_SCOPE = "https://www.googleapis.com/auth/drive"
+
+# File extensions and MIME types of the file types of `write_dataframe_to_file_buffer`
+UPLOAD_FILE_TYPES = {
+    "csv": ("csv", "text/csv"),
+    "csv.gz": ("csv.gz", "application/gzip"),
+    "csv.zst": ("csv.zst", "application/zstd"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "arrow": ("arrow", "application/vnd.apache.arrow.file"),
+    "excel": (
+        "xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+}
+
+_thread_local = threading.local()
+
+
+def connect_to_google_drive(
+    service_account_file: str, scopes: List[str] = None
+) -> build:
     """
     Authenticates and creates a Google Drive service client using a service account key.
 
     Args:
         service_account_file (str): Path to the service account key JSON file.
+        scopes (List[str]): OAuth scopes of the client. Defaults to read-only access, pass
+            `[DRIVE_SCOPE]` to upload files.
 
     Returns:
         build: Authenticated Google Drive API client.
@@ -31,7 +95,7 @@ def connect_to_google_drive(service_account_file: str) -> build:
     try:
         credentials = service_account.Credentials.from_service_account_file(
             service_account_file,
-            scopes=["https://www.googleapis.com/auth/drive.readonly"],
+            scopes=scopes or [DRIVE_READONLY_SCOPE],
         )
         service = build("drive", "v3", credentials=credentials)
         logger.success("Successfully authenticated and created Google Drive service.")
@@ -41,28 +105,172 @@ def connect_to_google_drive(service_account_file: str) -> build:
         raise
 
 
-def list_files_in_folder(service: build, folder_id: str) -> List[Dict[str, str]]:
+def _get_thread_http(service: build) -> AuthorizedHttp | None:
+    """
+    Returns an authorised HTTP object private to the calling thread.
+
+    httplib2 is not thread-safe, so each worker thread needs its own transport when
+    requests are executed concurrently. Services without credentials (e.g. a local
+    fake Drive service) fall back to their own transport.
+
+    Args:
+        service (build): Google Drive API service client.
+
+    Returns:
+        AuthorizedHttp | None: The thread-local HTTP object, or None if the service has no credentials.
+    """
+    credentials = getattr(getattr(service, "_http", None), "credentials", None)
+    if credentials is None:
+        return None
+    if getattr(_thread_local, "credentials", None) is not credentials:
+        _thread_local.http = AuthorizedHttp(credentials, http=httplib2.Http())
+        _thread_local.credentials = credentials
+    return _thread_local.http
+
+
+def _execute_kwargs(service: build) -> Dict[str, Any]:
+    """Returns the `request.execute` arguments binding a request to the thread's transport."""
+    http = _get_thread_http(service)
+    return {"http": http} if http else {}
+
+
+def execute_with_retry(
+    request: Any, retries: int = 5, backoff: float = 1.0, **kwargs
+) -> Any:
+    """
+    Executes a Google API request, retrying quota and server errors with exponential backoff.
+
+    Args:
+        request (Any): The Google API request to execute.
+        retries (int): Maximum number of retries on a retryable error. Defaults to 5.
+        backoff (float): Base delay in seconds, doubled on every attempt. Defaults to 1.0.
+        **kwargs: Additional arguments passed to `request.execute` (e.g., http).
+
+    Returns:
+        Any: The response of the request.
+
+    Raises:
+        HttpError: If the error is not retryable or the retries are exhausted.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return request.execute(**kwargs)
+        except HttpError as e:
+            status = int(getattr(e.resp, "status", 0))
+            if status not in RETRYABLE_STATUS_CODES or attempt == retries:
+                raise
+            delay = backoff * 2**attempt + random.uniform(0, backoff)
+            logger.warning(
+                f"Request failed with HTTP {status}, retrying in {delay:.1f}s "
+                f"(attempt {attempt + 1} of {retries})"
+            )
+            time.sleep(delay)
+
+
+def _pattern_to_query(pattern: str) -> str | None:
+    """
+    Translates the leading word of a glob pattern into a Drive `name contains` clause.
+
+    Drive splits names into words and only does prefix matching on them with `contains`,
+    so a literal prefix with punctuation (e.g. 'PCS_2024' in 'PCS_2024*.csv') may not
+    match files that the pattern matches. Only the leading alphanumeric run of the
+    pattern (e.g. 'PCS') is pushed down; the full pattern is still applied client-side.
+
+    Args:
+        pattern (str): Glob pattern to filter file names (e.g., 'PCS_*.csv').
+
+    Returns:
+        str | None: The query clause, or None if the pattern does not start with a word.
+    """
+    match = re.match(r"[^\W_]+", pattern)
+    if not match:
+        return None
+    return f"name contains '{match.group(0)}'"
+
+
+def iter_files_in_folder(
+    service: build,
+    folder_id: str,
+    pattern: str = None,
+    recursive: bool = False,
+    page_size: int = 1000,
+) -> Iterator[Dict[str, str]]:
+    """
+    Lazily yields the files of a Google Drive folder, page by page.
+
+    Pages are requested with the largest page size Drive allows and files are yielded
+    as soon as their page arrives, so consumers can start downloading before the
+    listing has finished.
+
+    Args:
+        service (build): Google Drive API service client.
+        folder_id (str): The ID of the Google Drive folder.
+        pattern (str): Glob pattern to filter file names (e.g., '*PCS*'). Defaults to None.
+        recursive (bool): Whether to descend into subfolders. Defaults to False.
+        page_size (int): Number of files requested per page, at most 1000. Defaults to 1000.
+
+    Yields:
+        Dict[str, str]: File metadata such as file ID, name, modified time and MD5 checksum.
+    """
+    clauses = [f"'{folder_id}' in parents"]
+    if not recursive:
+        clauses.append(f"mimeType != '{FOLDER_MIME_TYPE}'")
+    if pattern and not recursive:
+        # Folder names do not have to match the pattern, so only filter files server-side
+        name_clause = _pattern_to_query(pattern)
+        if name_clause:
+            clauses.append(name_clause)
+    query = " and ".join(clauses)
+
+    subfolders = []
+    page_token = None
+    while True:
+        request = service.files().list(
+            q=query,
+            pageSize=page_size,
+            pageToken=page_token,
+            fields=f"nextPageToken, files({FILE_FIELDS}, mimeType)",
+        )
+        results = execute_with_retry(request, **_execute_kwargs(service))
+        for file in results.get("files", []):
+            if file.get("mimeType") == FOLDER_MIME_TYPE:
+                subfolders.append(file["id"])
+            elif not pattern or fnmatch.fnmatch(file["name"], pattern):
+                yield file
+        page_token = results.get("nextPageToken")
+        if not page_token:
+            break
+
+    for subfolder_id in subfolders:
+        logger.info(f"Descending into subfolder {subfolder_id} of folder {folder_id}")
+        yield from iter_files_in_folder(
+            service, subfolder_id, pattern, recursive, page_size
+        )
+
+
+def list_files_in_folder(
+    service: build, folder_id: str, pattern: str = None, recursive: bool = False
+) -> List[Dict[str, str]]:
     """
     Fetches all files from a specified Google Drive folder.
 
     Args:
         service (build): Google Drive API service client.
         folder_id (str): The ID of the Google Drive folder.
+        pattern (str): Glob pattern to filter file names (e.g., '*PCS*'). Defaults to None.
+        recursive (bool): Whether to include files in subfolders. Defaults to False.
 
     Returns:
-        List[Dict[str, str]]: A list of dictionaries containing file metadata such as file ID and name.
+        List[Dict[str, str]]: A list of dictionaries containing file metadata such as file ID, name,
+            modified time and MD5 checksum.
 
     Raises:
         HttpError: If there is an error fetching the files.
     """
     logger.info(f"Fetching files from folder {folder_id}")
-    query = (
-        f"'{folder_id}' in parents and mimeType != 'application/vnd.google-apps.folder'"
-    )
 
     try:
-        results = service.files().list(q=query, fields="files(id, name)").execute()
-        files = results.get("files", [])
+        files = list(iter_files_in_folder(service, folder_id, pattern, recursive))
 
         if not files:
             logger.warning(f"Folder {folder_id} is empty or does not exist.")
@@ -76,6 +284,25 @@ def list_files_in_folder(service: build, folder_id: str) -> List[Dict[str, str]]
         return []
 
 
+def get_file_metadata(service: build, file_id: str) -> Dict[str, str]:
+    """
+    Fetches the metadata of a single Google Drive file.
+
+    Args:
+        service (build): Google Drive API service client.
+        file_id (str): The ID of the file.
+
+    Returns:
+        Dict[str, str]: File metadata such as file ID, name, modified time and MD5 checksum.
+
+    Raises:
+        HttpError: If there is an error fetching the metadata.
+    """
+    logger.info(f"Fetching metadata of file {file_id}")
+    request = service.files().get(fileId=file_id, fields=FILE_FIELDS)
+    return execute_with_retry(request, **_execute_kwargs(service))
+
+
 def filter_files_in_list(
     files: List[Dict[str, str]], pattern: str
 ) -> List[Dict[str, str]]:
@@ -105,13 +332,18 @@ def filter_files_in_list(
     return filtered_files
 
 
-def download_file_as_bytes(service: build, file_id: str) -> BytesIO:
+@instrument("download")
+def download_file_as_bytes(
+    service: build, file_id: str, retries: int = 5, backoff: float = 1.0
+) -> BytesIO:
     """
     Downloads a file from Google Drive as a byte stream.
 
     Args:
         service (build): Google Drive API service client.
         file_id (str): The ID of the file to download.
+        retries (int): Maximum number of retries on quota or server errors. Defaults to 5.
+        backoff (float): Base delay in seconds between retries. Defaults to 1.0.
 
     Returns:
         BytesIO: A byte stream containing the file data.
@@ -122,14 +354,288 @@ def download_file_as_bytes(service: build, file_id: str) -> BytesIO:
     logger.info(f"Reading file with ID {file_id} as byte stream.")
     try:
         request = service.files().get_media(fileId=file_id)
-        return BytesIO(request.execute())
+        return BytesIO(
+            execute_with_retry(request, retries, backoff, **_execute_kwargs(service))
+        )
     except HttpError as e:
         logger.error(f"Error downloading file with ID {file_id}: {e}")
         raise
 
 
+@instrument("download")
+def download_file_in_chunks(
+    service: build,
+    file_id: str,
+    file_object: IO[bytes] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    retries: int = 5,
+    backoff: float = 1.0,
+) -> IO[bytes]:
+    """
+    Downloads a file from Google Drive in chunks with a resumable media download.
+
+    Only one chunk is held in memory at a time. By default the file is written to a
+    spooled temporary file that moves to disk once it outgrows a single chunk. If the
+    connection drops, the download resumes from the last completed chunk.
+
+    Args:
+        service (build): Google Drive API service client.
+        file_id (str): The ID of the file to download.
+        file_object (IO[bytes]): Writable binary file object to download into. Defaults to a
+            spooled temporary file.
+        chunk_size (int): Number of bytes requested per chunk. Defaults to 32 MiB.
+        retries (int): Maximum number of retries per chunk. Defaults to 5.
+        backoff (float): Base delay in seconds between resume attempts. Defaults to 1.0.
+
+    Returns:
+        IO[bytes]: The file object containing the file data, positioned at the start.
+
+    Raises:
+        HttpError: If there is an error downloading the file.
+    """
+    logger.info(f"Downloading file with ID {file_id} in chunks of {chunk_size} bytes.")
+    if file_object is None:
+        file_object = tempfile.SpooledTemporaryFile(max_size=chunk_size)
+
+    request = service.files().get_media(fileId=file_id)
+    http = _get_thread_http(service)
+    if http:
+        request.http = http
+    downloader = MediaIoBaseDownload(file_object, request, chunksize=chunk_size)
+
+    done = False
+    failures = 0
+    while not done:
+        try:
+            # next_chunk already retries 429/5xx responses with exponential backoff
+            status, done = downloader.next_chunk(num_retries=retries)
+            failures = 0
+            logger.debug(f"Downloaded {status.resumable_progress} bytes of {file_id}")
+        except (ConnectionError, TimeoutError, httplib2.HttpLib2Error) as e:
+            failures += 1
+            if failures > retries:
+                logger.error(f"Error downloading file with ID {file_id}: {e}")
+                raise
+            delay = backoff * 2 ** (failures - 1)
+            logger.warning(
+                f"Connection dropped while downloading {file_id}: {e}. "
+                f"Resuming in {delay:.1f}s"
+            )
+            time.sleep(delay)
+        except HttpError as e:
+            logger.error(f"Error downloading file with ID {file_id}: {e}")
+            raise
+
+    file_object.seek(0)
+    return file_object
+
+
+def find_file_by_name(
+    service: build, name: str, folder_id: str = None
+) -> Dict[str, str] | None:
+    """
+    Looks up a file by its exact name in a folder.
+
+    Args:
+        service (build): Google Drive API service client.
+        name (str): The name of the file.
+        folder_id (str): The ID of the folder holding the file. Defaults to None (the root
+            of My Drive).
+
+    Returns:
+        Dict[str, str] | None: The metadata of the most recently modified matching file, or
+            None if there is none.
+    """
+    escaped = name.replace("\\", "\\\\").replace("'", "\\'")
+    clauses = [
+        f"name = '{escaped}'",
+        f"'{folder_id or 'root'}' in parents",
+        "trashed = false",
+    ]
+    request = service.files().list(
+        q=" and ".join(clauses),
+        orderBy="modifiedTime desc",
+        pageSize=1,
+        fields=f"files({FILE_FIELDS})",
+    )
+    files = execute_with_retry(request, **_execute_kwargs(service)).get("files", [])
+    return files[0] if files else None
+
+
+@instrument("upload", data_arg="file_object")
+def upload_file(
+    service: build,
+    file_object: IO[bytes],
+    name: str,
+    folder_id: str = None,
+    mime_type: str = "application/octet-stream",
+    overwrite: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    retries: int = 5,
+    backoff: float = 1.0,
+) -> Dict[str, str]:
+    """
+    Uploads a file object to Google Drive in chunks with a resumable media upload.
+
+    An existing file of the same name in the folder gets the new content as a new
+    revision, so its ID and sharing settings are kept and no duplicate is created. If the
+    connection drops, the upload resumes from the last byte Drive acknowledged.
+
+    Args:
+        service (build): Google Drive API service client, with a scope allowing writes.
+        file_object (IO[bytes]): Readable binary file object, e.g. the buffer returned by
+            `write_dataframe_to_file_buffer`.
+        name (str): The name of the file on Drive.
+        folder_id (str): The ID of the folder to upload into. Defaults to None (My Drive).
+        mime_type (str): The MIME type of the content. Defaults to 'application/octet-stream'.
+        overwrite (bool): Whether to update an existing file of the same name instead of
+            creating another one. Defaults to True.
+        chunk_size (int): Number of bytes sent per chunk, a multiple of 256 KiB. Defaults to
+            32 MiB.
+        retries (int): Maximum number of retries per chunk. Defaults to 5.
+        backoff (float): Base delay in seconds between resume attempts. Defaults to 1.0.
+
+    Returns:
+        Dict[str, str]: The metadata of the uploaded file.
+
+    Raises:
+        HttpError: If there is an error uploading the file.
+    """
+    existing = find_file_by_name(service, name, folder_id) if overwrite else None
+    media = MediaIoBaseUpload(
+        file_object, mimetype=mime_type, chunksize=chunk_size, resumable=True
+    )
+    if existing:
+        logger.info(f"Uploading '{name}' as a new revision of file {existing['id']}.")
+        request = service.files().update(
+            fileId=existing["id"], media_body=media, fields=FILE_FIELDS
+        )
+    else:
+        logger.info(f"Uploading '{name}' as a new file.")
+        body = {"name": name, "parents": [folder_id]} if folder_id else {"name": name}
+        request = service.files().create(
+            body=body, media_body=media, fields=FILE_FIELDS
+        )
+    http = _get_thread_http(service)
+    if http:
+        request.http = http
+
+    response = None
+    failures = 0
+    while response is None:
+        try:
+            # next_chunk already retries 429/5xx responses with exponential backoff
+            status, response = request.next_chunk(num_retries=retries)
+            failures = 0
+            if status:
+                logger.debug(f"Uploaded {status.resumable_progress} bytes of '{name}'")
+        except (ConnectionError, TimeoutError, httplib2.HttpLib2Error) as e:
+            failures += 1
+            if failures > retries:
+                logger.error(f"Error uploading file '{name}': {e}")
+                raise
+            delay = backoff * 2 ** (failures - 1)
+            logger.warning(
+                f"Connection dropped while uploading '{name}': {e}. "
+                f"Resuming in {delay:.1f}s"
+            )
+            time.sleep(delay)
+        except HttpError as e:
+            logger.error(f"Error uploading file '{name}': {e}")
+            raise
+
+    logger.success(f"Uploaded '{name}' as file {response['id']}.")
+    return response
+
+
+def upload_files_concurrently(
+    service: build, uploads: Iterable[Dict[str, Any]], concurrency: int = 4
+) -> List[Dict[str, str]]:
+    """
+    Uploads several file objects to Google Drive on a bounded thread pool.
+
+    Uploads are network bound, and every thread uses its own HTTP transport. The
+    uploads must target distinct file names, otherwise concurrent uploads of the same
+    new name may create duplicates.
+
+    Args:
+        service (build): Google Drive API service client, with a scope allowing writes.
+        uploads (Iterable[Dict[str, Any]]): The arguments of `upload_file` of every upload,
+            with at least file_object and name keys.
+        concurrency (int): Maximum number of concurrent uploads. Defaults to 4.
+
+    Returns:
+        List[Dict[str, str]]: The metadata of the uploaded files, in the order of `uploads`.
+
+    Raises:
+        ValueError: If several uploads have the same file name.
+    """
+    uploads = list(uploads)
+    names = [upload["name"] for upload in uploads]
+    if len(set(names)) < len(names):
+        logger.error(f"Uploads must have distinct file names: {names}")
+        raise ValueError(f"Uploads must have distinct file names: {names}")
+    logger.info(f"Uploading {len(uploads)} files, {concurrency} at a time")
+    table_name = current_table.get()
+
+    def upload(kwargs: Dict[str, Any]) -> Dict[str, str]:
+        with table_context(table_name):
+            return upload_file(service, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(upload, uploads))
+
+
+def upload_table(
+    service: build,
+    duckdb_conn: duckdb.DuckDBPyConnection,
+    table_name: str,
+    folder_id: str = None,
+    file_type: str = "parquet",
+    name: str = None,
+    max_memory_mb: float = 64,
+    **kwargs,
+) -> Dict[str, str]:
+    """
+    Exports a DuckDB table or view to a file and uploads it to Google Drive.
+
+    The table is streamed in record batches into a temporary file, which moves to disk
+    once it outgrows `max_memory_mb`, so large extracts are never held in memory.
+
+    Args:
+        service (build): Google Drive API service client, with a scope allowing writes.
+        duckdb_conn (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        table_name (str): The name of the table or view to upload.
+        folder_id (str): The ID of the folder to upload into. Defaults to None (My Drive).
+        file_type (str): A file type of `write_dataframe_to_file_buffer`. Defaults to 'parquet'.
+        name (str): The name of the file on Drive. Defaults to the table name with the
+            extension of the file type.
+        max_memory_mb (float): Size in MB above which the export is moved to disk. Defaults to 64.
+        **kwargs: Additional arguments passed to `upload_file` (e.g., overwrite, chunk_size).
+
+    Returns:
+        Dict[str, str]: The metadata of the uploaded file.
+    """
+    extension, mime_type = UPLOAD_FILE_TYPES[file_type]
+    name = name or f"{table_name}.{extension}"
+    with track("export", table_name):
+        file_object = write_dataframe_to_file_buffer(
+            select_table_to_record_batches(duckdb_conn, table_name, 100_000),
+            file_type,
+            max_memory_mb=max_memory_mb,
+        )
+    with file_object:
+        return upload_file(
+            service, file_object, name, folder_id, mime_type=mime_type, **kwargs
+        )
+
+
 def read_file_to_dataframe(
-    service: build, file_id: str, file_format: str, **kwargs
+    service: build,
+    file_id: str,
+    file_format: str,
+    chunk_size: int = None,
+    **kwargs,
 ) -> pd.DataFrame:
     """
     Reads a file from Google Drive into a pandas DataFrame.
@@ -138,20 +644,210 @@ def read_file_to_dataframe(
         service (build): Google Drive API service client.
         file_id (str): The ID of the file to download.
         file_format (str): The format of the file (e.g., 'csv', 'excel', 'json').
+        chunk_size (int): Download the file in chunks of this many bytes instead of in one
+            request. Defaults to None.
         **kwargs: Additional arguments passed to the file reader.
 
     Returns:
         pd.DataFrame: The file data as a pandas DataFrame.
     """
+    if chunk_size:
+        with download_file_in_chunks(
+            service, file_id, chunk_size=chunk_size
+        ) as file_object:
+            return read_file_object_to_dataframe(file_object, file_format, **kwargs)
     file_object = download_file_as_bytes(service, file_id)
     return read_file_object_to_dataframe(file_object, file_format, **kwargs)
 
 
+def read_file_to_arrow(
+    service: build,
+    file_id: str,
+    file_format: str,
+    chunk_size: int = None,
+    **kwargs,
+) -> pa.Table:
+    """
+    Reads a file from Google Drive into an Arrow table.
+
+    Args:
+        service (build): Google Drive API service client.
+        file_id (str): The ID of the file to download.
+        file_format (str): The format of the file (e.g., 'csv', 'parquet', 'excel').
+        chunk_size (int): Download the file in chunks of this many bytes instead of in one
+            request. Defaults to None.
+        **kwargs: Additional arguments passed to the file reader.
+
+    Returns:
+        pa.Table: The file data as an Arrow table.
+    """
+    if chunk_size:
+        with download_file_in_chunks(
+            service, file_id, chunk_size=chunk_size
+        ) as file_object:
+            return read_file_object_to_arrow(file_object, file_format, **kwargs)
+    file_object = download_file_as_bytes(service, file_id)
+    return read_file_object_to_arrow(file_object, file_format, **kwargs)
+
+
+def iter_files_as_batches(
+    service: build,
+    files: Iterable[Dict[str, str]],
+    file_format: str,
+    batch_rows: int = 100_000,
+    max_memory_mb: float = None,
+    chunk_size: int = None,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams Google Drive files as pandas DataFrames of bounded size.
+
+    Each file is downloaded in chunks to a spooled temporary file and parsed in
+    batches, so neither the file nor the parsed data has to fit in memory.
+
+    Args:
+        service (build): Google Drive API service client.
+        files (Iterable[Dict[str, str]]): File metadata dictionaries, each containing file name and ID.
+        file_format (str): The format of the files (e.g., 'csv', 'excel').
+        batch_rows (int): Maximum number of rows per batch. Defaults to 100,000.
+        max_memory_mb (float): Memory ceiling of a single batch in MB. Defaults to None.
+        chunk_size (int): Number of bytes requested per download chunk. Defaults to 32 MiB.
+        **kwargs: Additional arguments passed to the file reader.
+
+    Yields:
+        pd.DataFrame: The next batch of rows.
+    """
+    for file in files:
+        with download_file_in_chunks(
+            service, file["id"], chunk_size=chunk_size or DEFAULT_CHUNK_SIZE
+        ) as file_object:
+            yield from iter_file_object_batches(
+                file_object, file_format, batch_rows, max_memory_mb, **kwargs
+            )
+
+
+def read_files_concurrently(
+    service: build,
+    files: Iterable[Dict[str, str]],
+    file_format: str,
+    concurrency: int = 4,
+    parse_workers: int = 0,
+    chunk_size: int = None,
+    **kwargs,
+) -> List[pd.DataFrame]:
+    """
+    Downloads files on a bounded thread pool and parses them into pandas DataFrames.
+
+    Downloads are network bound and run on `concurrency` threads. Parsing runs on the
+    download threads unless `parse_workers` is set, in which case it is handed off to a
+    process pool so CPU-heavy parsing does not hold the GIL. `files` may be a lazy
+    iterator, in which case downloads start while it is still being consumed.
+
+    Args:
+        service (build): Google Drive API service client.
+        files (Iterable[Dict[str, str]]): File metadata dictionaries, each containing file name and ID.
+        file_format (str): The format of the files (e.g., 'csv', 'excel').
+        concurrency (int): Maximum number of concurrent downloads. Defaults to 4.
+        parse_workers (int): Number of parsing processes, 0 to parse in the download threads. Defaults to 0.
+        chunk_size (int): Download files in chunks of this many bytes. Defaults to None.
+        **kwargs: Additional arguments passed to the file reader.
+
+    Returns:
+        List[pd.DataFrame]: The parsed DataFrames, in the same order as `files`.
+    """
+    logger.info(
+        f"Reading files with {concurrency} download threads "
+        f"and {parse_workers or 'no'} parse processes"
+    )
+    parse_pool = (
+        ProcessPoolExecutor(max_workers=parse_workers) if parse_workers else None
+    )
+    table_name = current_table.get()
+
+    def download_and_parse(file: Dict[str, str]) -> pd.DataFrame:
+        with table_context(table_name):
+            return _download_and_parse(file)
+
+    def _download_and_parse(file: Dict[str, str]) -> pd.DataFrame:
+        if parse_pool is None:
+            return read_file_to_dataframe(
+                service, file["id"], file_format, chunk_size, **kwargs
+            )
+        if chunk_size:
+            # Temporary files cannot be pickled, so the parse process gets a path
+            with tempfile.NamedTemporaryFile(delete=False) as file_object:
+                download_file_in_chunks(service, file["id"], file_object, chunk_size)
+            try:
+                return parse_pool.submit(
+                    read_file_object_to_dataframe,
+                    file_object.name,
+                    file_format,
+                    **kwargs,
+                ).result()
+            finally:
+                os.remove(file_object.name)
+        file_object = download_file_as_bytes(service, file["id"])
+        return parse_pool.submit(
+            read_file_object_to_dataframe, file_object, file_format, **kwargs
+        ).result()
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(download_and_parse, files))
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
+
+
+def read_files_to_dataframes(
+    service: build,
+    files: Iterable[Dict[str, str]],
+    file_format: str,
+    concurrency: int = 1,
+    parse_workers: int = 0,
+    chunk_size: int = None,
+    **kwargs,
+) -> List[pd.DataFrame]:
+    """
+    Reads Google Drive files into one pandas DataFrame per file.
+
+    Args:
+        service (build): Google Drive API service client.
+        files (Iterable[Dict[str, str]]): File metadata dictionaries, each containing file name and ID.
+        file_format (str): The format of the files (e.g., 'csv', 'excel').
+        concurrency (int): Maximum number of concurrent downloads, 1 to read files sequentially. Defaults to 1.
+        parse_workers (int): Number of parsing processes used when reading concurrently. Defaults to 0.
+        chunk_size (int): Download files in chunks of this many bytes. Defaults to None.
+        **kwargs: Additional arguments passed to the file reader.
+
+    Returns:
+        List[pd.DataFrame]: The parsed DataFrames, in the same order as `files`.
+    """
+    if concurrency > 1:
+        return read_files_concurrently(
+            service,
+            files,
+            file_format,
+            concurrency,
+            parse_workers,
+            chunk_size,
+            **kwargs,
+        )
+    return [
+        read_file_to_dataframe(service, file["id"], file_format, chunk_size, **kwargs)
+        for file in files
+    ]
+
+
 def read_folder_to_dataframe(
     service: build,
     folder_id: str,
     file_format: str = "csv",
     pattern: str = None,
+    concurrency: int = 1,
+    parse_workers: int = 0,
+    recursive: bool = False,
+    chunk_size: int = None,
     **kwargs,
 ) -> pd.DataFrame:
     """
@@ -161,17 +857,21 @@ def read_folder_to_dataframe(
         service (build): Google Drive API service client.
         folder_id (str): The ID of the Google Drive folder.
         file_format (str): The format of the files to read (e.g., 'csv', 'excel', 'json'). Defaults to 'csv'.
+        pattern (str): Glob pattern to filter file names (e.g., '*PCS*'). Defaults to None.
+        concurrency (int): Maximum number of concurrent downloads, 1 to read files sequentially. Defaults to 1.
+        parse_workers (int): Number of parsing processes used when reading concurrently. Defaults to 0.
+        recursive (bool): Whether to include files in subfolders. Defaults to False.
+        chunk_size (int): Download files in chunks of this many bytes. Defaults to None.
+        **kwargs: Additional arguments passed to the file reader.
 
     Returns:
         pd.DataFrame: A concatenated DataFrame containing the data from all files in the specified format.
     """
-    files = list_files_in_folder(service, folder_id)
-    if pattern:
-        files = filter_files_in_list(files, pattern)
-    dataframes = [
-        read_file_to_dataframe(service, file["id"], file_format, **kwargs)
-        for file in files
-    ]
+    logger.info(f"Fetching files from folder {folder_id}")
+    files = iter_files_in_folder(service, folder_id, pattern, recursive)
+    dataframes = read_files_to_dataframes(
+        service, files, file_format, concurrency, parse_workers, chunk_size, **kwargs
+    )
 
     if not dataframes:
         logger.warning(
@@ -189,6 +889,464 @@ def read_folder_to_dataframe(
     return df
 
 
+def _file_suffix(file_format: str) -> str:
+    """Returns the file extension DuckDB readers expect for a file format."""
+    file_format = file_format.lower().lstrip(".")
+    return ".xlsx" if file_format == "excel" else f".{file_format}"
+
+
+def download_file_to_path(
+    service: build, file_id: str, path: str, chunk_size: int = None
+) -> str:
+    """
+    Downloads a file from Google Drive to a local path in resumable chunks.
+
+    Args:
+        service (build): Google Drive API service client.
+        file_id (str): The ID of the file to download.
+        path (str): The local path to write the file to.
+        chunk_size (int): Number of bytes requested per chunk. Defaults to 32 MiB.
+
+    Returns:
+        str: The local path of the downloaded file.
+    """
+    with open(path, "wb") as file_object:
+        download_file_in_chunks(
+            service, file_id, file_object, chunk_size or DEFAULT_CHUNK_SIZE
+        )
+    return path
+
+
+def stage_files(
+    service: build,
+    files: Iterable[Dict[str, str]],
+    staging_dir: str,
+    file_format: str,
+    concurrency: int = 1,
+    chunk_size: int = None,
+) -> List[str]:
+    """
+    Downloads Google Drive files into a local staging directory.
+
+    Files are named after their Drive file ID, so the ID can be recovered from the path.
+
+    Args:
+        service (build): Google Drive API service client.
+        files (Iterable[Dict[str, str]]): File metadata dictionaries, each containing file name and ID.
+        staging_dir (str): The directory to download the files into.
+        file_format (str): The format of the files ('csv', 'parquet', 'excel').
+        concurrency (int): Maximum number of concurrent downloads. Defaults to 1.
+        chunk_size (int): Number of bytes requested per download chunk. Defaults to 32 MiB.
+
+    Returns:
+        List[str]: The local paths of the staged files, in the same order as `files`.
+    """
+
+    table_name = current_table.get()
+
+    def stage(file: Dict[str, str]) -> str:
+        path = os.path.join(staging_dir, file["id"] + _file_suffix(file_format))
+        with table_context(table_name):
+            return download_file_to_path(service, file["id"], path, chunk_size)
+
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(stage, files))
+    return [stage(file) for file in files]
+
+
+def load_files_to_table(
+    service: build,
+    duckdb_conn: duckdb.DuckDBPyConnection,
+    files: Iterable[Dict[str, str]],
+    table_name: str,
+    file_format: str,
+    concurrency: int = 1,
+    chunk_size: int = None,
+    lineage: bool = True,
+    **kwargs,
+) -> int:
+    """
+    Loads Google Drive files into a DuckDB table with DuckDB's native readers.
+
+    The files are staged in a temporary directory and loaded with a single DuckDB
+    multi-file scan, skipping pandas entirely. Columns are matched by name across
+    files and memory use does not grow with the number of files.
+
+    Args:
+        service (build): Google Drive API service client.
+        duckdb_conn (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        files (Iterable[Dict[str, str]]): File metadata dictionaries, each containing file name and ID.
+        table_name (str): The name of the table to load.
+        file_format (str): The format of the files ('csv', 'parquet', 'excel').
+        concurrency (int): Maximum number of concurrent downloads. Defaults to 1.
+        chunk_size (int): Number of bytes requested per download chunk. Defaults to 32 MiB.
+        lineage (bool): Add the Drive file ID of each row as a `_source_file_id` column. Defaults to True.
+        **kwargs: pandas reader keyword arguments, translated to DuckDB reader options.
+
+    Returns:
+        int: The number of files loaded.
+    """
+    with tempfile.TemporaryDirectory() as staging_dir:
+        paths = stage_files(
+            service, files, staging_dir, file_format, concurrency, chunk_size
+        )
+        if not paths:
+            logger.warning(f"No files to load into table '{table_name}'.")
+            return 0
+        load_file_to_table(
+            duckdb_conn,
+            paths,
+            table_name,
+            file_format,
+            lineage=lineage,
+            **kwargs,
+        )
+
+    logger.success(f"Loaded {len(paths)} files into table '{table_name}'.")
+    log_table_info(duckdb_conn, table_name)
+    return len(paths)
+
+
+def ingest_files_incremental(
+    service: build,
+    duckdb_conn: duckdb.DuckDBPyConnection,
+    files: List[Dict[str, str]],
+    table_name: str,
+    file_format: str,
+    concurrency: int = 1,
+    parse_workers: int = 0,
+    chunk_size: int = None,
+    **kwargs,
+) -> None:
+    """
+    Loads only new or changed Google Drive files into a DuckDB table.
+
+    Files are compared with the ingest manifest on `modifiedTime` and `md5Checksum`.
+    Rows of changed and removed files are deleted and the rows of new and changed files
+    appended, all in one transaction. Every row carries the ID of its source file in the
+    `_source_file_id` column. The table is rebuilt from scratch when it or its manifest
+    does not exist yet.
+
+    The table is updated in place, so it cannot be loaded inside a `staged_swap` block.
+
+    Args:
+        service (build): Google Drive API service client.
+        duckdb_conn (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        files (List[Dict[str, str]]): Metadata of the files currently making up the table.
+        table_name (str): The name of the table to load.
+        file_format (str): The format of the files (e.g., 'csv', 'excel').
+        concurrency (int): Maximum number of concurrent downloads. Defaults to 1.
+        parse_workers (int): Number of parsing processes used when reading concurrently. Defaults to 0.
+        chunk_size (int): Download files in chunks of this many bytes. Defaults to None.
+        **kwargs: Additional arguments passed to the file reader.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If called inside a `staged_swap` block.
+    """
+    if in_staged_swap():
+        raise ValueError(
+            f"Incremental table '{table_name}' cannot be loaded inside staged_swap."
+        )
+    manifest = read_manifest(duckdb_conn, table_name)
+    full_refresh = not manifest or not table_exists(duckdb_conn, table_name)
+
+    if full_refresh:
+        changed = files
+        removed = []
+    else:
+        changed = [
+            file
+            for file in files
+            if file["id"] not in manifest
+            or manifest[file["id"]]["modified_time"] != file.get("modifiedTime")
+            or manifest[file["id"]]["md5_checksum"] != file.get("md5Checksum")
+        ]
+        current_ids = {file["id"] for file in files}
+        removed = [file_id for file_id in manifest if file_id not in current_ids]
+
+    if not changed and not removed:
+        logger.success(f"Table '{table_name}' is up to date, nothing to ingest.")
+        return
+
+    logger.info(
+        f"Ingesting {len(changed)} new or changed files and removing {len(removed)} "
+        f"files for table '{table_name}' (full refresh: {full_refresh})"
+    )
+    dataframes = read_files_to_dataframes(
+        service, changed, file_format, concurrency, parse_workers, chunk_size, **kwargs
+    )
+    for file, df in zip(changed, dataframes):
+        df[SOURCE_FILE_COLUMN] = file["id"]
+
+    # Hold the writer lock for the whole transaction so parallel table loads
+    # never interleave their deletes, appends and manifest updates
+    with write_lock:
+        duckdb_conn.execute("BEGIN TRANSACTION")
+        try:
+            if full_refresh:
+                delete_manifest_entries(duckdb_conn, table_name)
+                df = pd.concat(dataframes, ignore_index=True) if dataframes else None
+                if df is not None:
+                    # Already atomic through the surrounding transaction
+                    create_table(
+                        duckdb_conn,
+                        df,
+                        table_name,
+                        staging=False,
+                        schema=kwargs.get("schema"),
+                    )
+            else:
+                stale = [file["id"] for file in changed if file["id"] in manifest]
+                delete_rows_by_source_file(duckdb_conn, table_name, stale + removed)
+                delete_manifest_entries(duckdb_conn, table_name, removed)
+                for df in dataframes:
+                    append_table(duckdb_conn, df, table_name)
+
+            entries = []
+            for file, df in zip(changed, dataframes):
+                entries.append(
+                    {
+                        "file_id": file["id"],
+                        "file_name": file.get("name"),
+                        "modified_time": file.get("modifiedTime"),
+                        "md5_checksum": file.get("md5Checksum"),
+                        "row_count": len(df),
+                    }
+                )
+            update_manifest(duckdb_conn, table_name, entries)
+            duckdb_conn.execute("COMMIT")
+        except Exception:
+            duckdb_conn.execute("ROLLBACK")
+            logger.error(
+                f"Incremental ingest of table '{table_name}' failed, rolled back."
+            )
+            raise
+    logger.success(f"Incremental ingest of table '{table_name}' completed.")
+
+
+def resolve_table_schema(
+    service: build, table_settings: dict, files: Iterable[Dict[str, str]]
+) -> Dict[str, str] | None:
+    """
+    Returns the schema contract of a table from its ingest settings.
+
+    The contract is given inline or as a YAML file path under `schema`. With
+    `infer_schema`, it is inferred from the first rows of the first file and saved to
+    `schema_path` (by default `schemas/<table_name>.yml`), where later runs pick it up
+    and where it can be reviewed and edited.
+
+    Args:
+        service (build): Google Drive API service client.
+        table_settings (dict): Folder or file settings with file_format and table_name keys,
+            plus optional config, schema, infer_schema, schema_path and schema_sample_rows keys.
+        files (Iterable[Dict[str, str]]): The files of the table, only the first of which is
+            read, and only when a schema has to be inferred.
+
+    Returns:
+        Dict[str, str] | None: The contract column type of every column, or None.
+    """
+    if table_settings.get("schema"):
+        return load_schema(table_settings["schema"])
+    if not table_settings.get("infer_schema"):
+        return None
+
+    table_name = table_settings["table_name"]
+    schema_path = table_settings.get(
+        "schema_path", os.path.join("schemas", f"{table_name}.yml")
+    )
+    if os.path.isfile(schema_path):
+        return load_schema(schema_path)
+
+    first = next(iter(files), None)
+    if first is None:
+        logger.warning(f"No file to infer the schema of table '{table_name}' from.")
+        return None
+    config = dict(table_settings.get("config", {}))
+    config.pop("pattern", None)
+    config["nrows"] = table_settings.get("schema_sample_rows", 10_000)
+    sample = read_file_to_dataframe(
+        service, first["id"], table_settings["file_format"], **config
+    )
+    schema = infer_schema(sample)
+    logger.info(
+        f"Schema of table '{table_name}' saves {memory_savings(sample, schema)} "
+        f"on a sample of {len(sample)} rows."
+    )
+    write_dict_to_yaml(schema, schema_path)
+    return schema
+
+
+def ingest_folder(
+    service: build, duckdb_conn: duckdb.DuckDBPyConnection, folder: dict
+) -> None:
+    """
+    Ingests a Google Drive folder into a DuckDB table as configured in the ingest settings.
+
+    Args:
+        service (build): Google Drive API service client.
+        duckdb_conn (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        folder (dict): Folder settings with id, file_format and table_name keys, plus optional
+            config, engine, incremental, concurrency, parse_workers, recursive, chunk_size,
+            batch_rows, max_memory_mb, schema, infer_schema, schema_path and
+            schema_sample_rows keys.
+
+    Returns:
+        None
+    """
+    config = dict(folder.get("config", {}))
+    table_name = folder["table_name"]
+    file_format = folder["file_format"]
+    concurrency = folder.get("concurrency", 1)
+    recursive = folder.get("recursive", False)
+    chunk_size = folder.get("chunk_size")
+    schema = resolve_table_schema(
+        service,
+        folder,
+        iter_files_in_folder(service, folder["id"], config.get("pattern"), recursive),
+    )
+    if schema:
+        config["schema"] = schema
+
+    if folder.get("incremental"):
+        folder_files = list_files_in_folder(
+            service, folder["id"], config.pop("pattern", None), recursive
+        )
+        ingest_files_incremental(
+            service,
+            duckdb_conn,
+            folder_files,
+            table_name,
+            file_format,
+            concurrency=concurrency,
+            parse_workers=folder.get("parse_workers", 0),
+            chunk_size=chunk_size,
+            **config,
+        )
+    elif folder.get("engine") == "duckdb":
+        folder_files = iter_files_in_folder(
+            service, folder["id"], config.pop("pattern", None), recursive
+        )
+        load_files_to_table(
+            service,
+            duckdb_conn,
+            folder_files,
+            table_name,
+            file_format,
+            concurrency=concurrency,
+            chunk_size=chunk_size,
+            **config,
+        )
+    elif folder.get("engine") == "arrow":
+        folder_files = iter_files_in_folder(
+            service, folder["id"], config.pop("pattern", None), recursive
+        )
+        tables = (
+            read_file_to_arrow(
+                service, folder_file["id"], file_format, chunk_size, **config
+            )
+            for folder_file in folder_files
+        )
+        create_table(duckdb_conn, tables, table_name, schema=schema)
+    elif folder.get("batch_rows"):
+        folder_files = iter_files_in_folder(
+            service, folder["id"], config.pop("pattern", None), recursive
+        )
+        batches = iter_files_as_batches(
+            service,
+            folder_files,
+            file_format,
+            folder["batch_rows"],
+            folder.get("max_memory_mb"),
+            chunk_size,
+            **config,
+        )
+        create_table(duckdb_conn, batches, table_name, schema=schema)
+    else:
+        df = read_folder_to_dataframe(
+            service,
+            folder["id"],
+            file_format,
+            concurrency=concurrency,
+            parse_workers=folder.get("parse_workers", 0),
+            recursive=recursive,
+            chunk_size=chunk_size,
+            **config,
+        )
+        create_table(duckdb_conn, df, table_name, schema=schema)
+
+
+def ingest_file(
+    service: build, duckdb_conn: duckdb.DuckDBPyConnection, file: dict
+) -> None:
+    """
+    Ingests a single Google Drive file into a DuckDB table as configured in the ingest settings.
+
+    Args:
+        service (build): Google Drive API service client.
+        duckdb_conn (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        file (dict): File settings with id, file_format and table_name keys, plus optional
+            config, engine, incremental, chunk_size, batch_rows, max_memory_mb, schema,
+            infer_schema, schema_path and schema_sample_rows keys.
+
+    Returns:
+        None
+    """
+    config = dict(file.get("config", {}))
+    table_name = file["table_name"]
+    file_format = file["file_format"]
+    chunk_size = file.get("chunk_size")
+    schema = resolve_table_schema(service, file, [{"id": file["id"]}])
+    if schema:
+        config["schema"] = schema
+
+    if file.get("incremental"):
+        ingest_files_incremental(
+            service,
+            duckdb_conn,
+            [get_file_metadata(service, file["id"])],
+            table_name,
+            file_format,
+            chunk_size=chunk_size,
+            **config,
+        )
+    elif file.get("engine") == "duckdb":
+        load_files_to_table(
+            service,
+            duckdb_conn,
+            [{"id": file["id"]}],
+            table_name,
+            file_format,
+            chunk_size=chunk_size,
+            lineage=False,
+            **config,
+        )
+    elif file.get("engine") == "arrow":
+        table = read_file_to_arrow(
+            service, file["id"], file_format, chunk_size, **config
+        )
+        create_table(duckdb_conn, table, table_name, schema=schema)
+    elif file.get("batch_rows"):
+        batches = iter_files_as_batches(
+            service,
+            [{"id": file["id"]}],
+            file_format,
+            file["batch_rows"],
+            file.get("max_memory_mb"),
+            chunk_size,
+            **config,
+        )
+        create_table(duckdb_conn, batches, table_name, schema=schema)
+    else:
+        df = read_file_to_dataframe(
+            service, file["id"], file_format, chunk_size=chunk_size, **config
+        )
+        create_table(duckdb_conn, df, table_name, schema=schema)
+
+
 # Higher order function
 def ingest(
     settings: dict,
@@ -203,26 +1361,205 @@ def ingest(
     folders = ingest_settings.get("folders")
     files = ingest_settings.get("files")
 
+    tasks = []
     if not folders:
         logger.warning("No Google Drive folder specified in settings")
     else:
-        for folder in folders:
-            df = read_folder_to_dataframe(
-                service,
-                folder["id"],
-                folder["file_format"],
-                **folder.get("config", {}),
-            )
-            create_table(duckdb_conn, df, folder["table_name"])
-
+        tasks.extend((ingest_folder, folder) for folder in folders)
     if not files:
         logger.warning("No Google Drive folder specified in settings")
     else:
-        for file in files:
-            df = read_file_to_dataframe(
+        tasks.extend((ingest_file, file) for file in files)
+
+    # With atomic_swap, tables are loaded into staging tables and swapped in together.
+    # Incremental tables are updated in place, so they cannot take part in the swap.
+    if ingest_settings.get("atomic_swap"):
+        incremental_tables = [
+            table_settings["table_name"]
+            for _, table_settings in tasks
+            if table_settings.get("incremental")
+        ]
+        if incremental_tables:
+            raise ValueError(
+                "atomic_swap cannot be combined with incremental tables: "
+                f"{', '.join(incremental_tables)}"
+            )
+    swap = (
+        staged_swap(duckdb_conn)
+        if ingest_settings.get("atomic_swap")
+        else nullcontext()
+    )
+    # Tables with a `lake` setting are also exported to the Parquet lake, if configured
+    lake_dir = (settings["ingest"].get("lake") or {}).get("path")
+    with collect_metrics():
+        with track("ingest"), swap:
+            failures = ingest_tables(
                 service,
-                file["id"],
-                file["file_format"],
-                **file.get("config", {}),
+                duckdb_conn,
+                tasks,
+                ingest_settings.get("parallelism", 1),
+                lake_dir=lake_dir,
+            )
+        # Staged tables are only exported once the swap has published them
+        if lake_dir and ingest_settings.get("atomic_swap"):
+            loaded = [task for task in tasks if task[1]["table_name"] not in failures]
+            failures.update(export_tables_to_lake(duckdb_conn, loaded, lake_dir))
+        report_ingest_metrics(settings, duckdb_conn)
+    if failures:
+        raise RuntimeError(f"Ingest failed for tables: {', '.join(failures)}")
+
+
+def ingest_tables(
+    service: build,
+    duckdb_conn: duckdb.DuckDBPyConnection,
+    tasks: List[Tuple[Callable, dict]],
+    parallelism: int = 1,
+    lake_dir: str = None,
+) -> Dict[str, Exception]:
+    """
+    Runs independent table ingests, several at a time if `parallelism` is above one.
+
+    Every parallel worker reads and stages through its own DuckDB cursor, while writes
+    to tables go through `write_lock` so only one worker modifies the database at a
+    time. A failing table is logged and reported without aborting the others, and inside
+    a `staged_swap` block only the tables that loaded successfully are swapped in. Tasks
+    must target distinct tables.
+
+    With a `lake_dir`, every table whose settings contain `lake` (true, or a dictionary
+    with `partition_by` keys and a `view_name`) is then exported to the Parquet lake.
+    Inside a `staged_swap` block the swap may still roll back, so tables are not exported
+    here; call `export_tables_to_lake` once the block has exited.
+
+    Args:
+        service (build): Google Drive API service client.
+        duckdb_conn (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        tasks (List[Tuple[Callable, dict]]): Pairs of an ingest function (`ingest_folder` or
+            `ingest_file`) and the table settings passed to it.
+        parallelism (int): Maximum number of tables ingested at the same time. Defaults to 1.
+        lake_dir (str): Root directory of the Parquet lake. Defaults to None (no export).
+
+    Returns:
+        Dict[str, Exception]: The error of every failed table, keyed by table name.
+    """
+
+    def run(ingest_table: Callable, table_settings: dict) -> Exception | None:
+        table_name = table_settings["table_name"]
+        conn = duckdb_conn.cursor() if parallelism > 1 else duckdb_conn
+        try:
+            with table_context(table_name):
+                if parallelism <= 1:
+                    # Peak RSS is process-wide, so it is only per table when sequential
+                    reset_peak_rss()
+                ingest_table(service, conn, table_settings)
+                if lake_dir and not in_staged_swap():
+                    _export_table_to_lake(conn, table_settings, lake_dir)
+        except Exception as e:
+            logger.error(f"Ingest of table '{table_name}' failed: {e}")
+            return e
+        finally:
+            if conn is not duckdb_conn:
+                conn.close()
+        return None
+
+    if parallelism > 1 and len(tasks) > 1:
+        logger.info(f"Ingesting {len(tasks)} tables, {parallelism} at a time")
+        # Workers run in a copy of the caller's context, e.g. to join a staged swap
+        contexts = [copy_context() for _ in tasks]
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            errors = list(
+                executor.map(lambda ctx, task: ctx.run(run, *task), contexts, tasks)
             )
-            create_table(duckdb_conn, df, file["table_name"])
+    else:
+        errors = [run(*task) for task in tasks]
+
+    failures = {
+        table_settings["table_name"]: error
+        for (_, table_settings), error in zip(tasks, errors)
+        if error is not None
+    }
+    if failures:
+        logger.error(
+            f"{len(failures)} of {len(tasks)} tables failed: {', '.join(failures)}"
+        )
+    return failures
+
+
+def _export_table_to_lake(
+    duckdb_conn: duckdb.DuckDBPyConnection, table_settings: dict, lake_dir: str
+) -> None:
+    """Exports an ingested table to the Parquet lake if its settings contain `lake`."""
+    lake = table_settings.get("lake")
+    if not lake:
+        return
+    lake = lake if isinstance(lake, dict) else {}
+    with track("export"):
+        export_table_to_lake(
+            duckdb_conn,
+            table_settings["table_name"],
+            lake_dir,
+            partition_by=lake.get("partition_by"),
+            view_name=lake.get("view_name"),
+        )
+
+
+def export_tables_to_lake(
+    duckdb_conn: duckdb.DuckDBPyConnection,
+    tasks: List[Tuple[Callable, dict]],
+    lake_dir: str,
+) -> Dict[str, Exception]:
+    """
+    Exports the ingested tables whose settings contain `lake` to the Parquet lake.
+
+    Used after a `staged_swap` block, so the lake only receives published data. A failing
+    export is logged and reported without aborting the others.
+
+    Args:
+        duckdb_conn (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        tasks (List[Tuple[Callable, dict]]): The ingest tasks, see `ingest_tables`.
+        lake_dir (str): Root directory of the Parquet lake.
+
+    Returns:
+        Dict[str, Exception]: The error of every failed export, keyed by table name.
+    """
+    failures = {}
+    for _, table_settings in tasks:
+        table_name = table_settings["table_name"]
+        try:
+            with table_context(table_name):
+                _export_table_to_lake(duckdb_conn, table_settings, lake_dir)
+        except Exception as e:
+            logger.error(f"Export of table '{table_name}' to the lake failed: {e}")
+            failures[table_name] = e
+    return failures
+
+
+def report_ingest_metrics(
+    settings: dict, duckdb_conn: duckdb.DuckDBPyConnection
+) -> None:
+    """
+    Logs a per-table summary of the metrics of an ingest run and exports them.
+
+    Metrics are always appended to the `_ingest_metrics` DuckDB table. The optional
+    `settings["ingest"]["metrics"]` dictionary can add a `prometheus_textfile` path and
+    an `opentelemetry` flag.
+
+    Args:
+        settings (dict): The settings dictionary passed to `ingest`.
+        duckdb_conn (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+
+    Returns:
+        None
+    """
+    records = get_metrics()
+    metrics_settings = settings.get("ingest", {}).get("metrics", {})
+    run_id = uuid.uuid4().hex
+
+    summary = summarize_metrics(records)
+    if not summary.empty:
+        logger.info(f"Ingest run {run_id} metrics:\n{summary.to_string(index=False)}")
+
+    write_ingest_metrics(duckdb_conn, records, run_id)
+    if metrics_settings.get("prometheus_textfile"):
+        write_prometheus_textfile(records, metrics_settings["prometheus_textfile"])
+    if metrics_settings.get("opentelemetry"):
+        export_to_opentelemetry(records)
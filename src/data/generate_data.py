@@ -1,11 +1,22 @@
 # fmt: off
-import random
+"""
+Synthetic P6 cost account and expense data for development and load testing.
+
+Run as a module from the repository root, e.g.:
+
+    python -m src.data.generate_data --rows 10000000 --shards 16 --seed 42 --format parquet
+"""
+import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
 
 import duckdb
+import numpy as np
 import pandas as pd
 from faker import Faker
 
-fake = Faker()
+from src.utils.cli import generate_data_parse_arguments
 
 # Define projects and activity ids for linking data
 projects = ['PJ01', 'PJ02', 'PJ03']
@@ -67,65 +78,84 @@ jobs = [
     'Welder',
 ]
 
-def generate_cost_accounts_data(num_records=100000):
-    data = []
-    for _ in range(num_records):
-        project_id = random.choice(projects)
-        wbs_code = random.choice(wbs_codes)
-        activity_id = random.choice(activity_ids)
-        cost_account_id = fake.bothify(text="CA-????-####")
-        cost_account_name = random.choice(jobs)  # Random cost account names like job descriptions
-        budget = round(random.uniform(1000, 10000), 2)
-        actual_cost = round(random.uniform(5000, budget), 2)
-        committed_cost = round(random.uniform(0, budget), 2)
-        earned_value = round(random.uniform(0, budget), 2)
-        planned_value = round(random.uniform(0, budget), 2)
-        cost_date = fake.date_between(start_date="-2y", end_date="today")
-
-        data.append({
-            "Project ID": project_id,
-            "WBS Code": wbs_code,
-            "Activity ID": activity_id,
-            "Cost Account ID": cost_account_id,
-            "Cost Account Name": cost_account_name,
-            "Budget": budget,
-            "Actual Cost": actual_cost,
-            "Committed Cost": committed_cost,
-            "Earned Value": earned_value,
-            "Planned Value": planned_value,
-            "Cost Date": cost_date,
-        })
-
-    df = pd.DataFrame(data)
-    return df
-
-def generate_expenses_data(num_records=50000):
-    data = []
-    for _ in range(num_records):
-        project_id = random.choice(projects)
-        activity_id = random.choice(activity_ids)
-        expense_id = fake.bothify(text="EXP-####-???")
-        expense_type = fake.random_element(elements=("Travel", "Consulting", "Facilities", "Training"))
-        expense_description = f"{expense_type} - {fake.catch_phrase()}"
-        budget = round(random.uniform(100, 5000), 2)
-        actual_expense = round(random.uniform(0, budget), 2)
-        remaining_cost = round(random.uniform(0, budget - actual_expense), 2)
-        expense_date = fake.date_between(start_date="-2y", end_date="today")
-
-        data.append({
-            "Project ID": project_id,
-            "Activity ID": activity_id,
-            "Expense ID": expense_id,
-            "Expense Type": expense_type,
-            "Expense Description": expense_description,
-            "Budget": budget,
-            "Actual Expense": actual_expense,
-            "Remaining Cost": remaining_cost,
-            "Expense Date": expense_date,
-        })
-
-    df = pd.DataFrame(data)
-    return df
+
+expense_types = ['Travel', 'Consulting', 'Facilities', 'Training']
+
+# Size of the pool of Faker catch phrases sampled for expense descriptions
+CATCH_PHRASE_POOL_SIZE = 1000
+
+
+def random_codes(rng: np.random.Generator, num_records: int, template: str) -> np.ndarray:
+    """Vectorised equivalent of Faker's bothify: '?' becomes a random letter and '#' a random digit."""
+    letters = np.frombuffer(string.ascii_letters.encode(), dtype=np.uint8)
+    digits = np.frombuffer(string.digits.encode(), dtype=np.uint8)
+    codes = np.empty((num_records, len(template)), dtype=np.uint8)
+    for position, char in enumerate(template.encode()):
+        if char == ord('?'):
+            codes[:, position] = rng.choice(letters, size=num_records)
+        elif char == ord('#'):
+            codes[:, position] = rng.choice(digits, size=num_records)
+        else:
+            codes[:, position] = char
+    return codes.view(f'S{len(template)}').ravel().astype(str)
+
+
+def random_dates(rng: np.random.Generator, num_records: int, years: int = 2) -> np.ndarray:
+    """Uniformly random dates between `years` years ago and today."""
+    end_date = date.today()
+    start_date = end_date - timedelta(days=365 * years)
+    offsets = rng.integers(0, (end_date - start_date).days + 1, size=num_records)
+    return np.datetime64(start_date, 'D') + offsets
+
+
+def uniform(rng: np.random.Generator, low, high) -> np.ndarray:
+    """Same as random.uniform(low, high) element-wise, rounded to 2 decimals."""
+    return np.round(low + (high - low) * rng.random(np.shape(high) or np.shape(low)), 2)
+
+
+def generate_cost_accounts_data(num_records=100000, seed=None):
+    rng = np.random.default_rng(seed)
+    budget = np.round(rng.uniform(1000, 10000, size=num_records), 2)
+
+    return pd.DataFrame({
+        "Project ID": rng.choice(projects, size=num_records),
+        "WBS Code": rng.choice(wbs_codes, size=num_records),
+        "Activity ID": rng.choice(activity_ids, size=num_records),
+        "Cost Account ID": random_codes(rng, num_records, "CA-????-####"),
+        "Cost Account Name": rng.choice(jobs, size=num_records),  # Random cost account names like job descriptions
+        "Budget": budget,
+        "Actual Cost": uniform(rng, 5000, budget),
+        "Committed Cost": uniform(rng, 0, budget),
+        "Earned Value": uniform(rng, 0, budget),
+        "Planned Value": uniform(rng, 0, budget),
+        "Cost Date": random_dates(rng, num_records),
+    })
+
+
+def generate_expenses_data(num_records=50000, seed=None):
+    rng = np.random.default_rng(seed)
+    fake = Faker()
+    fake.seed_instance(int(rng.integers(2**32)))
+    catch_phrases = np.array([fake.catch_phrase() for _ in range(CATCH_PHRASE_POOL_SIZE)])
+
+    expense_type = rng.choice(expense_types, size=num_records)
+    expense_description = np.char.add(
+        np.char.add(expense_type, " - "), rng.choice(catch_phrases, size=num_records)
+    )
+    budget = np.round(rng.uniform(100, 5000, size=num_records), 2)
+    actual_expense = uniform(rng, 0, budget)
+
+    return pd.DataFrame({
+        "Project ID": rng.choice(projects, size=num_records),
+        "Activity ID": rng.choice(activity_ids, size=num_records),
+        "Expense ID": random_codes(rng, num_records, "EXP-####-???"),
+        "Expense Type": expense_type,
+        "Expense Description": expense_description,
+        "Budget": budget,
+        "Actual Expense": actual_expense,
+        "Remaining Cost": uniform(rng, 0, budget - actual_expense),
+        "Expense Date": random_dates(rng, num_records),
+    })
 
 def add_duplicates(df: pd.DataFrame, number_of_rows: int = 100) -> pd.DataFrame:
     """Add duplicate rows to DataFrame."""
@@ -140,15 +170,59 @@ def add_duplicates(df: pd.DataFrame, number_of_rows: int = 100) -> pd.DataFrame:
                       """).df()
 
 
-# Generate datasets
-_cost_accounts_df = generate_cost_accounts_data(num_records=100000)
-_expenses_df = generate_expenses_data(num_records=50000)
+GENERATORS = {
+    "cost_accounts": generate_cost_accounts_data,
+    "expenses": generate_expenses_data,
+}
+
+
+def write_shard(name: str, num_records: int, seed: np.random.SeedSequence, path: str, file_format: str, duplicates: int = 0) -> str:
+    """Generate one shard of a dataset and write it to `path`."""
+    df = GENERATORS[name](num_records, seed)
+    if duplicates:
+        df = add_duplicates(df, duplicates)
+    if file_format == "parquet":
+        df.to_parquet(path, index=False, compression="zstd")
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def write_dataset(name: str, num_records: int, output_dir: str, shards: int = 1, seed: int | np.random.SeedSequence = None, file_format: str = "csv", duplicates: int = 100, workers: int = None) -> list:
+    """
+    Generate a dataset in `shards` independently seeded chunks, written in parallel.
+
+    A single shard is written to `{output_dir}/{name}.{format}`, several shards to
+    `{output_dir}/{name}/part-NNNN.{format}`. Duplicate rows are only added to the first shard.
+    """
+    if shards == 1:
+        paths = [os.path.join(output_dir, f"{name}.{file_format}")]
+    else:
+        os.makedirs(os.path.join(output_dir, name), exist_ok=True)
+        paths = [os.path.join(output_dir, name, f"part-{shard:04d}.{file_format}") for shard in range(shards)]
+
+    shard_rows = [num_records // shards + (shard < num_records % shards) for shard in range(shards)]
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    shard_seeds = seed.spawn(shards)
+    shard_duplicates = [duplicates] + [0] * (shards - 1)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(write_shard, [name] * shards, shard_rows, shard_seeds, paths, [file_format] * shards, shard_duplicates))
+
+
+def main():
+    args = generate_data_parse_arguments()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # Keep the original 2:1 ratio of cost account to expense records
+    seeds = np.random.SeedSequence(args.seed).spawn(2)
+    for name, num_records, seed in [("cost_accounts", args.rows, seeds[0]), ("expenses", args.rows // 2, seeds[1])]:
+        paths = write_dataset(name, num_records, args.output_dir, args.shards, seed, args.format, args.duplicates, args.workers)
+        print(f"Generated {num_records} {name} records in {len(paths)} {args.format} file(s) under {args.output_dir}")
 
-cost_accounts_df = add_duplicates(_cost_accounts_df)
-expenses_df = add_duplicates(_expenses_df)
+    print("Cost Accounts and Expenses datasets generated successfully.")
 
-# Save the datasets as CSV for review
-cost_accounts_df.to_csv("src/data/p6/cost_accounts.csv", index=False)
-expenses_df.to_csv("src/data/p6/expenses.csv", index=False)
 
-print("Cost Accounts and Expenses datasets generated successfully.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""Result cache for DuckDB queries, invalidated when the tables they read change."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from loguru import logger
+
+# Table holding a version number per table, bumped every time the table is written
+TABLE_VERSIONS_TABLE = "_table_versions"
+
+# Quoted strings and identifiers, which are kept verbatim when normalising SQL
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+
+# Identities of in-memory databases, which have no path, per connection object
+_memory_database_ids: "weakref.WeakKeyDictionary[Any, str]" = (
+    weakref.WeakKeyDictionary()
+)
+_memory_database_ids_lock = threading.Lock()
+
+
+class QueryCache:
+    """
+    LRU cache of query results, bounded by the memory used by the cached DataFrames.
+
+    Entries are keyed on the normalised SQL text and the version stamps of the tables
+    the query reads, see `table_version_stamps`. Entries evicted from memory can be kept
+    in an optional on-disk Arrow IPC tier.
+
+    Args:
+        max_bytes (int): Maximum memory used by cached DataFrames. Defaults to 512 MB.
+        disk_dir (str): Directory of the on-disk tier. Defaults to None (memory only).
+        max_disk_bytes (int): Maximum size of the on-disk tier. Defaults to 4 GB.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 512 * 1024**2,
+        disk_dir: str = None,
+        max_disk_bytes: int = 4 * 1024**3,
+    ):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: OrderedDict[str, Tuple[pd.DataFrame, Set[str], int]] = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """
+        Returns a copy of a cached result, or None on a miss.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            pd.DataFrame | None: The cached result.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0].copy()
+        path = self._disk_path(key)
+        if path and os.path.exists(path):
+            try:
+                return feather.read_feather(path)
+            except (OSError, pa.ArrowInvalid) as e:
+                logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+        return None
+
+    def put(self, key: str, df: pd.DataFrame, tables: Iterable[str]) -> None:
+        """
+        Caches a query result.
+
+        Results larger than the memory budget go straight to the on-disk tier.
+
+        Args:
+            key (str): The cache key.
+            df (pd.DataFrame): The query result.
+            tables (Iterable[str]): The tables the query reads.
+
+        Returns:
+            None
+        """
+        size = int(df.memory_usage(deep=True).sum())
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[2]
+            if size <= self.max_bytes:
+                self._entries[key] = (df.copy(), set(tables), size)
+                self._bytes += size
+            else:
+                evicted.append((key, df))
+            while self._bytes > self.max_bytes:
+                evicted_key, (evicted_df, _, evicted_size) = self._entries.popitem(
+                    last=False
+                )
+                self._bytes -= evicted_size
+                evicted.append((evicted_key, evicted_df))
+        for evicted_key, evicted_df in evicted:
+            self._write_to_disk(evicted_key, evicted_df)
+
+    def invalidate(self, table_name: str) -> None:
+        """
+        Drops the in-memory results that read a table.
+
+        On-disk results need no invalidation, as their keys contain the table versions.
+
+        Args:
+            table_name (str): The name of the table that changed, qualified or not.
+
+        Returns:
+            None
+        """
+        suffix = f".{table_name}"
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if any(
+                    table == table_name or table.endswith(suffix) for table in entry[1]
+                )
+            ]
+            for key in stale:
+                self._bytes -= self._entries.pop(key)[2]
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cached results of '{table_name}'.")
+
+    def clear(self) -> None:
+        """
+        Empties the in-memory tier.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _disk_path(self, key: str) -> str | None:
+        return os.path.join(self.disk_dir, f"{key}.arrow") if self.disk_dir else None
+
+    def _write_to_disk(self, key: str, df: pd.DataFrame) -> None:
+        path = self._disk_path(key)
+        if not path:
+            return
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        feather.write_feather(df, temp_path, compression="uncompressed")
+        os.replace(temp_path, path)
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        files = [
+            entry
+            for entry in os.scandir(self.disk_dir)
+            if entry.name.endswith(".arrow")
+        ]
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in files)
+        for entry in files:
+            if total <= self.max_disk_bytes:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+
+
+query_cache = QueryCache()
+
+
+def configure_query_cache(
+    max_bytes: int = 512 * 1024**2,
+    disk_dir: str = None,
+    max_disk_bytes: int = 4 * 1024**3,
+) -> QueryCache:
+    """
+    Replaces the default query cache, e.g. to change its size or add an on-disk tier.
+
+    Args:
+        max_bytes (int): Maximum memory used by cached DataFrames. Defaults to 512 MB.
+        disk_dir (str): Directory of the on-disk tier. Defaults to None (memory only).
+        max_disk_bytes (int): Maximum size of the on-disk tier. Defaults to 4 GB.
+
+    Returns:
+        QueryCache: The new default query cache.
+    """
+    global query_cache
+    query_cache = QueryCache(max_bytes, disk_dir, max_disk_bytes)
+    return query_cache
+
+
+def invalidate_table(table_name: str) -> None:
+    """
+    Drops the results of the default query cache that read a table.
+
+    Args:
+        table_name (str): The name of the table that changed.
+
+    Returns:
+        None
+    """
+    query_cache.invalidate(table_name)
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Normalises SQL text so formatting-only differences map to the same cache entry.
+
+    Comments are removed and whitespace is collapsed outside quoted strings and
+    identifiers, and a trailing semicolon is dropped.
+
+    Args:
+        sql (str): The SQL text.
+
+    Returns:
+        str: The normalised SQL text.
+    """
+    parts = _QUOTED.split(sql)
+    for i in range(0, len(parts), 2):
+        part = re.sub(r"--[^\n]*", " ", parts[i])
+        parts[i] = re.sub(r"\s+", " ", part)
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def database_identity(con: duckdb.DuckDBPyConnection, database: str) -> str:
+    """
+    Returns an identity of an attached database that is unique across processes' files.
+
+    File databases are identified by their absolute path. In-memory databases are only
+    visible to their own connection, so they get an identity per connection object.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        database (str): The name of the attached database (e.g., 'dev').
+
+    Returns:
+        str: The identity of the database.
+    """
+    row = con.execute(
+        "SELECT path FROM duckdb_databases() WHERE database_name = ?", [database]
+    ).fetchone()
+    if row and row[0]:
+        return os.path.abspath(row[0])
+    with _memory_database_ids_lock:
+        connection_id = _memory_database_ids.setdefault(con, uuid.uuid4().hex)
+    return f":memory:{connection_id}:{database}"
+
+
+def query_tables(
+    con: duckdb.DuckDBPyConnection, sql: str, params: List[Any] | Dict[str, Any] = None
+) -> Set[str] | None:
+    """
+    Returns the tables a query reads, taken from its physical plan.
+
+    Views are expanded by the planner, so views over tables resolve to those tables.
+    Sources whose changes cannot be tracked, such as files and other table functions
+    (e.g., a view over `read_parquet`), make the query uncacheable.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        sql (str): The SQL text of the query.
+        params (List[Any] | Dict[str, Any]): Bind parameters of the query. Defaults to None.
+
+    Returns:
+        Set[str] | None: The qualified names ('database.schema.table') of the tables, or None
+            if the query reads other sources or cannot be planned.
+    """
+    try:
+        plan = con.execute(f"EXPLAIN (FORMAT json) {sql}", params).fetchall()
+    except duckdb.Error:
+        return None
+    tables = set()
+    nodes = [node for _, text in plan for node in json.loads(text)]
+    while nodes:
+        node = nodes.pop()
+        info = node.get("extra_info") or {}
+        if isinstance(info, dict) and "Function" in info:
+            return None
+        if isinstance(info, dict) and "Table" in info:
+            tables.add(info["Table"])
+        nodes.extend(node.get("children", []))
+    return tables
+
+
+def table_version_stamps(
+    con: duckdb.DuckDBPyConnection, tables: Iterable[str]
+) -> Dict[str, Tuple]:
+    """
+    Returns a version stamp per table from the version table and the DuckDB catalog.
+
+    The stamp combines the identity of the table's database, the version bumped by the
+    DuckDB connector on every write, and the estimated row and column counts. Writes that
+    bypass the connector are only noticed if they change the row or column count, so
+    e.g. an UPDATE made by another tool must be followed by `bump_table_version`.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        tables (Iterable[str]): The qualified names ('database.schema.table') of the tables.
+
+    Returns:
+        Dict[str, Tuple]: The version stamp of every existing table, keyed by qualified name.
+    """
+    tables = sorted(set(tables))
+    if not tables:
+        return {}
+    rows = con.execute(
+        """
+        SELECT database_name || '.' || schema_name || '.' || table_name,
+            database_name, table_name, estimated_size, column_count
+        FROM duckdb_tables()
+        WHERE database_name || '.' || schema_name || '.' || table_name IN ?
+        ORDER BY 1
+        """,
+        [tables],
+    ).fetchall()
+
+    versions = {}
+    for database in sorted({row[1] for row in rows}):
+        version_table = con.execute(
+            """
+            SELECT schema_name FROM duckdb_tables()
+            WHERE database_name = ? AND table_name = ?
+            """,
+            [database, TABLE_VERSIONS_TABLE],
+        ).fetchone()
+        if version_table:
+            identifier = ".".join(
+                '"' + part.replace('"', '""') + '"'
+                for part in (database, version_table[0], TABLE_VERSIONS_TABLE)
+            )
+            for table_name, version in con.execute(
+                f"SELECT table_name, version FROM {identifier}"
+            ).fetchall():
+                versions[(database, table_name)] = version
+
+    identities = {}
+    stamps = {}
+    for name, database, table_name, estimated_size, column_count in rows:
+        if database not in identities:
+            identities[database] = database_identity(con, database)
+        stamps[name] = (
+            identities[database],
+            versions.get((database, table_name), 0),
+            estimated_size,
+            column_count,
+        )
+    return stamps
+
+
+def cached_query(
+    con: duckdb.DuckDBPyConnection,
+    sql: str,
+    run: Callable[[], pd.DataFrame],
+    cache: QueryCache = None,
+    params: List[Any] | Dict[str, Any] = None,
+    **options,
+) -> pd.DataFrame:
+    """
+    Returns the result of a query from the cache, or runs it and caches the result.
+
+    Queries that read no tables, or also read files or other table functions, are run
+    without caching, as their changes cannot be detected.
+
+    Args:
+        con (duckdb.DuckDBPyConnection): Connection object to the DuckDB database.
+        sql (str): The SQL text of the query, used for the key and its table dependencies.
+        run (Callable[[], pd.DataFrame]): Runs the query on a cache miss.
+        cache (QueryCache): The cache to use. Defaults to the default query cache.
+        params (List[Any] | Dict[str, Any]): Bind parameters of the query. Defaults to None.
+        **options: Options that change the result (e.g., dtype_backend), added to the key.
+
+    Returns:
+        pd.DataFrame: The query result.
+    """
+    cache = cache or query_cache
+    tables = query_tables(con, sql, params)
+    if not tables:
+        logger.debug("Query reads no tables or untracked sources, not caching it.")
+        return run()
+    stamps = table_version_stamps(con, tables)
+    key = hashlib.sha256(
+        repr(
+            (
+                normalize_sql(sql),
+                sorted(stamps.items()),
+                repr(params),
+                sorted(options.items()),
+            )
+        ).encode()
+    ).hexdigest()
+
+    df = cache.get(key)
+    if df is not None:
+        logger.info(f"Query result served from cache ({len(df)} rows).")
+        return df
+    df = run()
+    cache.put(key, df, tables)
+    return df
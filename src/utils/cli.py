@@ -10,3 +10,105 @@ def ingest_parse_arguments():
         help="Specify the database environment ('dev' or 'prod' default: dev).",
     )
     return parser.parse_args()
+
+
+def generate_data_parse_arguments():
+    parser = argparse.ArgumentParser(description="Generate synthetic P6 datasets.")
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=100000,
+        help="Number of cost account records; half as many expenses (default: 100000).",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Number of files each dataset is split into (default: 1).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for reproducible datasets (default: random).",
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Output file format (default: csv).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="src/data/p6",
+        help="Directory the datasets are written to (default: src/data/p6).",
+    )
+    parser.add_argument(
+        "--duplicates",
+        type=int,
+        default=100,
+        help="Number of duplicate rows added to each dataset (default: 100).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parallel worker processes (default: number of CPUs).",
+    )
+    return parser.parse_args()
+
+
+def benchmark_parse_arguments():
+    parser = argparse.ArgumentParser(description="Benchmark the ingest pipeline.")
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=[100000, 1000000, 10000000],
+        help="Numbers of rows to benchmark (default: 100000 1000000 10000000).",
+    )
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=10,
+        help="Number of files the rows are split into (default: 10).",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Simulated Drive latency per request in seconds (default: 0).",
+    )
+    parser.add_argument(
+        "--bandwidth-mbps",
+        type=float,
+        default=None,
+        help="Simulated Drive bandwidth in megabits per second (default: unlimited).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Download concurrency of the end-to-end ingest stage (default: 4).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Random seed of the generated data (default: 42).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="benchmarks/results",
+        help="Directory the JSON results are written to (default: benchmarks/results).",
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        help="Path of a previous results file to compare against.",
+    )
+    return parser.parse_args()
@@ -1,50 +1,88 @@
 """Common DataFrame read functions."""
 
+import itertools
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, time
 from io import BytesIO
-from typing import Any
+from typing import IO, Any, Dict, Iterator, List, Tuple
 
+import duckdb
+import openpyxl
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 from loguru import logger
 
+from src.utils.cache import cached_query
+from src.utils.dataframe.schema import apply_schema
 from src.utils.file.read import read_file_to_string
+from src.utils.metrics import instrument
 
+try:
+    import python_calamine
+except ImportError:  # Optional, Excel files are then read with openpyxl
+    python_calamine = None
 
-def log_dataframe_info(df: pd.DataFrame) -> None:
+
+@instrument("profile")
+def log_dataframe_info(df: pd.DataFrame, sample_rows: int = None) -> None:
     """
     Logs key information about the given pandas DataFrame, such as its shape, columns,
     data types, memory usage, and missing values.
 
+    The statistics are only computed when a handler accepts DEBUG messages. With
+    `sample_rows`, they are computed on a random sample of at most that many rows.
+
     Args:
         df (pd.DataFrame): The pandas DataFrame to log information about.
+        sample_rows (int): Maximum number of rows to profile. Defaults to all rows.
 
     Returns:
         None
     """
-    mem_usage = df.memory_usage(deep=True).sum() / (1024**2)  # Convert to MB
-    missing_values = df.isnull().sum()
-    numeric_stats = df.describe().to_string()
+    logger.opt(lazy=True).debug("{}", lambda: _describe_dataframe(df, sample_rows))
 
-    logger.debug(
-        f"""
+
+def _describe_dataframe(df: pd.DataFrame, sample_rows: int = None) -> str:
+    """Builds the profile logged by `log_dataframe_info`."""
+    sample = df
+    sample_note = memory_note = ""
+    if sample_rows and len(df) > sample_rows:
+        sample = df.sample(n=sample_rows, random_state=0)
+        sample_note = f" (from {sample_rows} sampled rows)"
+        memory_note = f" (estimated from {sample_rows} sampled rows)"
+
+    mem_usage = sample.memory_usage(deep=True).sum() / (1024**2)  # Convert to MB
+    if len(sample):
+        mem_usage *= len(df) / len(sample)
+    missing_values = sample.isnull().sum()
+    numeric_stats = sample.describe().to_string()
+
+    return f"""
 
 DataFrame Shape: {df.shape[0]} rows, {df.shape[1]} columns
 
 DataFrame Columns and Data Types:
 {df.dtypes}
 
-DataFrame Memory Usage: {mem_usage:.2f} MB
+DataFrame Memory Usage: {mem_usage:.2f} MB{memory_note}
 
-Missing Values:
+Missing Values{sample_note}:
 {missing_values[missing_values > 0]}
 
-Numeric Statistics:
+Numeric Statistics{sample_note}:
 {numeric_stats}
 """
-    )
 
 
+@instrument("parse")
 def read_file_object_to_dataframe(
-    file_obj: BytesIO, file_format: str, **kwargs
+    file_obj: BytesIO, file_format: str, schema: Dict[str, str] = None, **kwargs
 ) -> pd.DataFrame:
     """
     Convert a file object into a pandas DataFrame.
@@ -52,7 +90,11 @@ def read_file_object_to_dataframe(
     Args:
         file_obj (BytesIO): The file object to read.
         file_format (str): The type of the file ('csv', 'excel').
+        schema (Dict[str, str]): Schema contract the columns are converted to, see
+            `src.utils.dataframe.schema`. Defaults to None.
         **kwargs: Additional arguments to pass to the pandas read function (e.g., sep, encoding).
+            Excel files are read with `read_excel_to_dataframe`, and the sheets are
+            concatenated if several are read.
 
     Returns:
         pd.DataFrame: A pandas DataFrame containing the file data.
@@ -65,36 +107,427 @@ def read_file_object_to_dataframe(
     )
 
     if file_format.lower() in ("csv", ".csv"):
-        return pd.read_csv(file_obj, **kwargs)
+        df = pd.read_csv(file_obj, **kwargs)
 
     elif file_format in ("excel", "xlsx", "xls", ".xlsx", ".xls"):
-        return pd.read_excel(file_obj, **kwargs)
+        df = read_excel_to_dataframe(file_obj, **kwargs)
+        if isinstance(df, dict):
+            df = pd.concat(df.values(), ignore_index=True)
 
     else:
         logger.error(f"Unsupported file type: {file_format}")
         raise
 
+    return apply_schema(df, schema) if schema else df
 
-def default_read_sql_to_dataframe(
-    con: Any, sql_file_path: str, sql_string: str
+
+@instrument("parse")
+def read_file_object_to_arrow(
+    file_obj: str | IO[bytes], file_format: str, schema: Dict[str, str] = None, **kwargs
+) -> pa.Table:
+    """
+    Convert a file object into an Arrow table.
+
+    CSV files are parsed by pyarrow's multi-threaded reader and Parquet files are read
+    as is, so string-heavy columns never become NumPy object arrays. Excel files are
+    read with `read_excel_to_dataframe` and converted.
+
+    Args:
+        file_obj (str | IO[bytes]): Path or file object to read.
+        file_format (str): The type of the file ('csv', 'parquet', 'excel').
+        schema (Dict[str, str]): Schema contract of the data. Not applied here, Arrow data is
+            cast by DuckDB when loaded with `create_table`. Defaults to None.
+        **kwargs: Additional arguments to pass to the read function. For CSV files these are
+            the `read_options`, `parse_options` and `convert_options` of pyarrow.csv.read_csv.
+
+    Returns:
+        pa.Table: An Arrow table containing the file data.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    logger.debug(
+        f"Converting file object to Arrow table as {file_format} with kwargs: {kwargs}"
+    )
+
+    if file_format.lower() in ("csv", ".csv"):
+        return pa_csv.read_csv(file_obj, **kwargs)
+
+    elif file_format.lower() in ("parquet", ".parquet"):
+        return pq.read_table(file_obj, **kwargs)
+
+    elif file_format in ("excel", "xlsx", "xls", ".xlsx", ".xls"):
+        df = read_excel_to_dataframe(file_obj, **kwargs)
+        if isinstance(df, dict):
+            df = pd.concat(df.values(), ignore_index=True)
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    else:
+        logger.error(f"Unsupported file type: {file_format}")
+        raise ValueError(f"Unsupported file type: {file_format}")
+
+
+def default_excel_engine() -> str:
+    """Returns the fastest installed Excel engine, 'calamine' or else 'openpyxl'."""
+    return "calamine" if python_calamine is not None else "openpyxl"
+
+
+def read_excel_to_dataframe(
+    file_obj: str | IO[bytes],
+    sheet_name: str | int | List[str | int] | None = 0,
+    engine: str = None,
+    sheet_workers: int = 0,
+    **kwargs,
+) -> pd.DataFrame | Dict[str | int, pd.DataFrame]:
+    """
+    Reads one or more Excel worksheets into pandas DataFrames.
+
+    The Rust-based calamine engine is used when python-calamine is installed, which parses
+    large xlsx workbooks about ten times faster than openpyxl. With several sheets and
+    `sheet_workers`, every sheet is parsed in its own process.
+
+    Args:
+        file_obj (str | IO[bytes]): Path or file object of the workbook.
+        sheet_name (str | int | List[str | int] | None): Worksheet name or zero-based index,
+            a list of them, or None for all worksheets. Defaults to 0.
+        engine (str): The pandas Excel engine. Defaults to `default_excel_engine()`.
+        sheet_workers (int): Number of processes parsing sheets, 0 to parse them one after
+            the other. Defaults to 0.
+        **kwargs: Additional arguments to pass to `pd.read_excel` (e.g., usecols, skiprows).
+
+    Returns:
+        pd.DataFrame | Dict[str | int, pd.DataFrame]: The worksheet, or a dictionary of
+            worksheets keyed like `sheet_name` if several are read.
+    """
+    engine = engine or default_excel_engine()
+    if sheet_workers and (sheet_name is None or isinstance(sheet_name, list)):
+        # Workers open the workbook from a path rather than each receiving its bytes
+        with _workbook_path(file_obj) as path:
+            sheets = sheet_name
+            if sheets is None:
+                with pd.ExcelFile(path, engine=engine) as workbook:
+                    sheets = workbook.sheet_names
+            if len(sheets) > 1:
+                logger.debug(
+                    f"Parsing {len(sheets)} sheets in {sheet_workers} processes"
+                )
+                with ProcessPoolExecutor(
+                    max_workers=min(sheet_workers, len(sheets))
+                ) as pool:
+                    futures = [
+                        pool.submit(_read_excel_sheet, path, sheet, engine, kwargs)
+                        for sheet in sheets
+                    ]
+                    return {
+                        sheet: future.result() for sheet, future in zip(sheets, futures)
+                    }
+            return pd.read_excel(path, sheet_name=sheet_name, engine=engine, **kwargs)
+    return pd.read_excel(file_obj, sheet_name=sheet_name, engine=engine, **kwargs)
+
+
+def _read_excel_sheet(
+    path: str, sheet_name: str | int, engine: str, kwargs: Dict[str, Any]
+) -> pd.DataFrame:
+    """Parses one worksheet of a workbook file, in a worker process."""
+    return pd.read_excel(path, sheet_name=sheet_name, engine=engine, **kwargs)
+
+
+@contextmanager
+def _workbook_path(file_obj: str | IO[bytes]) -> Iterator[str]:
+    """Yields the path of a workbook, copying a file object to a temporary file."""
+    if isinstance(file_obj, str):
+        yield file_obj
+        return
+    file_obj.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as file:
+        shutil.copyfileobj(file_obj, file)
+    try:
+        yield file.name
+    finally:
+        os.remove(file.name)
+
+
+def iter_excel_batches(
+    file_obj: str | IO[bytes],
+    sheet_name: str | int = 0,
+    header: int | None = 0,
+    skiprows: int | List[int] = 0,
+    usecols: str | List[str] = None,
+    nrows: int = None,
+    batch_rows: int = 100_000,
+    engine: str = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams an Excel worksheet as pandas DataFrames of at most `batch_rows` rows.
+
+    With the calamine engine the sheet is parsed in Rust and converted to Python objects
+    one batch at a time. With openpyxl the workbook is opened in read-only mode, so rows
+    are parsed lazily. Either way only one batch of DataFrame rows is held at a time.
+
+    Args:
+        file_obj (str | IO[bytes]): Path or file object of the xlsx workbook.
+        sheet_name (str | int): Worksheet name or zero-based index. Defaults to 0.
+        header (int | None): Row (after `skiprows`) holding the column names, None for no header. Defaults to 0.
+        skiprows (int | List[int]): Number of rows to skip at the top of the sheet, or the
+            zero-based indices of the rows to skip. Defaults to 0.
+        usecols (str | List[str]): Column names to keep, or Excel column letters and ranges
+            (e.g., 'A:D,F'). Defaults to all columns.
+        nrows (int): Maximum number of data rows to read. Defaults to all rows.
+        batch_rows (int): Maximum number of rows per batch. Defaults to 100,000.
+        engine (str): 'calamine' or 'openpyxl'. Defaults to `default_excel_engine()`.
+
+    Yields:
+        pd.DataFrame: The next batch of rows.
+    """
+    workbook, rows = _open_worksheet_rows(
+        file_obj, sheet_name, engine or default_excel_engine()
+    )
+    try:
+        if isinstance(skiprows, (list, tuple, set)):
+            skipped = set(skiprows)
+            rows = (row for i, row in enumerate(rows) if i not in skipped)
+            skiprows = 0
+        for _ in range((skiprows or 0) + (header or 0)):
+            next(rows, None)
+        if header is None:
+            first_row = next(rows, None)
+            if first_row is None:
+                return
+            columns = list(range(len(first_row)))
+            rows = itertools.chain([first_row], rows)
+        else:
+            # Empty header cells are named like pandas does, after their position
+            columns = [
+                f"Unnamed: {i}" if column is None else str(column)
+                for i, column in enumerate(next(rows, ()))
+            ]
+
+        keep = None
+        if isinstance(usecols, str):
+            keep = _excel_column_positions(usecols)
+            columns = [columns[i] if i < len(columns) else i for i in keep]
+        elif usecols:
+            keep = [columns.index(column) for column in usecols]
+            columns = list(usecols)
+        if nrows is not None:
+            rows = itertools.islice(rows, nrows)
+
+        while batch := list(itertools.islice(rows, batch_rows)):
+            yield _rows_to_dataframe(batch, columns, keep)
+    finally:
+        workbook.close()
+
+
+def _open_worksheet_rows(
+    file_obj: str | IO[bytes], sheet_name: str | int, engine: str
+) -> Tuple[Any, Iterator[tuple]]:
+    """
+    Opens a worksheet and returns its workbook, to close when done, and an iterator of
+    its rows as openpyxl returns them: starting at column A, empty cells as None.
+    """
+    if engine == "openpyxl":
+        workbook = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
+        try:
+            if isinstance(sheet_name, int):
+                worksheet = workbook.worksheets[sheet_name]
+            else:
+                worksheet = workbook[sheet_name]
+        except (IndexError, KeyError):
+            workbook.close()
+            raise
+        return workbook, worksheet.iter_rows(values_only=True)
+
+    if engine != "calamine":
+        raise ValueError(f"Unsupported Excel engine: {engine}")
+    if python_calamine is None:
+        raise ImportError("python-calamine is not installed, use engine='openpyxl'.")
+    workbook = python_calamine.CalamineWorkbook.from_object(file_obj)
+    try:
+        if isinstance(sheet_name, int):
+            worksheet = workbook.get_sheet_by_index(sheet_name)
+        else:
+            worksheet = workbook.get_sheet_by_name(sheet_name)
+    except Exception:
+        workbook.close()
+        raise
+    # Calamine starts rows at the first used column and returns whole numbers as floats
+    # and midnight datetimes as dates
+    padding = (None,) * (worksheet.start[1] if worksheet.start else 0)
+    rows = (
+        padding + tuple(_calamine_value(value) for value in row)
+        for row in worksheet.iter_rows()
+    )
+    return workbook, rows
+
+
+def _calamine_value(value: Any) -> Any:
+    """Converts a calamine cell value to the value openpyxl returns."""
+    if value == "":
+        return None
+    if type(value) is float and value.is_integer():
+        return int(value)
+    if type(value) is date:
+        return datetime.combine(value, time())
+    return value
+
+
+def _excel_column_positions(usecols: str) -> List[int]:
+    """Returns the zero-based positions of Excel column letters and ranges, e.g. 'A:D,F'."""
+    positions = []
+    for part in usecols.replace(" ", "").upper().split(","):
+        first, _, last = part.partition(":")
+        start = openpyxl.utils.column_index_from_string(first)
+        end = openpyxl.utils.column_index_from_string(last or first)
+        positions.extend(range(start - 1, end))
+    return positions
+
+
+def _rows_to_dataframe(
+    rows: List[tuple], columns: List, keep: List[int] | None
 ) -> pd.DataFrame:
+    """Builds a DataFrame from worksheet rows, keeping only the `keep` positions."""
+    if keep is not None:
+        rows = [[row[i] if i < len(row) else None for i in keep] for row in rows]
+    else:
+        width = len(columns)
+        rows = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+    return pd.DataFrame.from_records(rows, columns=columns)
+
+
+def iter_file_object_batches(
+    file_obj: str | IO[bytes],
+    file_format: str,
+    batch_rows: int = 100_000,
+    max_memory_mb: float = None,
+    schema: Dict[str, str] = None,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams a file object as pandas DataFrames of bounded size.
+
+    CSV files are read with pandas' chunked reader and Excel files with
+    `iter_excel_batches`. With `max_memory_mb`, the number of rows per CSV batch is lowered
+    after every batch so that the next batch stays under the memory ceiling.
+
+    Args:
+        file_obj (str | IO[bytes]): Path or file object to read.
+        file_format (str): The type of the file ('csv', 'excel').
+        batch_rows (int): Maximum number of rows per batch. Defaults to 100,000.
+        max_memory_mb (float): Memory ceiling of a single batch in MB. Defaults to None.
+        schema (Dict[str, str]): Schema contract every batch is converted to. Defaults to None.
+        **kwargs: Additional arguments to pass to the read function (e.g., sep, encoding).
+
+    Yields:
+        pd.DataFrame: The next batch of rows.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    logger.debug(
+        f"Streaming file object as {file_format} in batches of {batch_rows} rows "
+        f"with kwargs: {kwargs}"
+    )
+
+    if file_format.lower() in ("csv", ".csv"):
+        size = batch_rows
+        with pd.read_csv(file_obj, chunksize=batch_rows, **kwargs) as reader:
+            while True:
+                try:
+                    batch = reader.get_chunk(size)
+                except StopIteration:
+                    return
+                yield apply_schema(batch, schema) if schema else batch
+                if max_memory_mb and len(batch):
+                    row_bytes = batch.memory_usage(deep=True).sum() / len(batch)
+                    max_rows = int(max_memory_mb * 1024**2 / max(row_bytes, 1))
+                    size = max(1, min(batch_rows, max_rows))
+
+    elif file_format in ("excel", "xlsx", ".xlsx"):
+        for batch in iter_excel_batches(file_obj, batch_rows=batch_rows, **kwargs):
+            yield apply_schema(batch, schema) if schema else batch
+
+    else:
+        logger.error(f"Unsupported file type: {file_format}")
+        raise ValueError(f"Unsupported file type: {file_format}")
+
+
+def default_read_sql_to_dataframe(
+    con: Any,
+    sql_file_path: str,
+    sql_string: str,
+    cache: bool = False,
+    params: List[Any] | Dict[str, Any] = None,
+    batch_size: int = None,
+    dtype_backend: str = "numpy",
+) -> pd.DataFrame | Iterator[pd.DataFrame]:
     """
     Executes a SQL query using a given connection and returns the result as a DataFrame.
 
+    DuckDB connections run the query natively and fetch the result column by column,
+    other connections go through `pd.read_sql`.
+
     Args:
         con (Any): The database connection object.
         sql_query (str): The SQL query to execute.
+        cache (bool): Serve the result from the query cache while the tables it reads are
+            unchanged, see `src.utils.cache.cached_query`. Only used with DuckDB
+            connections. Defaults to False.
+        params (List[Any] | Dict[str, Any]): Bind parameters of the query. Defaults to None.
+        batch_size (int): Stream the result as an iterator of DataFrames of this many rows
+            (DuckDB connections only). Defaults to None.
+        dtype_backend (str): 'numpy' or 'pyarrow' columns (DuckDB connections only).
+            Defaults to 'numpy'.
 
     Returns:
-        pd.DataFrame: The result of the SQL query as a DataFrame.
+        pd.DataFrame | Iterator[pd.DataFrame]: The result of the SQL query as a DataFrame, or
+            an iterator of DataFrames if `batch_size` is set.
     """
     query = sql_string if sql_string else read_file_to_string(sql_file_path)
     logger.info("Executing SQL query and fetching results into DataFrame.")
     try:
-        df = pd.read_sql(query, con=con)
+        if not isinstance(con, duckdb.DuckDBPyConnection):
+            df = pd.read_sql(query, con=con, params=params)
+        elif batch_size:
+            reader = con.execute(query, params).to_arrow_reader(batch_size)
+            logger.success("Successfully executed SQL query, streaming DataFrames.")
+            return record_batches_to_dataframes(reader, dtype_backend)
+        else:
+
+            def run() -> pd.DataFrame:
+                result = con.execute(query, params)
+                if dtype_backend == "pyarrow":
+                    return result.to_arrow_table().to_pandas(
+                        types_mapper=pd.ArrowDtype
+                    )
+                return result.fetch_df()
+
+            if cache:
+                df = cached_query(
+                    con, query, run, params=params, dtype_backend=dtype_backend
+                )
+            else:
+                df = run()
         log_dataframe_info(df)
         logger.success("Successfully executed SQL query and fetched DataFrame.")
         return df
     except Exception as e:
         logger.error(f"Failed to execute SQL query. Error: {e}")
         raise
+
+
+def record_batches_to_dataframes(
+    reader: pa.RecordBatchReader, dtype_backend: str = "numpy"
+) -> Iterator[pd.DataFrame]:
+    """
+    Converts a stream of Arrow record batches into DataFrames, one batch at a time.
+
+    Args:
+        reader (pa.RecordBatchReader): The record batches, e.g. from DuckDB's `to_arrow_reader`.
+        dtype_backend (str): 'numpy' or 'pyarrow' columns. Defaults to 'numpy'.
+
+    Yields:
+        pd.DataFrame: The rows of one record batch.
+    """
+    types_mapper = pd.ArrowDtype if dtype_backend == "pyarrow" else None
+    for batch in reader:
+        yield batch.to_pandas(types_mapper=types_mapper)
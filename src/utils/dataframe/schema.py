@@ -0,0 +1,262 @@
+"""Schema contracts for ingested tables: inference and enforcement on pandas and DuckDB."""
+
+import os
+import re
+from typing import Any, Dict, Tuple
+
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+from src.utils.file.read import read_yaml_to_dict
+
+# Contract column types and their DuckDB equivalents. 'category' keeps the type the data
+# arrives with in DuckDB, whose dictionary compression already encodes repeated strings.
+DUCKDB_TYPES = {
+    "string": "VARCHAR",
+    "category": None,
+    "date": "DATE",
+    "timestamp": "TIMESTAMP",
+    "decimal": "DECIMAL",
+    "bool": "BOOLEAN",
+    "int8": "TINYINT",
+    "int16": "SMALLINT",
+    "int32": "INTEGER",
+    "int64": "BIGINT",
+    "float32": "FLOAT",
+    "float64": "DOUBLE",
+}
+
+# Precision and scale of DECIMAL columns declared without them, suited to money amounts
+DEFAULT_DECIMAL = (18, 2)
+
+# Strings that look like dates, e.g. '2024-01-31', '31/01/2024' or '2024-01-31 08:00'
+_DATE_LIKE = re.compile(
+    r"^\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}([ T]\d{1,2}:\d{2}(:\d{2})?)?"
+)
+
+
+def parse_schema_type(schema_type: str) -> Tuple[str, Tuple[int, ...]]:
+    """
+    Splits a contract column type into its name and arguments, e.g. 'decimal(18,2)'.
+
+    Args:
+        schema_type (str): The contract column type.
+
+    Returns:
+        Tuple[str, Tuple[int, ...]]: The lower-case type name and its integer arguments.
+
+    Raises:
+        ValueError: If the type is not supported.
+    """
+    match = re.fullmatch(r"\s*(\w+)\s*(?:\(([\d\s,]*)\))?\s*", str(schema_type))
+    name = match.group(1).lower() if match else None
+    if name == "int":
+        name = "int64"
+    if name not in DUCKDB_TYPES:
+        raise ValueError(f"Unsupported schema type: {schema_type}")
+    args = (
+        tuple(int(arg) for arg in match.group(2).split(",")) if match.group(2) else ()
+    )
+    if name == "decimal" and not args:
+        args = DEFAULT_DECIMAL
+    return name, args
+
+
+def to_duckdb_type(schema_type: str) -> str | None:
+    """
+    Returns the DuckDB column type of a contract column type.
+
+    Args:
+        schema_type (str): The contract column type.
+
+    Returns:
+        str | None: The DuckDB type, or None if the column is loaded as it arrives.
+    """
+    name, args = parse_schema_type(schema_type)
+    duckdb_type = DUCKDB_TYPES[name]
+    if name == "decimal":
+        duckdb_type += f"({args[0]},{args[1]})"
+    return duckdb_type
+
+
+def infer_schema(
+    df: pd.DataFrame,
+    max_categories: int = 1000,
+    max_category_ratio: float = 0.5,
+    date_ratio: float = 0.95,
+) -> Dict[str, str]:
+    """
+    Infers a schema contract from a sample of the data.
+
+    Low-cardinality text becomes 'category', text that parses as dates 'date' (or
+    'timestamp' if it has a time of day), floats with at most two decimals (money)
+    'decimal(18,2)' and other floats 'float64'. Floats never become integers, as later
+    files may hold fractions the sample does not.
+
+    Args:
+        df (pd.DataFrame): A sample of the data, e.g. the first file of a folder.
+        max_categories (int): Maximum number of distinct values of a category. Defaults to 1000.
+        max_category_ratio (float): Maximum ratio of distinct to non-null values of a category.
+            Defaults to 0.5.
+        date_ratio (float): Minimum share of non-null values that must parse as dates.
+            Defaults to 0.95.
+
+    Returns:
+        Dict[str, str]: The contract column type of every column.
+    """
+    schema = {}
+    for column in df.columns:
+        series = df[column]
+        values = series.dropna()
+        if pd.api.types.is_bool_dtype(series):
+            schema[column] = "bool"
+        elif pd.api.types.is_integer_dtype(series):
+            schema[column] = "int64"
+        elif pd.api.types.is_float_dtype(series):
+            if len(values) and ((values - values.round(2)).abs() < 1e-9).all():
+                schema[column] = "decimal({},{})".format(*DEFAULT_DECIMAL)
+            else:
+                schema[column] = "float64"
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            schema[column] = _date_or_timestamp(values)
+        else:
+            text = values.astype(str)
+            dates = pd.Series(dtype="datetime64[ns]")
+            if len(text) and text.str.match(_DATE_LIKE).mean() >= date_ratio:
+                dates = pd.to_datetime(text, errors="coerce", format="mixed")
+            if len(dates) and dates.notna().mean() >= date_ratio:
+                schema[column] = _date_or_timestamp(dates.dropna())
+            elif len(values) and (
+                values.nunique() <= max_categories
+                and values.nunique() <= max_category_ratio * len(values)
+            ):
+                schema[column] = "category"
+            else:
+                schema[column] = "string"
+    logger.info(f"Inferred schema: {schema}")
+    return schema
+
+
+def _date_or_timestamp(values: pd.Series) -> str:
+    """Returns 'date' if none of the datetime values has a time of day, else 'timestamp'."""
+    return "date" if (values == values.dt.normalize()).all() else "timestamp"
+
+
+def apply_schema(df: pd.DataFrame, schema: Dict[str, str]) -> pd.DataFrame:
+    """
+    Converts the columns of a DataFrame to the types of a schema contract.
+
+    Categories use pandas categoricals, and dates and decimals Arrow-backed columns, which
+    DuckDB loads as DATE and DECIMAL columns. Columns missing from the contract are left
+    unchanged.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to convert.
+        schema (Dict[str, str]): The contract column type of every column.
+
+    Returns:
+        pd.DataFrame: The converted DataFrame.
+
+    Raises:
+        ValueError: If a contract column is missing or cannot be converted.
+    """
+    missing = [column for column in schema if column not in df.columns]
+    if missing:
+        logger.error(f"Columns {missing} of the schema contract are missing.")
+        raise ValueError(f"Columns {missing} of the schema contract are missing.")
+
+    converted = {}
+    for column, schema_type in schema.items():
+        name, args = parse_schema_type(schema_type)
+        series = df[column]
+        try:
+            if name == "category":
+                converted[column] = series.astype("category")
+            elif name == "string":
+                converted[column] = series.astype("string")
+            elif name in ("date", "timestamp"):
+                series = pd.to_datetime(series, format="mixed")
+                if name == "date":
+                    series = series.astype(pd.ArrowDtype(pa.date32()))
+                converted[column] = series
+            elif name == "decimal":
+                precision, scale = args
+                if pd.api.types.is_float_dtype(series):
+                    series = series.round(scale)
+                converted[column] = series.astype(
+                    pd.ArrowDtype(pa.decimal128(precision, scale))
+                )
+            elif name.startswith("int"):
+                # Nullable integers, as missing values would otherwise force floats
+                converted[column] = series.astype(name.capitalize())
+            elif name == "bool":
+                converted[column] = series.astype("boolean")
+            else:
+                converted[column] = series.astype(name)
+        except (TypeError, ValueError, pa.ArrowException) as e:
+            logger.error(f"Column '{column}' does not match type {schema_type}: {e}")
+            raise ValueError(
+                f"Column '{column}' does not match type {schema_type}: {e}"
+            ) from e
+    df = df.copy(deep=False)
+    for column, series in converted.items():
+        df[column] = series
+    return df
+
+
+def duckdb_cast_projection(schema: Dict[str, str] | None) -> str:
+    """
+    Builds a SELECT list casting the columns of a schema contract to their DuckDB types.
+
+    Args:
+        schema (Dict[str, str] | None): The contract column type of every column.
+
+    Returns:
+        str: A `* REPLACE (...)` projection, or `*` if no column needs a cast.
+    """
+    casts = []
+    for column, schema_type in (schema or {}).items():
+        duckdb_type = to_duckdb_type(schema_type)
+        if duckdb_type:
+            identifier = '"' + str(column).replace('"', '""') + '"'
+            casts.append(f"CAST({identifier} AS {duckdb_type}) AS {identifier}")
+    return f"* REPLACE ({', '.join(casts)})" if casts else "*"
+
+
+def load_schema(schema: Dict[str, str] | str) -> Dict[str, str]:
+    """
+    Returns a schema contract given inline or as the path of a YAML file.
+
+    Args:
+        schema (Dict[str, str] | str): The contract, or the path of a YAML file holding it.
+
+    Returns:
+        Dict[str, str]: The contract column type of every column.
+
+    Raises:
+        ValueError: If the YAML file does not hold a schema contract.
+    """
+    if isinstance(schema, dict):
+        return schema
+    contract = read_yaml_to_dict(schema) if os.path.isfile(schema) else None
+    if not isinstance(contract, dict):
+        logger.error(f"No schema contract found in {schema}")
+        raise ValueError(f"No schema contract found in {schema}")
+    return contract
+
+
+def memory_savings(df: pd.DataFrame, schema: Dict[str, Any]) -> str:
+    """
+    Describes the memory saved by applying a schema contract to a DataFrame.
+
+    Args:
+        df (pd.DataFrame): The DataFrame as parsed.
+        schema (Dict[str, Any]): The contract column type of every column.
+
+    Returns:
+        str: The memory use before and after applying the contract.
+    """
+    before = df.memory_usage(deep=True).sum() / 1024**2
+    after = apply_schema(df, schema).memory_usage(deep=True).sum() / 1024**2
+    return f"{before:.2f} MB -> {after:.2f} MB"
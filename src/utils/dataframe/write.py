@@ -1,37 +1,113 @@
 """Common DataFrame write functions."""
 
-from io import BytesIO
+import csv
+import itertools
+import tempfile
+from io import BytesIO, StringIO
+from typing import IO, Iterable, Iterator, List, Tuple
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import xlsxwriter
 from loguru import logger
 
+# Compression codecs of the compressed CSV file types
+CSV_COMPRESSION = {"csv.gz": "gzip", "csv.zst": "zstd"}
+
+# Maximum number of rows of an Excel worksheet
+EXCEL_MAX_ROWS = 1_048_576
+
 
 def write_dataframe_to_file_buffer(
-    df: pd.DataFrame, file_type: str = "csv", **kwargs
-) -> BytesIO:
+    df: pd.DataFrame | pa.Table | pa.RecordBatchReader | Iterable[pd.DataFrame],
+    file_type: str = "csv",
+    file_buffer: IO[bytes] = None,
+    max_memory_mb: float = None,
+    chunk_rows: int = 100_000,
+    **kwargs,
+) -> IO[bytes]:
     """
-    Converts a pandas DataFrame into a file buffer (CSV or Excel).
+    Converts a pandas DataFrame or Arrow data into a file buffer.
+
+    Arrow tables are written to CSV by pyarrow directly, without a pandas conversion.
+    Parquet, Arrow IPC and compressed CSV files are written by pyarrow, and Excel files by
+    xlsxwriter in constant memory mode, `chunk_rows` rows at a time. Record batch readers
+    (e.g., from `select_table_to_record_batches`) and iterables of DataFrames are streamed,
+    so a large extract is never held in memory as a whole. The pandas index is only
+    written to CSV and Excel files. CSV headers are quoted like pandas does, only where
+    needed, whatever the input; pyarrow does however quote every string value, where
+    pandas only quotes values containing a delimiter, quote or line break.
 
     Args:
-        df (pd.DataFrame): The DataFrame to convert.
-        file_type (str, optional): The type of the file ('csv' or 'excel'). Defaults to 'csv'.
-        **kwargs: Additional arguments to pass to pandas DataFrame writing functions (e.g., index, header).
+        df (pd.DataFrame | pa.Table | pa.RecordBatchReader | Iterable[pd.DataFrame]): The data
+            to convert.
+        file_type (str, optional): The type of the file ('csv', 'csv.gz', 'csv.zst', 'parquet',
+            'arrow' or 'excel'). Defaults to 'csv'.
+        file_buffer (IO[bytes]): Binary file object to write to. Defaults to a new buffer.
+        max_memory_mb (float): Size in MB above which the new buffer is moved to a temporary
+            file on disk. Defaults to None (kept in memory).
+        chunk_rows (int): Number of rows converted at a time. Defaults to 100,000.
+        **kwargs: Additional arguments to pass to pandas DataFrame writing functions (e.g., index, header),
+            or to pyarrow.csv.write_csv for Arrow tables. For the other file types, these are
+            the arguments of pyarrow.csv.WriteOptions, pyarrow.parquet.ParquetWriter or
+            pyarrow.ipc.IpcWriteOptions, and for Excel files sheet_name, header and index.
 
     Returns:
-        BytesIO: An in-memory file-like object containing the DataFrame's content.
+        IO[bytes]: A file-like object containing the data, positioned at its start.
     """
     logger.info(f"Converting DataFrame to {file_type} format")
 
-    file_buffer = BytesIO()
+    if file_buffer is None:
+        if max_memory_mb:
+            file_buffer = tempfile.SpooledTemporaryFile(
+                max_size=int(max_memory_mb * 1024**2)
+            )
+        else:
+            file_buffer = BytesIO()
 
+    engine = kwargs.pop("engine", "xlsxwriter")
     try:
-        if file_type == "csv":
+        if file_type == "csv" and isinstance(df, pa.Table):
+            header, options = _split_csv_header(
+                df.schema.names, kwargs.pop("write_options", None)
+            )
+            file_buffer.write(header)
+            pa_csv.write_csv(df, file_buffer, options, **kwargs)
+        elif file_type == "csv" and isinstance(df, pd.DataFrame):
             df.to_csv(file_buffer, **kwargs)
+        elif file_type == "excel" and engine != "xlsxwriter":
+            if isinstance(df, pa.Table):
+                df = df.to_pandas(types_mapper=pd.ArrowDtype)
+            df.to_excel(file_buffer, engine=engine, **kwargs)
         elif file_type == "excel":
-            # df.to_excel(file_buffer, engine="xlsxwriter", **kwargs)
-            df.to_excel(
-                file_buffer, engine=kwargs.pop("engine", "xlsxwriter"), **kwargs
+            _write_excel(df, file_buffer, chunk_rows, **kwargs)
+        elif file_type == "csv" or file_type in CSV_COMPRESSION:
+            schema, batches = _iter_record_batches(df, chunk_rows)
+            header, options = _split_csv_header(
+                schema.names, pa_csv.WriteOptions(**kwargs)
             )
+            sink = pa.PythonFile(_KeepOpenFile(file_buffer), mode="w")
+            if file_type in CSV_COMPRESSION:
+                sink = pa.CompressedOutputStream(sink, CSV_COMPRESSION[file_type])
+            with sink:
+                sink.write(header)
+                with pa_csv.CSVWriter(sink, schema, write_options=options) as writer:
+                    for batch in batches:
+                        writer.write_batch(batch)
+        elif file_type == "parquet":
+            schema, batches = _iter_record_batches(df, chunk_rows)
+            kwargs.setdefault("compression", "zstd")
+            with pq.ParquetWriter(file_buffer, schema, **kwargs) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+        elif file_type in ("arrow", "ipc", "feather"):
+            schema, batches = _iter_record_batches(df, chunk_rows)
+            options = pa.ipc.IpcWriteOptions(**kwargs)
+            with pa.ipc.new_file(file_buffer, schema, options=options) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
 
@@ -43,3 +119,180 @@ def write_dataframe_to_file_buffer(
     except Exception as e:
         logger.error(f"Failed to convert DataFrame to {file_type} format: {e}")
         raise
+
+
+def _split_csv_header(
+    names: List[str], options: pa_csv.WriteOptions = None
+) -> Tuple[bytes, pa_csv.WriteOptions]:
+    """
+    Returns the CSV header line and the write options for the rows below it.
+
+    pyarrow quotes every column name, while pandas only quotes names that need it, so
+    the header is written like pandas does to give the same bytes for both inputs.
+    """
+    options = options or pa_csv.WriteOptions()
+    header = b""
+    if options.include_header:
+        line = StringIO()
+        writer = csv.writer(
+            line, delimiter=options.delimiter, lineterminator=options.eol
+        )
+        writer.writerow(names)
+        header = line.getvalue().encode()
+    rows_options = pa_csv.WriteOptions(
+        include_header=False,
+        batch_size=options.batch_size,
+        delimiter=options.delimiter,
+        eol=options.eol,
+        null_string=options.null_string,
+        quoting_style=options.quoting_style,
+    )
+    return header, rows_options
+
+
+def _iter_record_batches(
+    data: pd.DataFrame | pa.Table | pa.RecordBatchReader | Iterable[pd.DataFrame],
+    chunk_rows: int,
+) -> Tuple[pa.Schema, Iterator[pa.RecordBatch]]:
+    """
+    Returns the schema of the data and an iterator of its record batches.
+
+    DataFrames are converted `chunk_rows` rows at a time, with the schema of the whole
+    DataFrame (or of the first DataFrame of an iterable) so that all batches match.
+
+    Raises:
+        ValueError: If a column of a later DataFrame cannot be cast to the schema.
+    """
+    if isinstance(data, pa.Table):
+        return data.schema, iter(data.to_batches(max_chunksize=chunk_rows))
+    if isinstance(data, pa.RecordBatchReader):
+        return data.schema, iter(data)
+
+    if isinstance(data, pd.DataFrame):
+        frames = iter([data])
+    else:
+        frames = iter(data)
+    first = next(frames, None)
+    if first is None:
+        raise ValueError("No data to write.")
+    schema = pa.Schema.from_pandas(first, preserve_index=False)
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        for frame in itertools.chain([first], frames):
+            for start in range(0, len(frame), chunk_rows):
+                chunk = frame.iloc[start : start + chunk_rows]
+                yield from _cast_to_schema(chunk, schema).to_batches()
+
+    return schema, batches()
+
+
+def _cast_to_schema(frame: pd.DataFrame, schema: pa.Schema) -> pa.Table:
+    """
+    Converts a DataFrame to an Arrow table with the given schema.
+
+    Raises:
+        ValueError: If the columns differ from the schema or a column cannot be cast.
+    """
+    names = [str(column) for column in frame.columns]
+    if names != schema.names:
+        raise ValueError(
+            f"Columns {names} do not match the columns {schema.names} of the first DataFrame."
+        )
+    columns = []
+    for position, (name, field) in enumerate(zip(names, schema)):
+        try:
+            array = pa.array(frame.iloc[:, position], from_pandas=True)
+            columns.append(array.cast(field.type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            raise ValueError(
+                f"Column '{name}' cannot be converted to {field.type}: {e}"
+            ) from e
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _write_excel(
+    data: pd.DataFrame | pa.Table | pa.RecordBatchReader | Iterable[pd.DataFrame],
+    file_buffer: IO[bytes],
+    chunk_rows: int,
+    sheet_name: str = "Sheet1",
+    header: bool = True,
+    index: bool = True,
+) -> None:
+    """
+    Writes data to an Excel worksheet row by row with xlsxwriter in constant memory mode,
+    which flushes every row to a temporary file as soon as it is complete.
+
+    Raises:
+        ValueError: If the data does not fit in a worksheet.
+    """
+    if isinstance(data, pd.DataFrame) and index:
+        data = data.reset_index()
+    # Fail before writing anything when the number of rows is known up front
+    if isinstance(data, (pd.DataFrame, pa.Table)) and len(data) + header > EXCEL_MAX_ROWS:
+        raise ValueError(
+            f"Data does not fit in an Excel worksheet of {EXCEL_MAX_ROWS} rows."
+        )
+    schema, batches = _iter_record_batches(data, chunk_rows)
+
+    # Strings are written as text, never as formulas or links
+    workbook = xlsxwriter.Workbook(
+        file_buffer,
+        {
+            "constant_memory": True,
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+            "remove_timezone": True,
+            "nan_inf_to_errors": True,
+        },
+    )
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        date_format = workbook.add_format({"num_format": "yyyy-mm-dd"})
+        datetime_format = workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+        formats = [
+            (
+                datetime_format
+                if pa.types.is_timestamp(field.type)
+                else date_format if pa.types.is_date(field.type) else None
+            )
+            for field in schema
+        ]
+
+        row = 0
+        if header:
+            worksheet.write_row(row, 0, schema.names)
+            row += 1
+        for batch in batches:
+            if row + batch.num_rows > EXCEL_MAX_ROWS:
+                raise ValueError(
+                    f"Data does not fit in an Excel worksheet of {EXCEL_MAX_ROWS} rows."
+                )
+            columns = [column.to_pylist() for column in batch.columns]
+            for values in zip(*columns):
+                for col, (value, cell_format) in enumerate(zip(values, formats)):
+                    if value is not None:
+                        worksheet.write(row, col, value, cell_format)
+                row += 1
+    finally:
+        workbook.close()
+
+
+class _KeepOpenFile:
+    """Wraps a file object so that pyarrow streams closing it leave it open."""
+
+    def __init__(self, file_obj: IO[bytes]):
+        self._file_obj = file_obj
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        return self._file_obj.write(data)
+
+    def flush(self) -> None:
+        self._file_obj.flush()
+
+    def tell(self) -> int:
+        return self._file_obj.tell()
+
+    def close(self) -> None:
+        self.flush()
+        self.closed = True
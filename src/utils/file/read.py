@@ -1,7 +1,18 @@
+import os
+import threading
+from typing import Dict, Tuple
+
 import yaml
 from dotenv import load_dotenv
 from loguru import logger
 
+# Files up to this size are kept in memory by `read_file_to_string` (bytes)
+MAX_CACHED_FILE_SIZE = 1024 * 1024
+
+# Cached file contents keyed by absolute path, with the mtime and size they were read at
+_file_cache: Dict[str, Tuple[int, int, str]] = {}
+_file_cache_lock = threading.Lock()
+
 
 def read_yaml_to_dict(file_path: str) -> dict:
     """
@@ -25,12 +36,17 @@ def read_yaml_to_dict(file_path: str) -> dict:
             return None
 
 
-def read_file_to_string(file_path: str) -> str:
+def read_file_to_string(file_path: str, cache: bool = True) -> str:
     """
     Reads the content of a file and returns it as a string.
 
+    Small files (e.g. SQL queries run repeatedly by reporting jobs) are cached in memory
+    and only read again once their modification time or size changes.
+
     Args:
         file_path (str): Path to the file to be read.
+        cache (bool): Serve the content from the in-memory cache while the file is unchanged.
+            Defaults to True.
 
     Returns:
         str: Content of the file as a string, or None if the file is not found or another error occurs.
@@ -40,9 +56,20 @@ def read_file_to_string(file_path: str) -> str:
         Exception: For any other errors encountered while reading the file.
     """
     try:
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        if cache:
+            with _file_cache_lock:
+                cached = _file_cache.get(path)
+            if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                logger.debug(f"Reading {file_path} to string from cache")
+                return cached[2]
         logger.info(f"Reading {file_path} to string")
-        with open(file_path, "r", encoding="utf-8") as file:
+        with open(path, "r", encoding="utf-8") as file:
             file_content = file.read()
+        if cache and stat.st_size <= MAX_CACHED_FILE_SIZE:
+            with _file_cache_lock:
+                _file_cache[path] = (stat.st_mtime_ns, stat.st_size, file_content)
         return file_content
     except FileNotFoundError:
         logger.error(f"Error: The file at {file_path} was not found.")
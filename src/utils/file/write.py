@@ -1,23 +1,103 @@
+import hashlib
+import json
 import os
 import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
 
+import duckdb
+import yaml
 from loguru import logger
 
+from src.utils.cache import table_version_stamps
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl request cloning a file's extents (copy-on-write) on Btrfs, XFS and similar
+FICLONE = 0x40049409
+
+# Snapshots run one at a time in the background, in submission order
+_snapshot_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot")
+
+
+def write_dict_to_yaml(data, file_path):
+    """
+    Writes a dictionary to a YAML file, creating its directory if needed.
+
+    Args:
+        data (dict): The dictionary to write.
+        file_path (str): Path to the YAML file.
+
+    Returns:
+        str: The path to the written file.
+    """
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file_path, "w") as file:
+        yaml.safe_dump(data, file, sort_keys=False, allow_unicode=True)
+    logger.info(f"Wrote dictionary to {file_path}")
+    return file_path
+
 
 # todo: refactor
 # higher order function: write_file_to_{source}_as_{file_format}(connection_object, ...)
-def snapshot_file(file_path, snapshot_dir):
+def snapshot_file(
+    file_path,
+    snapshot_dir,
+    mode="copy",
+    keep=None,
+    max_age_days=None,
+    verify=False,
+    background=False,
+    con=None,
+):
     """
     Copies a file to the specified snapshot directory.
     If the directory does not exist, it is created.
 
+    In 'copy' mode the file is cloned copy-on-write where the filesystem supports it
+    (reflink), which is instant and shares unchanged blocks, and copied otherwise. In
+    'parquet' mode the file must be a DuckDB database: only the tables changed since
+    the previous snapshot are exported as zstd Parquet, unchanged ones are hard-linked
+    from the previous snapshot.
+
+    With `keep` or `max_age_days`, every snapshot gets a timestamped name and older
+    snapshots are rotated out; otherwise the copy replaces the previous one.
+
     Args:
         file_path (str): The path to the file to be copied.
         snapshot_dir (str): The directory where the file will be copied.
+        mode (str): 'copy' or 'parquet'. Defaults to 'copy'.
+        keep (int): Number of snapshots to keep. Defaults to None (no limit).
+        max_age_days (float): Delete snapshots older than this many days. Defaults to None.
+        verify (bool): Verify the snapshot against SHA-256 checksums (or row counts in
+            'parquet' mode) and record the checksums. Defaults to False.
+        background (bool): Run the snapshot in a background thread. Defaults to False.
+        con (duckdb.DuckDBPyConnection): Open connection to the database, used in 'parquet'
+            mode when the file is already opened by this process. Defaults to None.
 
     Returns:
-        str: The path to the copied file.
+        str: The path to the copied file (or snapshot directory in 'parquet' mode), or a
+            Future resolving to it if `background` is set.
     """
+    if background:
+        logger.info(f"Scheduling background snapshot of file: {file_path}")
+        future: Future = _snapshot_executor.submit(
+            snapshot_file,
+            file_path,
+            snapshot_dir,
+            mode,
+            keep,
+            max_age_days,
+            verify,
+            False,
+            con,
+        )
+        return future
 
     logger.info(f"Starting snapshot of file: {file_path} to directory: {snapshot_dir}")
 
@@ -35,10 +115,282 @@ def snapshot_file(file_path, snapshot_dir):
 
     # Get the base name of the file (e.g., dev.duckdb)
     file_name = os.path.basename(file_path)
-    destination_path = os.path.join(snapshot_dir, file_name)
+    stem, extension = os.path.splitext(file_name)
+    rotate = keep is not None or max_age_days is not None
+    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
 
-    # Copy the file to the snapshot directory
-    shutil.copy2(file_path, destination_path)
+    if mode == "parquet":
+        destination_path = os.path.join(snapshot_dir, f"{stem}-{timestamp}")
+        previous = _latest_snapshot(snapshot_dir, stem, directories=True)
+        export_changed_tables(file_path, destination_path, previous, verify, con)
+    elif mode == "copy":
+        if rotate:
+            file_name = f"{stem}-{timestamp}{extension}"
+        destination_path = os.path.join(snapshot_dir, file_name)
+        # A WAL or checksum left by a previous snapshot would be replayed or misreport
+        for sidecar_path in (f"{destination_path}.wal", f"{destination_path}.sha256"):
+            if os.path.isfile(sidecar_path):
+                os.remove(sidecar_path)
+        _clone_file(file_path, destination_path)
+        # Uncheckpointed changes live in the write-ahead log next to the database
+        if os.path.isfile(f"{file_path}.wal"):
+            _clone_file(f"{file_path}.wal", f"{destination_path}.wal")
+        if verify:
+            _verify_copy(file_path, destination_path)
+    else:
+        raise ValueError(f"Unsupported snapshot mode: {mode}")
     logger.info(f"File copied successfully to {destination_path}")
 
+    if rotate:
+        rotate_snapshots(snapshot_dir, stem, keep, max_age_days)
     return destination_path
+
+
+def _clone_file(source_path, destination_path):
+    """
+    Clones a file copy-on-write with a reflink, falling back to a regular copy.
+
+    Args:
+        source_path (str): The path of the file to clone.
+        destination_path (str): The path of the clone.
+
+    Returns:
+        bool: True if the file was reflinked, False if it was copied.
+    """
+    if fcntl is None:
+        shutil.copy2(source_path, destination_path)
+        return False
+    try:
+        with open(source_path, "rb") as source, open(destination_path, "wb") as dest:
+            fcntl.ioctl(dest.fileno(), FICLONE, source.fileno())
+        shutil.copystat(source_path, destination_path)
+        logger.info(f"Reflinked {source_path} to {destination_path}")
+        return True
+    except OSError:
+        shutil.copy2(source_path, destination_path)
+        return False
+
+
+def file_checksum(file_path, chunk_size=8 * 1024 * 1024):
+    """
+    Computes the SHA-256 checksum of a file.
+
+    Args:
+        file_path (str): The path to the file.
+        chunk_size (int): Number of bytes read at a time. Defaults to 8 MB.
+
+    Returns:
+        str: The hexadecimal checksum.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _verify_copy(source_path, destination_path):
+    """
+    Verifies a copied file against the checksum of its source and records the checksum.
+
+    Args:
+        source_path (str): The path to the source file.
+        destination_path (str): The path to the copy.
+
+    Returns:
+        None
+
+    Raises:
+        IOError: If the checksums differ.
+    """
+    checksum = file_checksum(destination_path)
+    if checksum != file_checksum(source_path):
+        os.remove(destination_path)
+        logger.error(f"Checksum mismatch for snapshot {destination_path}, removed.")
+        raise IOError(f"Checksum mismatch for snapshot {destination_path}")
+    with open(f"{destination_path}.sha256", "w") as file:
+        file.write(f"{checksum}  {os.path.basename(destination_path)}\n")
+    logger.info(f"Verified snapshot {destination_path} (sha256 {checksum[:12]})")
+
+
+def export_changed_tables(
+    db_file, snapshot_path, previous_path=None, verify=False, con=None
+):
+    """
+    Exports the tables of a DuckDB database as zstd Parquet files, one per table.
+
+    Tables whose version stamp matches the previous snapshot are hard-linked from it
+    instead of being exported again. Tables not versioned by the DuckDB connector, e.g.
+    created by dbt, are always exported. A `manifest.json` records the file, version stamp,
+    row count and checksum of every table.
+
+    Args:
+        db_file (str): The path to the DuckDB database file.
+        snapshot_path (str): The directory of the new snapshot.
+        previous_path (str): The directory of the previous snapshot. Defaults to None.
+        verify (bool): Check the row count of every exported file and record its SHA-256
+            checksum. Defaults to False.
+        con (duckdb.DuckDBPyConnection): Open connection to the database. Defaults to None,
+            which opens the file read-only.
+
+    Returns:
+        dict: The manifest of the snapshot.
+
+    Raises:
+        IOError: If an exported file does not have the row count of its table.
+    """
+    own_connection = con is None
+    if own_connection:
+        con = duckdb.connect(db_file, read_only=True)
+    else:
+        # Exports from a background thread must not share the caller's connection state
+        con = con.cursor()
+    try:
+        previous = {}
+        if previous_path and os.path.isfile(
+            os.path.join(previous_path, "manifest.json")
+        ):
+            with open(os.path.join(previous_path, "manifest.json")) as file:
+                previous = json.load(file)["tables"]
+
+        tables = con.execute(
+            """
+            SELECT database_name, schema_name, table_name FROM duckdb_tables()
+            WHERE NOT internal
+            """
+        ).fetchall()
+        stamps = table_version_stamps(con, [".".join(table) for table in tables])
+        os.makedirs(snapshot_path, exist_ok=True)
+
+        manifest = {"database": os.path.abspath(db_file), "tables": {}}
+        exported = 0
+        for database, schema, table in tables:
+            name = f"{schema}.{table}"
+            stamp = list(stamps.get(f"{database}.{name}", ()))
+            file_name = f"{name}.parquet"
+            path = os.path.join(snapshot_path, file_name)
+            entry = previous.get(name)
+            # Only tables versioned by the DuckDB connector are trusted to be unchanged
+            if entry and stamp and stamp[1] > 0 and entry["stamp"] == stamp:
+                _link_or_copy(os.path.join(previous_path, entry["file"]), path)
+                manifest["tables"][name] = entry
+                continue
+
+            identifier = ".".join(
+                '"' + part.replace('"', '""') + '"' for part in (schema, table)
+            )
+            literal = "'" + path.replace("'", "''") + "'"
+            con.execute(
+                f"COPY {identifier} TO {literal} (FORMAT parquet, COMPRESSION zstd)"
+            )
+            rows = con.execute(f"SELECT count(*) FROM {identifier}").fetchone()[0]
+            entry = {"file": file_name, "stamp": stamp, "rows": rows}
+            if verify:
+                written = con.execute(
+                    "SELECT count(*) FROM read_parquet(?)", [path]
+                ).fetchone()[0]
+                if written != rows:
+                    raise IOError(
+                        f"Snapshot of table {name} has {written} of {rows} rows"
+                    )
+                entry["sha256"] = file_checksum(path)
+            manifest["tables"][name] = entry
+            exported += 1
+
+        with open(os.path.join(snapshot_path, "manifest.json"), "w") as file:
+            json.dump(manifest, file, indent=2)
+        logger.info(
+            f"Exported {exported} changed tables, linked {len(tables) - exported} "
+            f"unchanged tables to {snapshot_path}"
+        )
+        return manifest
+    except Exception:
+        shutil.rmtree(snapshot_path, ignore_errors=True)
+        logger.error(f"Snapshot of {db_file} to {snapshot_path} failed, removed.")
+        raise
+    finally:
+        con.close()
+
+
+def _link_or_copy(source_path, destination_path):
+    """Hard-links an immutable snapshot file, copying it if linking is not possible."""
+    try:
+        os.link(source_path, destination_path)
+    except OSError:
+        shutil.copy2(source_path, destination_path)
+
+
+def _list_snapshots(snapshot_dir, stem, directories=False):
+    """
+    Lists the timestamped snapshots of a file, oldest first.
+
+    Args:
+        snapshot_dir (str): The snapshot directory.
+        stem (str): The file name without extension (e.g., dev).
+        directories (bool): List 'parquet' mode snapshot directories. Defaults to False.
+
+    Returns:
+        list: Tuples of the creation time and path of every snapshot.
+    """
+    prefix = f"{stem}-"
+    snapshots = []
+    for entry in os.scandir(snapshot_dir):
+        if (
+            not entry.name.startswith(prefix)
+            or entry.is_dir() != directories
+            or entry.name.endswith((".wal", ".sha256"))
+        ):
+            continue
+        try:
+            created = datetime.strptime(
+                entry.name[len(prefix) : len(prefix) + 21], "%Y%m%dT%H%M%S%f"
+            )
+        except ValueError:
+            # Not a snapshot, e.g. a snapshot of another file sharing the prefix
+            continue
+        snapshots.append((created, entry.path))
+    return sorted(snapshots)
+
+
+def _latest_snapshot(snapshot_dir, stem, directories=False):
+    snapshots = _list_snapshots(snapshot_dir, stem, directories)
+    return snapshots[-1][1] if snapshots else None
+
+
+def rotate_snapshots(snapshot_dir, stem, keep=None, max_age_days=None):
+    """
+    Deletes the oldest snapshots of a file beyond a count or age limit.
+
+    The most recent snapshot is always kept.
+
+    Args:
+        snapshot_dir (str): The snapshot directory.
+        stem (str): The file name without extension (e.g., dev).
+        keep (int): Number of snapshots to keep. Defaults to None (no limit).
+        max_age_days (float): Delete snapshots older than this many days. Defaults to None.
+
+    Returns:
+        list: The paths of the deleted snapshots.
+    """
+    snapshots = sorted(
+        _list_snapshots(snapshot_dir, stem)
+        + _list_snapshots(snapshot_dir, stem, directories=True)
+    )
+    expired = [path for _, path in snapshots[:-keep]] if keep else []
+    if max_age_days is not None:
+        cutoff = datetime.now() - timedelta(days=max_age_days)
+        expired += [
+            path
+            for created, path in snapshots[:-1]
+            if created < cutoff and path not in expired
+        ]
+
+    for path in expired:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            for suffix in ("", ".wal", ".sha256"):
+                if os.path.exists(f"{path}{suffix}"):
+                    os.remove(f"{path}{suffix}")
+        logger.info(f"Removed expired snapshot {path}")
+    return expired
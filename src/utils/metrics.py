@@ -0,0 +1,315 @@
+"""Per-stage timing and size metrics for the ingest pipeline."""
+
+import functools
+import inspect
+import os
+import platform
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterator, List
+
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+# Table the current thread is ingesting, attached to every record it produces
+current_table: ContextVar[str | None] = ContextVar("current_table", default=None)
+
+# Records are only kept while a `collect_metrics` block is active
+_records: List[Dict] = []
+_records_lock = threading.Lock()
+_collecting = 0
+
+
+def reset_peak_rss() -> None:
+    """
+    Resets the peak resident set size of the process (Linux only).
+
+    Returns:
+        None
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    """
+    Returns the peak resident set size of the process in MB.
+
+    Returns:
+        float: The peak RSS since start-up or since the last `reset_peak_rss`.
+    """
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in KB on Linux and bytes on macOS, and never resets
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / 1024**2 if platform.system() == "Darwin" else max_rss / 1024
+
+
+def measure_size(data: Any) -> Dict[str, int]:
+    """
+    Returns the number of rows and bytes of a DataFrame, Arrow table or byte stream.
+
+    Args:
+        data (Any): The data to measure.
+
+    Returns:
+        Dict[str, int]: A dictionary with 'rows' and/or 'bytes' keys, empty for other types.
+    """
+    if isinstance(data, pd.DataFrame):
+        return {"rows": len(data), "bytes": int(data.memory_usage(deep=False).sum())}
+    if isinstance(data, pa.Table):
+        return {"rows": data.num_rows, "bytes": data.nbytes}
+    if isinstance(data, BytesIO):
+        return {"bytes": data.getbuffer().nbytes}
+    if hasattr(data, "seek") and hasattr(data, "tell"):
+        position = data.tell()
+        size = data.seek(0, os.SEEK_END)
+        data.seek(position)
+        return {"bytes": size}
+    return {}
+
+
+@contextmanager
+def table_context(table_name: str) -> Iterator[None]:
+    """
+    Attributes the metrics recorded inside the block to a table.
+
+    Args:
+        table_name (str): The name of the table being ingested.
+    """
+    token = current_table.set(table_name)
+    try:
+        yield
+    finally:
+        current_table.reset(token)
+
+
+@contextmanager
+def track(stage: str, table_name: str = None, **fields) -> Iterator[Dict]:
+    """
+    Records the duration and peak memory of a pipeline stage.
+
+    The yielded record can be updated with 'rows' and 'bytes' inside the block. Peak
+    memory is the process peak RSS during the block, so concurrent stages share it.
+
+    Args:
+        stage (str): The stage name (e.g., 'download', 'parse', 'load').
+        table_name (str): The table the stage belongs to. Defaults to the current table context.
+        **fields: Additional fields stored with the record.
+
+    Yields:
+        Dict: The record, appended to the collected metrics when the block exits inside a
+            `collect_metrics` block.
+    """
+    record = {
+        "stage": stage,
+        "table_name": table_name or current_table.get(),
+        "started_at": datetime.now(timezone.utc),
+        "rows": None,
+        "bytes": None,
+        **fields,
+    }
+    start = time.perf_counter()
+    try:
+        yield record
+        record["status"] = "success"
+    except Exception:
+        record["status"] = "failed"
+        raise
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        record["peak_rss_mb"] = peak_rss_mb()
+        with _records_lock:
+            if _collecting:
+                _records.append(record)
+
+
+def instrument(
+    stage: str, table_arg: str = None, data_arg: str = None
+) -> Callable[[Callable], Callable]:
+    """
+    Decorator recording the duration, rows, bytes and peak memory of every call.
+
+    Rows and bytes are measured on the return value, or on the `data_arg` argument
+    when the function consumes data instead of returning it.
+
+    Args:
+        stage (str): The stage name (e.g., 'download', 'parse', 'load').
+        table_arg (str): Name of the argument holding the table name. Defaults to None.
+        data_arg (str): Name of the argument holding the data to measure. Defaults to None.
+
+    Returns:
+        Callable[[Callable], Callable]: The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            table_name = arguments.get(table_arg) if table_arg else None
+            with track(stage, table_name) as record:
+                result = func(*args, **kwargs)
+                measured = arguments.get(data_arg) if data_arg else result
+                record.update(measure_size(measured))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def collect_metrics() -> Iterator[None]:
+    """
+    Collects the metrics recorded inside the block, e.g. by an ingest run, in all threads.
+
+    The metrics of a previous collection are discarded when the outermost block starts
+    and kept after it ends until the next one. Outside such a block nothing is recorded,
+    so instrumented functions called by long-running processes do not accumulate metrics.
+
+    Yields:
+        None
+    """
+    global _collecting
+    with _records_lock:
+        if not _collecting:
+            _records.clear()
+        _collecting += 1
+    try:
+        yield
+    finally:
+        with _records_lock:
+            _collecting -= 1
+
+
+def get_metrics() -> List[Dict]:
+    """
+    Returns a copy of the metrics recorded since the last reset.
+
+    Returns:
+        List[Dict]: The recorded stage metrics.
+    """
+    with _records_lock:
+        return list(_records)
+
+
+def reset_metrics() -> None:
+    """
+    Discards all recorded metrics.
+
+    Returns:
+        None
+    """
+    with _records_lock:
+        _records.clear()
+
+
+def summarize_metrics(records: List[Dict]) -> pd.DataFrame:
+    """
+    Aggregates stage metrics per table and stage.
+
+    Args:
+        records (List[Dict]): The recorded stage metrics.
+
+    Returns:
+        pd.DataFrame: Calls, total seconds, rows, bytes and peak RSS per table and stage.
+    """
+    if not records:
+        return pd.DataFrame()
+    df = pd.DataFrame(records)
+    df["table_name"] = df["table_name"].fillna("")
+    return (
+        df.groupby(["table_name", "stage"])
+        .agg(
+            calls=("seconds", "size"),
+            seconds=("seconds", "sum"),
+            rows=("rows", "sum"),
+            bytes=("bytes", "sum"),
+            peak_rss_mb=("peak_rss_mb", "max"),
+        )
+        .reset_index()
+    )
+
+
+def write_prometheus_textfile(records: List[Dict], path: str) -> None:
+    """
+    Writes aggregated stage metrics in the Prometheus text format.
+
+    The file is written atomically, as expected by the node_exporter textfile collector.
+
+    Args:
+        records (List[Dict]): The recorded stage metrics.
+        path (str): The path of the .prom file.
+
+    Returns:
+        None
+    """
+    summary = summarize_metrics(records)
+    metrics = {
+        "ingest_stage_seconds": ("seconds", "Time spent in the stage"),
+        "ingest_stage_rows": ("rows", "Rows processed by the stage"),
+        "ingest_stage_bytes": ("bytes", "Bytes processed by the stage"),
+        "ingest_stage_peak_rss_mb": ("peak_rss_mb", "Peak process RSS during the stage"),
+    }
+    lines = []
+    for name, (column, help_text) in metrics.items():
+        lines += [f"# HELP {name} {help_text}.", f"# TYPE {name} gauge"]
+        for row in summary.itertuples(index=False):
+            value = getattr(row, column)
+            if pd.notna(value):
+                labels = f'stage="{row.stage}",table="{row.table_name}"'
+                lines.append(f"{name}{{{labels}}} {value}")
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as file:
+        file.write("\n".join(lines) + "\n")
+    os.replace(temp_path, path)
+    logger.info(f"Wrote ingest metrics to Prometheus textfile {path}")
+
+
+def export_to_opentelemetry(records: List[Dict]) -> None:
+    """
+    Records stage metrics with the globally configured OpenTelemetry meter provider.
+
+    Requires the optional `opentelemetry-api` package; exporting is up to the configured
+    provider.
+
+    Args:
+        records (List[Dict]): The recorded stage metrics.
+
+    Returns:
+        None
+    """
+    try:
+        from opentelemetry import metrics
+    except ImportError:
+        logger.error("opentelemetry-api is not installed, skipping metrics export.")
+        raise
+
+    meter = metrics.get_meter("src.connectors.ingest")
+    duration = meter.create_histogram("ingest.stage.duration", unit="s")
+    rows = meter.create_counter("ingest.stage.rows")
+    size = meter.create_counter("ingest.stage.bytes", unit="By")
+    for record in records:
+        attributes = {"stage": record["stage"], "table": record["table_name"] or ""}
+        duration.record(record["seconds"], attributes)
+        if record.get("rows"):
+            rows.add(record["rows"], attributes)
+        if record.get("bytes"):
+            size.add(record["bytes"], attributes)
@@ -0,0 +1,111 @@
+"""Tests of the query result cache."""
+
+import duckdb
+import pandas as pd
+import pytest
+
+from src.connectors.duck import (append_table, bump_table_version,
+                                 create_table, select_table_to_dataframe)
+from src.utils.cache import QueryCache, cached_query
+
+
+@pytest.fixture
+def con() -> duckdb.DuckDBPyConnection:
+    with duckdb.connect() as con:
+        create_table(con, pd.DataFrame({"id": [1, 2], "amount": [10, 20]}), "costs")
+        create_table(con, pd.DataFrame({"id": [1, 2], "name": ["a", "b"]}), "centres")
+        yield con
+
+
+class CountingQuery:
+    """Runs a query on a connection and counts how often it actually ran."""
+
+    def __init__(self, con: duckdb.DuckDBPyConnection, sql: str):
+        self.con = con
+        self.sql = sql
+        self.runs = 0
+
+    def __call__(self) -> pd.DataFrame:
+        self.runs += 1
+        return self.con.execute(self.sql).df()
+
+    def cached(self, cache: QueryCache) -> pd.DataFrame:
+        return cached_query(self.con, self.sql, self, cache)
+
+
+def test_repeated_query_is_served_from_cache(con):
+    cache = QueryCache()
+    query = CountingQuery(con, "SELECT sum(amount) AS total FROM costs")
+
+    first = query.cached(cache)
+    second = query.cached(cache)
+
+    assert query.runs == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_cache_is_invalidated_when_dependent_table_changes(con):
+    cache = QueryCache()
+    query = CountingQuery(
+        con,
+        """
+        SELECT name, sum(amount) AS total
+        FROM costs JOIN centres USING (id)
+        GROUP BY name ORDER BY name
+        """,
+    )
+    query.cached(cache)
+
+    append_table(con, pd.DataFrame({"id": [1], "amount": [5]}), "costs")
+    after_append = query.cached(cache)
+    create_table(con, pd.DataFrame({"id": [1, 2], "name": ["x", "b"]}), "centres")
+    after_replace = query.cached(cache)
+
+    assert query.runs == 3
+    assert after_append["total"].tolist() == [15, 20]
+    assert after_replace["name"].tolist() == ["b", "x"]
+
+
+def test_direct_writes_need_a_version_bump(con):
+    cache = QueryCache()
+    query = CountingQuery(con, "SELECT count(*) AS rows FROM costs")
+    query.cached(cache)
+
+    con.execute("INSERT INTO costs VALUES (3, 30)")
+    bump_table_version(con, "costs")
+
+    assert query.cached(cache)["rows"].tolist() == [3]
+    assert query.runs == 2
+
+
+def test_file_reads_are_not_cached(con, tmp_path):
+    path = str(tmp_path / "costs.parquet")
+    con.execute(f"COPY costs TO '{path}' (FORMAT parquet)")
+    cache = QueryCache()
+    query = CountingQuery(con, f"SELECT count(*) FROM read_parquet('{path}')")
+
+    query.cached(cache)
+    query.cached(cache)
+
+    assert query.runs == 2
+
+
+def test_same_table_in_other_database_is_not_shared(tmp_path):
+    cache = QueryCache()
+    results = []
+    for name, rows in [("dev", 1), ("prod", 2)]:
+        with duckdb.connect(str(tmp_path / f"{name}.duckdb")) as con:
+            create_table(con, pd.DataFrame({"x": range(rows)}), "costs")
+            query = CountingQuery(con, "SELECT count(*) AS rows FROM costs")
+            results.append(query.cached(cache)["rows"].tolist())
+
+    assert results == [[1], [2]]
+
+
+def test_select_table_to_dataframe_with_cache_sees_new_data(con):
+    first = select_table_to_dataframe(con, "costs", cache=True)
+    append_table(con, pd.DataFrame({"id": [3], "amount": [30]}), "costs")
+    second = select_table_to_dataframe(con, "costs", cache=True)
+
+    assert len(first) == 2
+    assert len(second) == 3
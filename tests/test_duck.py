@@ -0,0 +1,246 @@
+"""Tests of the DuckDB connector on in-memory databases."""
+
+import os
+
+import duckdb
+import openpyxl
+import pandas as pd
+import pytest
+
+from src.connectors.duck import (build_select_query, create_table,
+                                 export_table_to_lake, load_file_to_table,
+                                 select_table_to_dataframe, staged_swap,
+                                 staging_table_name, swap_staging_tables)
+
+
+@pytest.fixture
+def con() -> duckdb.DuckDBPyConnection:
+    with duckdb.connect() as con:
+        yield con
+
+
+def test_load_excel_widens_types_of_later_batches(con, tmp_path):
+    path = str(tmp_path / "costs.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Amount", "Comment"])
+    for row in [(1, None), (2, None), (2.5, "late"), (4, None)]:
+        sheet.append(row)
+    workbook.save(path)
+
+    load_file_to_table(con, path, "costs", "excel", batch_rows=2)
+
+    types = {row[0]: row[1] for row in con.sql("DESCRIBE costs").fetchall()}
+    assert types == {"Amount": "DOUBLE", "Comment": "VARCHAR"}
+    assert con.sql("SELECT * FROM costs").fetchall() == [
+        (1.0, None),
+        (2.0, None),
+        (2.5, "late"),
+        (4.0, None),
+    ]
+
+
+def test_load_excel_with_schema_keeps_contract_types(con, tmp_path):
+    path = str(tmp_path / "costs.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Amount"])
+    for value in [1, 2, 2.25]:
+        sheet.append([value])
+    workbook.save(path)
+
+    load_file_to_table(
+        con, path, "costs", "excel", schema={"Amount": "decimal(18,2)"}, batch_rows=2
+    )
+
+    amounts = con.sql("SELECT Amount, typeof(Amount) FROM costs").fetchall()
+    assert [(float(amount), amount_type) for amount, amount_type in amounts] == [
+        (1.0, "DECIMAL(18,2)"),
+        (2.0, "DECIMAL(18,2)"),
+        (2.25, "DECIMAL(18,2)"),
+    ]
+
+
+def test_export_table_to_lake_reads_back_through_view(con, tmp_path):
+    con.execute(
+        """
+        CREATE TABLE costs AS
+        SELECT * FROM (VALUES ('2023-05-01', 1.5), ('2024-02-01', 2.5), (NULL, 3.5))
+            AS t("Cost Date", Amount)
+        """
+    )
+
+    directory = export_table_to_lake(
+        con, "costs", str(tmp_path), partition_by=["year(Cost Date)"]
+    )
+    rows = con.sql(
+        'SELECT "Cost Date", Amount, "Cost Date_year" FROM costs_lake ORDER BY Amount'
+    ).fetchall()
+
+    assert os.path.isdir(directory)
+    assert rows == [
+        ("2023-05-01", 1.5, 2023),
+        ("2024-02-01", 2.5, 2024),
+        (None, 3.5, None),
+    ]
+
+    con.execute("DELETE FROM costs WHERE Amount > 2")
+    export_table_to_lake(con, "costs", str(tmp_path), partition_by=["year(Cost Date)"])
+
+    assert con.sql("SELECT count(*) FROM costs_lake").fetchone() == (1,)
+
+
+def test_export_empty_table_to_lake_creates_typed_view(con, tmp_path):
+    con.execute('CREATE TABLE costs ("Cost Date" DATE, Amount DOUBLE)')
+
+    export_table_to_lake(con, "costs", str(tmp_path), partition_by=["year(Cost Date)"])
+
+    assert con.sql("SELECT count(*) FROM costs_lake").fetchone() == (0,)
+    assert [row[:2] for row in con.sql("DESCRIBE costs_lake").fetchall()] == [
+        ("Cost Date", "DATE"),
+        ("Amount", "DOUBLE"),
+        ("Cost Date_year", "BIGINT"),
+    ]
+
+
+def table_names(con) -> list:
+    return sorted(row[0] for row in con.sql("SHOW TABLES").fetchall())
+
+
+def test_staged_swap_publishes_tables_together(con):
+    create_table(con, pd.DataFrame({"x": [1]}), "costs")
+    create_table(con, pd.DataFrame({"x": [1]}), "budgets")
+
+    with staged_swap(con):
+        create_table(con, pd.DataFrame({"x": [2, 2]}), "costs")
+        create_table(con, pd.DataFrame({"x": [3, 3, 3]}), "budgets")
+        # Readers keep seeing the live tables until the block exits
+        assert con.sql("SELECT count(*) FROM costs").fetchone() == (1,)
+
+    assert con.sql("SELECT count(*) FROM costs").fetchone() == (2,)
+    assert con.sql("SELECT count(*) FROM budgets").fetchone() == (3,)
+    assert table_names(con) == ["_table_versions", "budgets", "costs"]
+
+
+def test_staged_swap_rolls_back_after_failed_load(con):
+    create_table(con, pd.DataFrame({"x": [1]}), "costs")
+
+    with pytest.raises(ValueError):
+        with staged_swap(con):
+            create_table(con, pd.DataFrame({"x": [2, 2]}), "costs")
+            raise ValueError("Simulated failed load")
+
+    assert con.sql("SELECT x FROM costs").fetchall() == [(1,)]
+    assert table_names(con) == ["_table_versions", "costs"]
+
+
+def test_swap_staging_tables_is_atomic(con):
+    create_table(con, pd.DataFrame({"x": [1]}), "costs")
+    create_table(con, pd.DataFrame({"x": [1]}), "budgets")
+    con.execute(f"CREATE TABLE {staging_table_name('costs')} AS SELECT 2 AS x")
+
+    # The staging table of budgets is missing, so the whole swap is rolled back
+    with pytest.raises(duckdb.CatalogException):
+        swap_staging_tables(con, ["costs", "budgets"])
+
+    assert con.sql("SELECT x FROM costs").fetchall() == [(1,)]
+    assert con.sql("SELECT x FROM budgets").fetchall() == [(1,)]
+
+
+NESTED_RECORDS = [
+    {"id": "a", "owner": {"name": "Ann", "email": None}, "tags": ["x", "y"]},
+    {"id": "b", "owner": {"name": "Bob", "email": "bob@example.com"}, "tags": []},
+]
+
+
+def test_create_table_loads_nested_records_as_json(con):
+    create_table(con, iter(NESTED_RECORDS), "files")
+
+    rows = con.sql(
+        """
+        SELECT data->>'id', data->'owner'->>'name', json_array_length(data->'tags')
+        FROM files ORDER BY 1
+        """
+    ).fetchall()
+
+    assert rows == [("a", "Ann", 2), ("b", "Bob", 0)]
+
+
+def test_create_table_flattens_nested_records(con):
+    create_table(con, NESTED_RECORDS, "files", flatten=True)
+
+    rows = con.sql(
+        "SELECT id, owner.name, owner.email, tags FROM files ORDER BY id"
+    ).fetchall()
+
+    assert rows == [
+        ("a", "Ann", None, ["x", "y"]),
+        ("b", "Bob", "bob@example.com", []),
+    ]
+
+
+def test_create_table_loads_single_dictionary(con):
+    create_table(con, {"id": "a", "size": {"bytes": 10}}, "file")
+
+    assert con.sql("SELECT data->'size'->>'bytes' FROM file").fetchall() == [("10",)]
+
+
+@pytest.fixture
+def costs(con) -> duckdb.DuckDBPyConnection:
+    con.execute(
+        """
+        CREATE TABLE costs AS
+        SELECT * FROM (VALUES
+            ('PJ01', DATE '2024-01-15', 10.0),
+            ('PJ01', DATE '2024-04-01', 20.0),
+            ('PJ02', DATE '2024-02-01', 30.0),
+            (NULL, DATE '2024-03-01', 40.0)
+        ) AS t("Project ID", "Cost Date", Amount)
+        """
+    )
+    return con
+
+
+def test_select_table_to_dataframe_applies_filters(costs):
+    df = select_table_to_dataframe(
+        costs,
+        "costs",
+        columns=["Project ID", "Amount"],
+        filters={
+            "Project ID": ["PJ01", "PJ02"],
+            "Cost Date": ("2024-01-01", "2024-03-31"),
+        },
+        order_by=[("Amount", "DESC")],
+    )
+
+    assert list(df.columns) == ["Project ID", "Amount"]
+    assert df.values.tolist() == [["PJ02", 30.0], ["PJ01", 10.0]]
+
+
+def test_select_table_to_dataframe_filters_nulls_and_limits(costs):
+    missing = select_table_to_dataframe(costs, "costs", filters={"Project ID": None})
+    limited = select_table_to_dataframe(
+        costs, "costs", filters="Amount > 15", order_by="Amount", limit=2
+    )
+
+    assert missing["Amount"].tolist() == [40.0]
+    assert limited["Amount"].tolist() == [20.0, 30.0]
+
+
+def test_select_table_to_dataframe_streams_batches(costs):
+    batches = select_table_to_dataframe(
+        costs, "costs", columns=["Amount"], order_by="Amount", batch_size=3
+    )
+
+    frames = list(batches)
+    assert [len(frame) for frame in frames] == [3, 1]
+    assert pd.concat(frames)["Amount"].tolist() == [10.0, 20.0, 30.0, 40.0]
+
+
+def test_build_select_query_binds_filter_values():
+    query, params = build_select_query(
+        "costs", filters={"Project ID": "PJ01'; DROP TABLE costs; --"}
+    )
+
+    assert query == 'SELECT * FROM costs WHERE "Project ID" = ?'
+    assert params == ["PJ01'; DROP TABLE costs; --"]
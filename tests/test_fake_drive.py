@@ -0,0 +1,34 @@
+"""Tests of the in-process fake Drive service used by the benchmarks."""
+
+from src.benchmarks.fake_drive import FakeDriveService
+
+
+def test_name_contains_matches_word_prefixes():
+    drive = FakeDriveService()
+    folder = drive.add_folder("data")
+    for name in ["PCS_2024.csv", "old PCS_2023.csv", "xPCS_2022.csv", "pcs.csv"]:
+        drive.add_file(name, b"", folder)
+
+    request = drive.files().list(q=f"'{folder}' in parents and name contains 'PCS'")
+
+    assert sorted(file["name"] for file in request.execute()["files"]) == [
+        "PCS_2024.csv",
+        "old PCS_2023.csv",
+        "pcs.csv",
+    ]
+
+
+def test_list_pages_through_files():
+    drive = FakeDriveService()
+    folder = drive.add_folder("data")
+    for i in range(5):
+        drive.add_file(f"file_{i}.csv", b"", folder)
+
+    first = drive.files().list(q=f"'{folder}' in parents", pageSize=3).execute()
+    second = drive.files().list(
+        q=f"'{folder}' in parents", pageSize=3, pageToken=first["nextPageToken"]
+    ).execute()
+
+    assert len(first["files"]) == 3
+    assert len(second["files"]) == 2
+    assert "nextPageToken" not in second
@@ -0,0 +1,31 @@
+"""Tests of the file snapshot functions."""
+
+import os
+
+import duckdb
+
+from src.utils.file.write import snapshot_file
+
+
+def test_snapshot_does_not_replay_wal_of_previous_snapshot(tmp_path):
+    db_file = str(tmp_path / "dev.duckdb")
+    snapshot_dir = str(tmp_path / "snapshots")
+    con = duckdb.connect(db_file)
+    con.execute("SET wal_autocheckpoint = '1GB'")
+    con.execute("CREATE TABLE kept AS SELECT 1 AS x")
+    con.execute("CREATE TABLE dropped AS SELECT 2 AS x")
+
+    first = snapshot_file(db_file, snapshot_dir)
+    assert os.path.isfile(f"{first}.wal")
+
+    con.execute("DROP TABLE dropped")
+    con.execute("CHECKPOINT")
+    assert not os.path.isfile(f"{db_file}.wal")
+    second = snapshot_file(db_file, snapshot_dir, verify=True)
+    con.close()
+
+    assert second == first
+    assert not os.path.isfile(f"{second}.wal")
+    with duckdb.connect(second, read_only=True) as snapshot:
+        tables = snapshot.sql("SELECT table_name FROM duckdb_tables()").fetchall()
+    assert tables == [("kept",)]
@@ -0,0 +1,277 @@
+"""Tests of the Google Drive connector against the in-process fake Drive service."""
+
+import io
+
+import duckdb
+import httplib2
+import pandas as pd
+import pytest
+from googleapiclient.discovery import HttpError
+
+from src.benchmarks.fake_drive import FakeDriveService, FakeFilesResource, FakeMediaHttp
+from src.connectors import duck
+from src.connectors.duck import read_manifest
+from src.connectors.google_drive import (download_file_in_chunks,
+                                         execute_with_retry, ingest,
+                                         ingest_files_incremental,
+                                         iter_files_in_folder,
+                                         list_files_in_folder,
+                                         read_folder_to_dataframe, upload_file)
+
+
+@pytest.fixture
+def drive() -> FakeDriveService:
+    return FakeDriveService()
+
+
+class FlakyRequest:
+    """A request failing with the given HTTP statuses before returning its response."""
+
+    def __init__(self, statuses, response=None):
+        self.statuses = list(statuses)
+        self.response = response
+        self.calls = 0
+
+    def execute(self, **kwargs):
+        self.calls += 1
+        if self.statuses:
+            status = self.statuses.pop(0)
+            raise HttpError(httplib2.Response({"status": status}), b"error")
+        return self.response
+
+
+def test_read_folder_to_dataframe_downloads_concurrently(drive):
+    folder = drive.add_folder("data")
+    for i in range(6):
+        drive.add_file(f"file_{i}.csv", f"x\n{i}\n".encode(), folder)
+
+    sequential = read_folder_to_dataframe(drive, folder)
+    concurrent = read_folder_to_dataframe(drive, folder, concurrency=3)
+
+    assert sorted(sequential["x"]) == list(range(6))
+    pd.testing.assert_frame_equal(concurrent, sequential)
+
+
+def test_execute_with_retry_retries_retryable_errors():
+    request = FlakyRequest([429, 503], response={"ok": True})
+
+    assert execute_with_retry(request, backoff=0) == {"ok": True}
+    assert request.calls == 3
+
+
+def test_execute_with_retry_raises_other_errors():
+    request = FlakyRequest([404], response={"ok": True})
+
+    with pytest.raises(HttpError):
+        execute_with_retry(request, backoff=0)
+    assert request.calls == 1
+
+
+def test_execute_with_retry_gives_up_after_retries():
+    request = FlakyRequest([500] * 3, response={"ok": True})
+
+    with pytest.raises(HttpError):
+        execute_with_retry(request, retries=2, backoff=0)
+    assert request.calls == 3
+
+
+def test_iter_files_in_folder_follows_pages(drive):
+    folder = drive.add_folder("data")
+    for i in range(7):
+        drive.add_file(f"file_{i}.csv", b"a\n1\n", folder)
+
+    files = list(iter_files_in_folder(drive, folder, page_size=3))
+
+    assert sorted(file["name"] for file in files) == [f"file_{i}.csv" for i in range(7)]
+
+
+def test_iter_files_in_folder_recurses_into_subfolders(drive):
+    folder = drive.add_folder("data")
+    subfolder = drive.add_folder("2024", folder)
+    nested = drive.add_folder("01", subfolder)
+    drive.add_file("top.csv", b"", folder)
+    drive.add_file("sub.csv", b"", subfolder)
+    drive.add_file("nested.csv", b"", nested)
+    drive.add_file("notes.txt", b"", nested)
+
+    flat = list(iter_files_in_folder(drive, folder, page_size=1))
+    deep = list(
+        iter_files_in_folder(drive, folder, "*.csv", recursive=True, page_size=1)
+    )
+
+    assert [file["name"] for file in flat] == ["top.csv"]
+    assert sorted(file["name"] for file in deep) == ["nested.csv", "sub.csv", "top.csv"]
+
+
+@pytest.fixture
+def queries(monkeypatch) -> list:
+    """Records the `q` argument of every files().list call made to the fake service."""
+    queries = []
+    list_files = FakeFilesResource.list
+
+    def recording_list(self, q="", **kwargs):
+        queries.append(q)
+        return list_files(self, q, **kwargs)
+
+    monkeypatch.setattr(FakeFilesResource, "list", recording_list)
+    return queries
+
+
+def test_pattern_pushes_down_leading_word_only(drive, queries):
+    folder = drive.add_folder("data")
+    drive.add_file("PCS_2024_01.csv", b"", folder)
+    drive.add_file("PCS_2023_12.csv", b"", folder)
+    drive.add_file("old PCS_2024.csv", b"", folder)
+
+    files = list_files_in_folder(drive, folder, "PCS_2024*.csv")
+
+    assert [file["name"] for file in files] == ["PCS_2024_01.csv"]
+    assert queries[0].endswith("name contains 'PCS'")
+
+
+def test_pattern_without_leading_word_is_filtered_client_side(drive, queries):
+    folder = drive.add_folder("data")
+    drive.add_file("2024_PCS.csv", b"", folder)
+    drive.add_file("2024_other.csv", b"", folder)
+
+    files = list_files_in_folder(drive, folder, "*_PCS.csv")
+
+    assert [file["name"] for file in files] == ["2024_PCS.csv"]
+    assert "name contains" not in queries[0]
+
+
+def test_download_file_in_chunks_resumes_after_dropped_connection(drive, monkeypatch):
+    content = bytes(range(256)) * 10
+    file_id = drive.add_file("data.bin", content)
+    ranges = []
+    request = FakeMediaHttp.request
+
+    def flaky_request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        ranges.append(headers["range"])
+        if len(ranges) == 3:
+            raise ConnectionError("Simulated dropped connection")
+        return request(self, uri, method, body, headers, **kwargs)
+
+    monkeypatch.setattr(FakeMediaHttp, "request", flaky_request)
+
+    file_object = download_file_in_chunks(drive, file_id, chunk_size=1000, backoff=0)
+
+    assert file_object.read() == content
+    # The dropped third chunk is requested again from the same offset
+    assert ranges == ["bytes=0-999", "bytes=1000-1999"] + ["bytes=2000-2999"] * 2
+
+
+def test_ingest_files_incremental_skips_unchanged_files(drive, monkeypatch):
+    folder = drive.add_folder("data")
+    first = drive.add_file("a.csv", b"x\n1\n2\n", folder)
+    second = drive.add_file("b.csv", b"x\n3\n", folder)
+    removed = drive.add_file("c.csv", b"x\n4\n", folder)
+    con = duckdb.connect()
+    downloads = []
+    get_media = FakeFilesResource.get_media
+
+    def counting_get_media(self, fileId, **kwargs):
+        downloads.append(fileId)
+        return get_media(self, fileId, **kwargs)
+
+    monkeypatch.setattr(FakeFilesResource, "get_media", counting_get_media)
+
+    def ingest():
+        files = list_files_in_folder(drive, folder)
+        ingest_files_incremental(drive, con, files, "numbers", "csv")
+        return sorted(row[0] for row in con.sql("SELECT x FROM numbers").fetchall())
+
+    assert ingest() == [1, 2, 3, 4]
+    assert sorted(downloads) == sorted([first, second, removed])
+
+    downloads.clear()
+    assert ingest() == [1, 2, 3, 4]
+    assert downloads == []
+
+    drive.files_by_id[first]["content"] = b"x\n10\n"
+    drive.files_by_id[first]["modifiedTime"] = "2100-01-01T00:00:00.000Z"
+    del drive.files_by_id[removed]
+    assert ingest() == [3, 10]
+    assert downloads == [first]
+    assert set(read_manifest(con, "numbers")) == {first, second}
+
+
+
+def test_upload_file_resumes_after_dropped_connections(drive):
+    content = b"x" * (256 * 1024 * 3 + 10)
+    drive.upload_errors = 2
+
+    response = upload_file(
+        drive, io.BytesIO(content), "data.bin", chunk_size=256 * 1024, backoff=0
+    )
+
+    assert drive.upload_errors == 0
+    assert drive.files_by_id[response["id"]]["content"] == content
+
+
+def test_upload_file_overwrites_file_of_same_name(drive):
+    folder = drive.add_folder("exports")
+    first = upload_file(drive, io.BytesIO(b"v1"), "report.csv", folder, "text/csv")
+    second = upload_file(drive, io.BytesIO(b"v2"), "report.csv", folder, "text/csv")
+    copy = upload_file(
+        drive, io.BytesIO(b"v3"), "report.csv", folder, "text/csv", overwrite=False
+    )
+
+    assert second["id"] == first["id"]
+    assert copy["id"] != first["id"]
+    assert drive.files_by_id[first["id"]]["content"] == b"v2"
+    assert len(drive.list_folder(folder)) == 2
+
+
+def test_upload_file_without_folder_only_overwrites_root_files(drive):
+    folder = drive.add_folder("exports")
+    nested = drive.add_file("report.csv", b"nested", folder)
+
+    response = upload_file(drive, io.BytesIO(b"root"), "report.csv")
+
+    assert response["id"] != nested
+    assert drive.files_by_id[nested]["content"] == b"nested"
+    assert drive.files_by_id[response["id"]]["parent"] == "root"
+
+
+def lake_ingest_settings(folder: str, lake_dir: str) -> dict:
+    table = {
+        "id": folder,
+        "file_format": "csv",
+        "table_name": "costs",
+        "lake": {"partition_by": ["year(Date)"]},
+    }
+    return {
+        "ingest": {
+            "google_drive": {"atomic_swap": True, "folders": [table]},
+            "lake": {"path": lake_dir},
+        }
+    }
+
+
+def test_ingest_exports_lake_after_atomic_swap(drive, tmp_path):
+    folder = drive.add_folder("costs")
+    drive.add_file("a.csv", b"Date,Amount\n2023-05-01,1\n2024-02-01,2\n", folder)
+    con = duckdb.connect()
+
+    ingest(lake_ingest_settings(folder, str(tmp_path)), drive, con)
+
+    rows = con.sql("SELECT Amount, Date_year FROM costs_lake ORDER BY Amount")
+    assert rows.fetchall() == [(1, 2023), (2, 2024)]
+
+
+def test_ingest_does_not_export_lake_when_swap_fails(drive, tmp_path, monkeypatch):
+    folder = drive.add_folder("costs")
+    drive.add_file("a.csv", b"Date,Amount\n2023-05-01,1\n", folder)
+    con = duckdb.connect()
+
+    def failing_swap(con, table_names):
+        raise duckdb.TransactionException("Simulated swap failure")
+
+    monkeypatch.setattr(duck, "swap_staging_tables", failing_swap)
+
+    with pytest.raises(duckdb.TransactionException):
+        ingest(lake_ingest_settings(folder, str(tmp_path)), drive, con)
+
+    assert not (tmp_path / "costs").exists()
+    assert not duck.table_exists(con, "costs")
@@ -0,0 +1,55 @@
+"""Tests of the DataFrame readers."""
+
+import io
+import tempfile
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from src.utils.dataframe.read import iter_excel_batches, read_excel_to_dataframe
+
+
+@pytest.fixture
+def workbook() -> io.BytesIO:
+    workbook = openpyxl.Workbook()
+    for index, sheet_name in enumerate(["2022", "2023", "2024"]):
+        sheet = workbook.active if index == 0 else workbook.create_sheet()
+        sheet.title = sheet_name
+        sheet.append(["Amount", None, "Comment"])
+        for row in range(3):
+            sheet.append([index * 10 + row, row, f"row {row}"])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_read_excel_sheets_in_worker_processes(workbook, tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    sequential = read_excel_to_dataframe(workbook, sheet_name=None)
+    parallel = read_excel_to_dataframe(workbook, sheet_name=None, sheet_workers=2)
+
+    assert list(parallel) == ["2022", "2023", "2024"]
+    for sheet_name, df in sequential.items():
+        pd.testing.assert_frame_equal(parallel[sheet_name], df)
+    # The workbook spilled for the workers is removed afterwards
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("engine", ["calamine", "openpyxl"])
+def test_iter_excel_batches_names_empty_header_cells_like_pandas(workbook, engine):
+    expected = pd.read_excel(workbook, sheet_name="2023")
+    workbook.seek(0)
+
+    batches = list(
+        iter_excel_batches(workbook, sheet_name="2023", batch_rows=2, engine=engine)
+    )
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert list(batches[0].columns) == list(expected.columns) == [
+        "Amount",
+        "Unnamed: 1",
+        "Comment",
+    ]
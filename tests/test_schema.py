@@ -0,0 +1,37 @@
+"""Tests of schema contract inference and enforcement."""
+
+from decimal import Decimal
+
+import duckdb
+import pandas as pd
+
+from src.utils.dataframe.schema import (apply_schema, duckdb_cast_projection,
+                                        infer_schema)
+
+
+def test_infer_schema_never_types_floats_as_integers():
+    sample = pd.DataFrame(
+        {
+            "Budget": [1000.0, 2000.0, 3000.0],
+            "Rate": [0.125, 1.5, None],
+            "Count": [1, 2, 3],
+        }
+    )
+
+    schema = infer_schema(sample)
+
+    assert schema == {"Budget": "decimal(18,2)", "Rate": "float64", "Count": "int64"}
+
+
+def test_inferred_money_schema_accepts_later_fractions():
+    schema = infer_schema(pd.DataFrame({"Budget": [1000.0, 2000.0, 3000.0]}))
+    later = pd.DataFrame({"Budget": [1234.56, None]})
+
+    converted = apply_schema(later, schema)
+    with duckdb.connect() as con:
+        cast = con.sql(
+            f"SELECT {duckdb_cast_projection(schema)} FROM later"
+        ).fetchall()
+
+    assert converted["Budget"].tolist()[0] == Decimal("1234.56")
+    assert cast == [(Decimal("1234.56"),), (None,)]
@@ -0,0 +1,83 @@
+"""Tests of the DataFrame writers."""
+
+import gzip
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pytest
+
+from src.utils.dataframe.write import (CSV_COMPRESSION,
+                                       write_dataframe_to_file_buffer)
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Amount": [1.5, 2.0, None],
+            "Cost, Centre": ["A", None, "B"],
+            "Date": pd.to_datetime(["2024-01-31", "2024-02-29", None]),
+        }
+    )
+
+
+@pytest.mark.parametrize("file_type", ["csv", "csv.gz"])
+def test_csv_header_is_quoted_like_pandas(df, file_type):
+    expected = df.to_csv(index=False).splitlines()[0]
+    assert expected == 'Amount,"Cost, Centre",Date'
+
+    for data in (pa.Table.from_pandas(df, preserve_index=False), iter([df])):
+        content = write_dataframe_to_file_buffer(data, file_type).read()
+        if file_type == "csv.gz":
+            content = gzip.decompress(content)
+        assert content.decode().splitlines()[0] == expected
+
+
+def read_buffer(buffer, file_type: str) -> pd.DataFrame:
+    if file_type in CSV_COMPRESSION:
+        stream = pa.CompressedInputStream(buffer, CSV_COMPRESSION[file_type])
+        options = pa_csv.ConvertOptions(strings_can_be_null=True)
+        df = pa_csv.read_csv(stream, convert_options=options).to_pandas()
+        return df.assign(Date=pd.to_datetime(df["Date"]))
+    if file_type == "parquet":
+        return pd.read_parquet(buffer)
+    if file_type == "arrow":
+        return pa.ipc.open_file(buffer).read_pandas()
+    return pd.read_excel(buffer, parse_dates=["Date"])
+
+
+@pytest.mark.parametrize(
+    "file_type", ["csv.gz", "csv.zst", "parquet", "arrow", "excel"]
+)
+@pytest.mark.parametrize("source", ["dataframe", "table", "reader", "frames"])
+def test_buffer_round_trips(df, file_type, source):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    data = {
+        "dataframe": df,
+        "table": table,
+        "reader": pa.RecordBatchReader.from_batches(table.schema, table.to_batches()),
+        "frames": iter([df.iloc[:2], df.iloc[2:]]),
+    }[source]
+    kwargs = {"index": False} if file_type == "excel" else {}
+
+    buffer = write_dataframe_to_file_buffer(data, file_type, chunk_rows=2, **kwargs)
+
+    result = read_buffer(buffer, file_type)
+    # Readers differ in the resolution of the datetimes they return
+    result["Date"] = result["Date"].astype("datetime64[ns]")
+    pd.testing.assert_frame_equal(result, df.astype({"Date": "datetime64[ns]"}))
+
+
+def test_frames_with_incompatible_column_raise(df):
+    later = df.assign(Amount=["not a number", None, None])
+
+    with pytest.raises(ValueError, match="Column 'Amount'"):
+        write_dataframe_to_file_buffer(iter([df, later]), "parquet")
+
+
+def test_excel_too_large_fails_before_writing(df, monkeypatch):
+    monkeypatch.setattr("src.utils.dataframe.write.EXCEL_MAX_ROWS", 3)
+
+    with pytest.raises(ValueError, match="Excel worksheet of 3 rows"):
+        write_dataframe_to_file_buffer(df, "excel", index=False)